@@ -13,46 +13,22 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 from core.models import PricingPackage, PricingFeature
+from core.stats import HistoricalStats
+from dataclasses import asdict
 
 # Add a historical data view to the admin site
 @staff_member_required
 def historical_data_view(request):
-    # Get all jobs, including deleted ones
-    all_jobs = JobListing.all_objects.all().order_by('-posted_at')
-    active_jobs = JobListing.objects.all().count()
-    deleted_jobs = all_jobs.filter(deleted_at__isnull=False).count()
-    total_jobs = all_jobs.count()
-    
-    # Get all employers, including deleted ones
-    all_employers = EmployerProfile.all_objects.all().order_by('-created_at')
-    active_employers = EmployerProfile.objects.all().count()
-    deleted_employers = all_employers.filter(deleted_at__isnull=False).count()
-    total_employers = all_employers.count()
-    
-    # Get all applications, including those for deleted jobs
-    all_applications = JobApplication.objects.all().order_by('-applied_at')
-    applications_with_deleted_jobs = all_applications.filter(job__isnull=True).count()
-    total_applications = all_applications.count()
-    
-    # Get all saved jobs, including those for deleted jobs
-    all_saved_jobs = SavedJob.objects.all().order_by('-saved_at')
-    saved_with_deleted_jobs = all_saved_jobs.filter(job__isnull=True).count()
-    total_saved = all_saved_jobs.count()
+    # ?approximate=1 or 0 forces planner estimates on or off; by default only very large tables are estimated
+    approximate = {'1': True, '0': False}.get(request.GET.get('approximate'))
+    stats = HistoricalStats.for_admin(approximate)
     
     context = {
         'title': 'Historical Data',
-        'all_jobs': all_jobs[:100],  # Limit to the first 100 for performance
-        'active_jobs': active_jobs,
-        'deleted_jobs': deleted_jobs,
-        'total_jobs': total_jobs,
-        'all_employers': all_employers[:100],  # Limit to the first 100 for performance
-        'active_employers': active_employers,
-        'deleted_employers': deleted_employers,
-        'total_employers': total_employers,
-        'applications_with_deleted_jobs': applications_with_deleted_jobs,
-        'total_applications': total_applications,
-        'saved_with_deleted_jobs': saved_with_deleted_jobs,
-        'total_saved': total_saved,
+        # The 100 most recent rows, including deleted ones
+        'all_jobs': JobListing.all_objects.all().order_by('-posted_at')[:100],
+        'all_employers': EmployerProfile.all_objects.all().order_by('-created_at')[:100],
+        **asdict(stats),
     }
     return TemplateResponse(request, 'admin/historical_data.html', context)
 
@@ -87,6 +63,7 @@ class UserProfileInline(admin.StackedInline):
 class CustomUserAdmin(UserAdmin, ImportExportActionModelAdmin):
     inlines = (UserProfileInline,)
     list_display = ('email', 'first_name', 'last_name', 'get_role', 'get_company')
+    list_select_related = ('userprofile__employer_profile',)
     actions = ['make_employer']
 
     def get_role(self, obj):
@@ -163,6 +140,7 @@ class EmployerProfileAdmin(SoftDeletionAdmin):
     resource_class = EmployerProfileResource
     list_display = ('company_name', 'get_employer_email', 'industry', 'company_size', 
                    'location', 'get_deleted_state')
+    list_select_related = ('user_profile__user',)
     search_fields = ('company_name', 'user_profile__user__email')
     list_filter = ('company_size', 'industry', ('deleted_at', admin.EmptyFieldListFilter))
     actions = ['restore_selected']
@@ -177,6 +155,7 @@ class JobListingAdmin(SoftDeletionAdmin):
     list_display = ('title', 'company', 'get_employer', 'salary_range', 'location', 
                    'get_category', 'get_experience', 'get_job_preferences', 'get_students_status',
                    'premium_level', 'posted_at', 'get_deleted_state')
+    list_select_related = ('employer__user_profile__user',)
     list_filter = (('posted_at', DateRangeFilter), ('deleted_at', admin.EmptyFieldListFilter), 
                   'employer__company_name', 'location', 'category', 'experience', 
                   'job_preferences', 'considers_students', 'premium_level', 'status')
@@ -259,11 +238,15 @@ class JobListingAdmin(SoftDeletionAdmin):
 class JobApplicationAdmin(ImportExportModelAdmin):
     resource_class = JobApplicationResource
     list_display = ('get_job_title', 'get_company', 'get_applicant', 'status', 'applied_at', 'get_rejection_reasons')
+    list_select_related = ('job', 'user')
     list_filter = (('applied_at', DateRangeFilter), 'status', 'rejection_reasons')
     search_fields = ('job_title', 'job_company', 'job__title', 'job__company', 'user__email', 'guest_name', 'guest_email')
     date_hierarchy = 'applied_at'
     filter_horizontal = ('rejection_reasons',)
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('rejection_reasons')
+    
     def get_job_title(self, obj):
         if obj.job:
             return obj.job.title
@@ -283,8 +266,10 @@ class JobApplicationAdmin(ImportExportModelAdmin):
     get_applicant.short_description = 'Applicant'
     
     def get_rejection_reasons(self, obj):
-        if obj.status == 'რეზერვი' and obj.rejection_reasons.exists():
-            reasons = ", ".join([reason.get_name_display() for reason in obj.rejection_reasons.all()])
+        # Read from the prefetched reasons; exists() would query once per row
+        reasons = obj.rejection_reasons.all()
+        if obj.status == 'რეზერვი' and reasons:
+            reasons = ", ".join([reason.get_name_display() for reason in reasons])
             return format_html('<span style="color: #d9534f;">{}</span>', reasons)
         return "-"
     get_rejection_reasons.short_description = 'Rejection Reasons'
@@ -292,6 +277,7 @@ class JobApplicationAdmin(ImportExportModelAdmin):
 @admin.register(SavedJob)
 class SavedJobAdmin(ImportExportModelAdmin):
     list_display = ('get_user_email', 'get_job_title', 'get_company', 'saved_at')
+    list_select_related = ('user', 'job')
     list_filter = (('saved_at', DateRangeFilter), 'user')
     search_fields = ('job_title', 'job_company', 'job__title', 'job__company', 'user__email')
     date_hierarchy = 'saved_at'
@@ -0,0 +1,202 @@
+"""
+Saved-search job alerts.
+
+A SavedSearch stores a candidate's job_list filters as columns, with empty
+values meaning "any". Instead of running every saved search against the
+catalog, each job is matched against the saved searches once, when it goes
+live (see core.signals): a single query over the SavedSearch indexes finds
+every search the job satisfies, and their alerts are inserted in one batch.
+
+Search keywords are stored stemmed. A job satisfies them when each one is a
+prefix of a stem in its title, company or description, the same rule the
+search box uses. That is checked in the database as "keywords contained in
+the job's stem prefixes" against a GIN index.
+
+``manage.py send_job_alerts`` emails the queued alerts as one digest per user.
+"""
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .caching import RESULT_FILTERS
+from .models import JobAlert, SavedSearch
+from .search.tokenizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+# job_list parameters a saved search keeps
+SAVED_SEARCH_FILTERS = ('search',) + tuple(name for name in RESULT_FILTERS if name != 'sort')
+
+MAX_SAVED_SEARCHES = 20
+
+# Users emailed per batch by send_job_alerts
+ALERT_BATCH_SIZE = 200
+# Jobs listed in one email; the rest are in the results behind the link
+ALERT_EMAIL_MAX_JOBS = 20
+
+
+def normalise_filters(params):
+    """Return the saved-search filters in ``params`` as a dict of non-empty strings"""
+    filters = {}
+    for name in SAVED_SEARCH_FILTERS:
+        value = ' '.join(params.get(name, '').split())
+        if value:
+            filters[name] = value
+    if 'job_preferences' in filters:
+        filters['job_preferences'] = ','.join(sorted(set(filters['job_preferences'].split(','))))
+    return filters
+
+
+def parse_salary_filter(value):
+    """
+    Return the salary_min filter ``value`` as a whole number, as filter_jobs
+    reads it, or None for 0. Raises ValueError for anything else and for
+    amounts the salary_min_monthly column can't hold.
+    """
+    field = SavedSearch._meta.get_field('salary_min_monthly')
+    try:
+        salary = int(value)
+    except ValueError:
+        raise ValueError('Invalid salary')
+    if not 0 <= salary < 10 ** (field.max_digits - field.decimal_places):
+        raise ValueError('Invalid salary')
+    return salary or None
+
+
+def saved_search_from_filters(user, filters):
+    """Build an unsaved SavedSearch for normalised ``filters``"""
+    salary_min = None
+    if filters.get('salary_min'):
+        salary_min = parse_salary_filter(filters['salary_min'])
+    return SavedSearch(
+        user=user,
+        filters=filters,
+        category=filters.get('category', ''),
+        location=filters.get('location', ''),
+        experience=filters.get('experience', ''),
+        premium_level=filters.get('premium_level', ''),
+        job_preferences=filters['job_preferences'].split(',') if 'job_preferences' in filters else [],
+        salary_min_monthly=salary_min,
+        keywords=sorted(set(tokenize(filters.get('search', '')))),
+    )
+
+
+def save_search(user, params):
+    """
+    Save the job_list filters in ``params`` for ``user``.
+    Returns ``(saved_search, created)``; raises ValueError for unusable filters.
+    """
+    filters = normalise_filters(params)
+    if not filters:
+        raise ValueError('No filters to save')
+    existing = SavedSearch.objects.filter(user=user, filters=filters).first()
+    if existing is not None:
+        if not existing.is_active:
+            existing.is_active = True
+            existing.save(update_fields=['is_active'])
+        return existing, False
+    if SavedSearch.objects.filter(user=user).count() >= MAX_SAVED_SEARCHES:
+        raise ValueError('Too many saved searches')
+    saved_search = saved_search_from_filters(user, filters)
+    saved_search.save()
+    return saved_search, True
+
+
+def job_terms(job):
+    """Return every prefix of every search stem in the job's text"""
+    terms = set()
+    for stem in tokenize(' '.join([job.title, job.company, job.description])):
+        terms.update(stem[:length] for length in range(1, len(stem) + 1))
+    return sorted(terms)
+
+
+def matching_searches(job):
+    """Return the active saved searches ``job`` satisfies"""
+    salary = Q(salary_min_monthly__isnull=True)
+    if job.salary_min_monthly is not None:
+        salary |= Q(salary_min_monthly__lte=job.salary_min_monthly)
+    return SavedSearch.objects.filter(
+        Q(category='') | Q(category=job.category),
+        Q(location='') | Q(location=job.location),
+        Q(experience='') | Q(experience=job.experience),
+        Q(premium_level='') | Q(premium_level=job.premium_level),
+        Q(job_preferences=[]) | Q(job_preferences__contains=[job.job_preferences]),
+        salary,
+        is_active=True,
+        keywords__contained_by=job_terms(job),
+    )
+
+
+def queue_job_alerts(job):
+    """Queue an alert for every saved search matching a job that just went live"""
+    search_ids = list(matching_searches(job).values_list('id', flat=True))
+    if not search_ids:
+        return 0
+    JobAlert.objects.bulk_create(
+        [JobAlert(saved_search_id=search_id, job=job) for search_id in search_ids],
+        ignore_conflicts=True,
+    )
+    logger.info(f"Queued {len(search_ids)} alerts for job {job.pk}")
+    return len(search_ids)
+
+
+def _alert_email(user, alerts):
+    lines = []
+    for saved_search, jobs in alerts.items():
+        lines.append(f"{', '.join(saved_search.filters.values())}:")
+        for job in jobs[:ALERT_EMAIL_MAX_JOBS]:
+            lines.append(f"  {job.title} - {job.company}: {settings.SITE_URL}{reverse('job_detail', args=[job.id])}")
+        if len(jobs) > ALERT_EMAIL_MAX_JOBS:
+            lines.append(f"  ... {settings.SITE_URL}{saved_search.get_absolute_url()}")
+        lines.append('')
+    return EmailMessage(
+        subject='ახალი ვაკანსიები თქვენი შენახული ძიებისთვის',
+        body='\n'.join(lines),
+        to=[user.email],
+    )
+
+
+def send_job_alerts(batch_size=ALERT_BATCH_SIZE):
+    """
+    Email every user with queued alerts one digest of their new jobs and mark
+    the alerts sent. Alerts for jobs that are no longer live are dropped.
+    Returns the number of emails sent.
+    """
+    JobAlert.objects.filter(sent_at__isnull=True).filter(
+        Q(job__is_live=False) | Q(job__deleted_at__isnull=False)
+    ).delete()
+    sent = 0
+    while True:
+        user_ids = list(
+            JobAlert.objects.filter(sent_at__isnull=True)
+            .values_list('saved_search__user_id', flat=True).distinct()[:batch_size]
+        )
+        if not user_ids:
+            break
+        pending = (
+            JobAlert.objects.filter(sent_at__isnull=True, saved_search__user_id__in=user_ids)
+            .select_related('saved_search__user', 'job').order_by('saved_search_id', '-job__posted_at')
+        )
+        alerts_by_user = defaultdict(lambda: defaultdict(list))
+        users = {}
+        alert_ids = []
+        for alert in pending:
+            user = alert.saved_search.user
+            users[user.id] = user
+            alerts_by_user[user.id][alert.saved_search].append(alert.job)
+            alert_ids.append(alert.id)
+        messages = [
+            _alert_email(users[user_id], alerts)
+            for user_id, alerts in alerts_by_user.items() if users[user_id].email
+        ]
+        if messages:
+            get_connection().send_messages(messages)
+            sent += len(messages)
+        JobAlert.objects.filter(id__in=alert_ids).update(sent_at=timezone.now())
+    logger.info(f"Sent {sent} job alert emails")
+    return sent
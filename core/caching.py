@@ -0,0 +1,238 @@
+"""
+Cached read models for the public job list.
+
+Values live in Django's cache framework and are invalidated by the JobListing
+signal handlers in core.signals, so warm requests skip the database entirely.
+
+Filtered job lists are cached as ordered id lists under a key that includes a
+global catalog version. Any change that can affect which jobs match or how
+they are ordered bumps the version, which orphans every cached list at once.
+Expiry goes through the same path: the sweeper in core.expiry bumps the
+version whenever it takes jobs off the list.
+
+Each signed-in user's saved and applied job ids are cached as one small
+entry, dropped whenever they save, unsave or apply, so per-user badges on
+cached cards cost no queries on a warm request.
+
+Rendered job cards are cached per job under a key that includes the job's
+and its employer's ``updated_at``, so saving either makes a fresh key and
+the old fragment is never read again.
+"""
+import datetime
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db.models import CharField, Count, Value
+from django.template.loader import render_to_string
+from django.utils import translation
+from django.utils.safestring import mark_safe
+
+from .models import JobApplication, JobListing, SavedJob
+
+FACETS_CACHE_KEY = 'jobs:facets'
+FACETS_CACHE_TIMEOUT = 60 * 60
+
+# Changes to these fields can move a job between facet values
+FACET_FIELDS = ('status', 'is_live', 'category', 'location', 'deleted_at')
+
+CATALOG_VERSION_KEY = 'jobs:catalog_version'
+CONTENT_VERSION_KEY = 'jobs:content_version'
+JOB_IDS_CACHE_TIMEOUT = 10 * 60
+# Broader result sets are not cached; they are paged with keyset SQL instead
+JOB_IDS_CACHE_MAX = 1000
+
+# job_list parameters that select or order jobs; a search is never cached
+RESULT_FILTERS = ('location', 'category', 'experience', 'premium_level', 'salary_min', 'job_preferences', 'sort')
+
+USER_JOB_STATE_CACHE_TIMEOUT = 60 * 60
+
+JOB_CARD_TEMPLATE = 'core/components/job_list/job_card_tailwind.html'
+JOB_CARD_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Changes to these fields can change which jobs match a filter set or their order
+CATALOG_FIELDS = (
+    'status', 'is_live', 'premium_level', 'posted_at', 'expires_at', 'deleted_at',
+    'category', 'location', 'experience', 'salary_min_monthly', 'job_preferences',
+)
+
+
+def _facet_counts(jobs, field):
+    return [
+        (value, count)
+        for value, count in jobs.values_list(field).annotate(count=Count('id')).order_by(field)
+    ]
+
+
+def get_job_facets():
+    """
+    Return the category and location filter values of live jobs with the
+    number of jobs for each, as lists of ``(value, count)`` pairs. Counts
+    cover the same jobs as the list shown beside them.
+    """
+    facets = cache.get(FACETS_CACHE_KEY)
+    if facets is None:
+        live_jobs = JobListing.objects.filter(JobListing.live_filter())
+        facets = {
+            'categories': _facet_counts(live_jobs, 'category'),
+            'locations': _facet_counts(live_jobs, 'location'),
+        }
+        cache.set(FACETS_CACHE_KEY, facets, FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_job_facets():
+    cache.delete(FACETS_CACHE_KEY)
+
+
+def get_catalog_version():
+    """Return the current catalog version used to namespace cached results"""
+    return _get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    _bump_version(CATALOG_VERSION_KEY)
+
+
+def get_content_version():
+    """Return the version of everything shown on public job pages, see core.conditional"""
+    return _get_version(CONTENT_VERSION_KEY)
+
+
+def bump_content_version():
+    _bump_version(CONTENT_VERSION_KEY)
+
+
+def version_timestamp(version):
+    """Return the time of the change that produced ``version``"""
+    return datetime.datetime.fromtimestamp(version / 1_000_000, tz=datetime.timezone.utc)
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key, 0)
+    return version
+
+
+def _bump_version(key):
+    # Versions double as change timestamps in microseconds: jump to the clock,
+    # but always move forward even if the clock doesn't
+    current = cache.get(key)
+    try:
+        cache.incr(key, max(1, _initial_version() - current) if current else 1)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+
+
+def _initial_version():
+    # Start from the clock in microseconds so a lost key can't resurrect old cached results
+    return time.time_ns() // 1000
+
+
+def job_ids_cache_key(params):
+    """
+    Return the cache key for the job_list filters in ``params``, or None when
+    the request should not be cached.
+    """
+    if params.get('search', '').strip():
+        return None
+    normalised = {}
+    for name in RESULT_FILTERS:
+        value = params.get(name, '').strip()
+        if value:
+            normalised[name] = value
+    if 'job_preferences' in normalised:
+        normalised['job_preferences'] = sorted(set(normalised['job_preferences'].split(',')))
+    normalised['show_filters'] = 'show_filters' in params
+    normalised['show_expired'] = params.get('show_expired') == '1'
+    digest = hashlib.md5(json.dumps(normalised, sort_keys=True).encode()).hexdigest()
+    return f'jobs:ids:{get_catalog_version()}:{digest}'
+
+
+def get_cached_job_ids(params, jobs, ordering):
+    """
+    Return the ordered ids of ``jobs`` for the filters in ``params``, from the
+    cache when possible. Returns None for uncacheable requests and for result
+    sets larger than JOB_IDS_CACHE_MAX.
+    """
+    key = job_ids_cache_key(params)
+    if key is None:
+        return None
+    job_ids = cache.get(key)
+    if job_ids is None:
+        job_ids = list(jobs.order_by(*ordering).values_list('id', flat=True)[:JOB_IDS_CACHE_MAX + 1])
+        if len(job_ids) > JOB_IDS_CACHE_MAX:
+            # Remember that this filter set is too broad so we don't retry every request
+            job_ids = False
+        cache.set(key, job_ids, JOB_IDS_CACHE_TIMEOUT)
+    return job_ids if job_ids is not False else None
+
+
+def job_card_cache_key(job, template_name):
+    employer_updated_at = job.employer.updated_at.timestamp() if job.employer.updated_at else 0
+    template_digest = hashlib.md5(template_name.encode()).hexdigest()[:8]
+    return (
+        f'jobs:card:{template_digest}:{job.pk}:{job.updated_at.timestamp()}:'
+        f'{employer_updated_at}:{translation.get_language()}'
+    )
+
+
+def render_job_cards(jobs, template_name=JOB_CARD_TEMPLATE):
+    """
+    Return ``{job id: card html}`` for ``jobs``, rendering only the cards
+    missing from the cache. A page of cards costs one ``get_many``.
+
+    Card templates get only ``job`` in their context, so they must not depend
+    on the request or the user. Pass jobs with their employer selected.
+    """
+    keys = {job_card_cache_key(job, template_name): job for job in jobs}
+    cached = cache.get_many(keys)
+    missing = {}
+    for key, job in keys.items():
+        if key not in cached:
+            missing[key] = render_to_string(template_name, {'job': job})
+    if missing:
+        cache.set_many(missing, JOB_CARD_CACHE_TIMEOUT)
+    cached.update(missing)
+    return {job.pk: mark_safe(cached[key]) for key, job in keys.items()}
+
+
+def user_job_state_key(user_id):
+    return f'jobs:user_state:{user_id}'
+
+
+def get_user_job_state(user):
+    """
+    Return ``{'saved': set of job ids, 'applied': set of job ids}`` for
+    ``user``, loaded with a single UNION query on a cache miss.
+    """
+    if not user.is_authenticated:
+        return {'saved': set(), 'applied': set()}
+    key = user_job_state_key(user.pk)
+    state = cache.get(key)
+    if state is None:
+        saved = SavedJob.objects.filter(user=user, job__isnull=False).annotate(
+            kind=Value('saved', output_field=CharField())
+        ).values_list('job_id', 'kind').order_by()
+        applied = JobApplication.objects.filter(user=user, job__isnull=False).annotate(
+            kind=Value('applied', output_field=CharField())
+        ).values_list('job_id', 'kind').order_by()
+        state = {'saved': set(), 'applied': set()}
+        for job_id, kind in saved.union(applied, all=True):
+            state[kind].add(job_id)
+        cache.set(key, state, USER_JOB_STATE_CACHE_TIMEOUT)
+    return state
+
+
+def job_state_for_request(request):
+    """Return the current user's job state, loaded at most once per request"""
+    if not hasattr(request, '_job_state'):
+        request._job_state = get_user_job_state(request.user)
+    return request._job_state
+
+
+def invalidate_user_job_state(user_id):
+    cache.delete(user_job_state_key(user_id))
@@ -0,0 +1,49 @@
+"""
+Conditional GET validators for the public job pages.
+
+Used with ``django.views.decorators.http.condition``: when a client sends
+``If-None-Match`` or ``If-Modified-Since`` and nothing on the page changed,
+the view answers 304 without running its queries or rendering.
+
+The validators come from the two cache versions in core.caching: the catalog
+version moves whenever the set of live jobs changes (including the expiry
+sweep), the content version whenever a job, employer profile or similar-job
+list is saved. Both are change timestamps, so the newer one doubles as the
+Last-Modified date. Checking them costs two cache reads and no queries.
+
+Validators are only produced for anonymous requests without pending flash
+messages. Signed-in users see their own state (saved jobs, badges, the
+header menu) on every page, and a 304 would swallow a pending message.
+
+They also need a cache shared by every worker (REDIS_URL). With a
+per-process cache each worker keeps its own versions, and one that didn't
+handle a change would answer 304 for the old page until it restarts.
+"""
+from django.contrib.messages import get_messages
+from django.utils import translation
+
+from .caching import get_catalog_version, get_content_version, version_timestamp
+from .search.engine import versions_are_shared
+
+
+def _is_conditional(request):
+    return (
+        versions_are_shared()
+        and not request.user.is_authenticated
+        and not len(get_messages(request))
+    )
+
+
+def public_page_etag(request, *args, **kwargs):
+    if not _is_conditional(request):
+        return None
+    # The same versions cover every page, the path and language tell them apart
+    return '-'.join([
+        str(get_catalog_version()), str(get_content_version()), translation.get_language() or '',
+    ])
+
+
+def public_page_last_modified(request, *args, **kwargs):
+    if not _is_conditional(request):
+        return None
+    return version_timestamp(max(get_catalog_version(), get_content_version()))
@@ -0,0 +1,105 @@
+"""
+Write-behind job view counters.
+
+``record_job_view`` only bumps a counter in this process's memory. The
+buffered counts are written out by ``flush_job_views``, which adds them to
+the JobViewCount rows in one upsert per batch of jobs. A popular listing then
+costs one row update per flush, not one per page view, and its JobListing row
+is never locked by a view. Counts live in their own table, so saving a
+listing can't overwrite them.
+
+A flush runs at most every JOB_VIEW_FLUSH_INTERVAL seconds from the request
+that notices it is due, and when the process exits. Views buffered in a
+process that dies without exiting cleanly are lost, which is acceptable
+for reporting numbers.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+from .models import JobListing, JobViewCount
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 30
+# Jobs written per upsert statement
+FLUSH_BATCH_SIZE = 500
+# Flush early when this many jobs have buffered views
+MAX_PENDING_JOBS = 5000
+
+_lock = threading.Lock()
+_pending = Counter()
+_last_flush = time.monotonic()
+
+
+def _flush_interval():
+    return getattr(settings, 'JOB_VIEW_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+
+def record_job_view(job_id):
+    """Count a view of a job; the count reaches the database with the next flush"""
+    with _lock:
+        _pending[job_id] += 1
+        due = time.monotonic() - _last_flush >= _flush_interval() or len(_pending) >= MAX_PENDING_JOBS
+    if due:
+        flush_job_views()
+
+
+def pending_job_views():
+    """Return a copy of the views buffered in this process"""
+    with _lock:
+        return dict(_pending)
+
+
+def flush_job_views(batch_size=FLUSH_BATCH_SIZE):
+    """Add the buffered views to the database and return the number of views written"""
+    global _pending, _last_flush
+    with _lock:
+        pending = _pending
+        _pending = Counter()
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    written = 0
+    # Sorted so concurrent flushes from several processes lock rows in the same order
+    job_ids = sorted(pending)
+    for start in range(0, len(job_ids), batch_size):
+        batch = job_ids[start:start + batch_size]
+        views = [pending[job_id] for job_id in batch]
+        try:
+            # A savepoint, so a failure can't break the transaction of the request that flushes
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(UPSERT_SQL, [batch, views])
+        except DatabaseError:
+            logger.exception(f"Failed to flush views for {len(batch)} job listings; keeping them buffered")
+            with _lock:
+                for job_id, count in zip(batch, views):
+                    _pending[job_id] += count
+            continue
+        written += sum(views)
+    return written
+
+
+# Views of jobs deleted since they were counted are dropped by the join
+UPSERT_SQL = f"""
+    INSERT INTO {JobViewCount._meta.db_table} (job_id, views)
+    SELECT pending.job_id, pending.views
+    FROM unnest(%s::bigint[], %s::bigint[]) AS pending(job_id, views)
+    JOIN {JobListing._meta.db_table} job ON job.id = pending.job_id
+    ORDER BY pending.job_id
+    ON CONFLICT (job_id) DO UPDATE SET views = {JobViewCount._meta.db_table}.views + EXCLUDED.views
+"""
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        flush_job_views()
+    except Exception:
+        logger.exception("Failed to flush job views on exit")
@@ -0,0 +1,108 @@
+"""
+Job expiry sweeper.
+
+Public job queries filter on the indexed ``JobListing.is_live`` flag, with
+an ``expires_at`` comparison on top (``JobListing.live_filter``) so expired
+listings are hidden whether or not the sweeper runs. The sweeper flips the
+flag of listings past their expiry date, in small batches so no single
+statement locks many rows. Flipping it keeps the partial indexes on live
+listings small and tells the caches, alerts and similar-job lists that
+the listing left.
+
+Run it periodically with ``manage.py expire_jobs`` (cron, a scheduler), keep
+``manage.py expire_jobs --every SECONDS`` running as a worker, or set
+``JOB_EXPIRY_SWEEP_INTERVAL`` to a number of seconds to have each server
+process run it in a background thread. The thread is started from the WSGI
+and ASGI entry points, so management commands and tests never start it.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .caching import bump_catalog_version, bump_content_version, invalidate_job_facets
+from .models import JobAlert, JobListing
+from .search import search_backend
+from .search import engine as search_engine
+from .search.autocomplete import invalidate_autocomplete
+from .stats import invalidate_employer_stats
+
+logger = logging.getLogger(__name__)
+
+EXPIRY_BATCH_SIZE = 500
+
+_scheduler_lock = threading.Lock()
+_scheduler_started = False
+
+
+def expire_jobs(batch_size=EXPIRY_BATCH_SIZE):
+    """
+    Mark live jobs whose expiry date has passed as not live.
+    Returns the number of jobs expired. The update fires no post_save, so
+    this does what the JobListing signal handlers in core.signals do for a
+    job leaving the live set, and only when something actually expired.
+    """
+    now = timezone.now()
+    expired = 0
+    employer_ids = set()
+    while True:
+        batch = list(
+            JobListing.all_objects.filter(is_live=True, expires_at__lte=now)
+            .values_list('id', 'employer_id')[:batch_size]
+        )
+        if not batch:
+            break
+        job_ids = [job_id for job_id, employer_id in batch]
+        employer_ids.update(employer_id for job_id, employer_id in batch)
+        # Queue the jobs for build_similar_jobs and drop their unsent alerts
+        expired += JobListing.all_objects.filter(id__in=job_ids, is_live=True).update(
+            is_live=False, similar_computed_at=None
+        )
+        JobAlert.objects.filter(job_id__in=job_ids, sent_at__isnull=True).delete()
+        if len(batch) < batch_size:
+            break
+    if expired:
+        invalidate_job_facets()
+        bump_catalog_version()
+        bump_content_version()
+        invalidate_autocomplete()
+        if search_backend() == 'memory':
+            search_engine.invalidate_search_index()
+        for employer_id in employer_ids:
+            invalidate_employer_stats(employer_id)
+        logger.info(f"Expired {expired} job listings")
+    return expired
+
+
+def run_sweeps(interval, batch_size=EXPIRY_BATCH_SIZE):
+    """Expire jobs every ``interval`` seconds, forever"""
+    while True:
+        try:
+            expire_jobs(batch_size=batch_size)
+        except Exception as e:
+            logger.error(f"Error in job expiry sweep: {str(e)}")
+        finally:
+            close_old_connections()
+        time.sleep(interval)
+
+
+def start_expiry_scheduler():
+    """
+    Start the in-process sweeper thread if JOB_EXPIRY_SWEEP_INTERVAL is set.
+    Safe to call more than once; only one thread is started per process.
+    """
+    global _scheduler_started
+    interval = getattr(settings, 'JOB_EXPIRY_SWEEP_INTERVAL', None)
+    if not interval:
+        return
+    with _scheduler_lock:
+        if _scheduler_started:
+            return
+        _scheduler_started = True
+    thread = threading.Thread(
+        target=run_sweeps, args=(interval,), name='job-expiry-sweeper', daemon=True
+    )
+    thread.start()
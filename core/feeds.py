@@ -0,0 +1,52 @@
+"""
+RSS and Atom feeds of the newest live job listings.
+
+Feeds carry the newest FEED_ITEMS jobs only; the full catalog is covered by
+the sitemaps in core.views.sitemap_views.
+"""
+from django.contrib.syndication.views import Feed
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from .models import JobListing
+
+FEED_ITEMS = 100
+# Words of the job description shown in a feed entry
+FEED_DESCRIPTION_WORDS = 60
+
+
+class LatestJobsFeed(Feed):
+    title = 'Jobsy'
+    link = reverse_lazy('job_list')
+    description = 'ახალი ვაკანსიები Jobsy-ზე'
+
+    def items(self):
+        return (
+            JobListing.objects.filter(JobListing.live_filter())
+            .only('id', 'title', 'company', 'description', 'category', 'posted_at', 'updated_at')
+            .order_by('-posted_at', '-id')[:FEED_ITEMS]
+        )
+
+    def item_title(self, item):
+        return f'{item.title} - {item.company}'
+
+    def item_description(self, item):
+        return Truncator(item.description).words(FEED_DESCRIPTION_WORDS)
+
+    def item_link(self, item):
+        return reverse('job_detail', args=[item.id])
+
+    def item_pubdate(self, item):
+        return item.posted_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_categories(self, item):
+        return [item.get_category_display()]
+
+
+class LatestJobsAtomFeed(LatestJobsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestJobsFeed.description
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from core.rollups import backfill_application_rollups, BACKFILL_BATCH_SIZE
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily per-job application rollups from the applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BACKFILL_BATCH_SIZE,
+            help='Number of rollup rows to insert per statement',
+        )
+
+    def handle(self, *args, **options):
+        written = backfill_application_rollups(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} daily application rollups'))
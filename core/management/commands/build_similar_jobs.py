@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from core.models import JobListing
+from core.recommendations import refresh_similar_jobs
+
+class Command(BaseCommand):
+    help = 'Compute similar-job recommendations for job listings whose text changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute recommendations for every live job listing',
+        )
+
+    def handle(self, *args, **options):
+        job_ids = None
+        if options['all']:
+            job_ids = JobListing.objects.filter(is_live=True).values_list('id', flat=True)
+        refreshed = refresh_similar_jobs(job_ids)
+        self.stdout.write(self.style.SUCCESS(f'Refreshed similar jobs for {refreshed} job listings'))
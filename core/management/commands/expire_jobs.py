@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from core.expiry import expire_jobs, run_sweeps, EXPIRY_BATCH_SIZE
+
+class Command(BaseCommand):
+    help = 'Take approved job listings past their expiry date off the public job list'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EXPIRY_BATCH_SIZE,
+            help='Number of jobs to expire per UPDATE statement',
+        )
+        parser.add_argument(
+            '--every',
+            type=int,
+            help='Keep running and sweep every this many seconds',
+        )
+
+    def handle(self, *args, **options):
+        if options['every']:
+            self.stdout.write(f"Expiring jobs every {options['every']} seconds")
+            run_sweeps(options['every'], batch_size=options['batch_size'])
+        expired = expire_jobs(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Expired {expired} job listings'))
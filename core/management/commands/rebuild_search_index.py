@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from core.search.engine import rebuild_search_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the in-memory job search index and make running processes reload theirs'
+
+    def handle(self, *args, **options):
+        index = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {len(index)} job listings ({len(index.vocabulary())} terms)'
+        ))
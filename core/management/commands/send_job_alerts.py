@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from core.alerts import send_job_alerts, ALERT_BATCH_SIZE
+
+class Command(BaseCommand):
+    help = 'Email candidates the new jobs matching their saved searches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=ALERT_BATCH_SIZE,
+            help='Number of users whose alerts are loaded and sent at a time',
+        )
+
+    def handle(self, *args, **options):
+        sent = send_job_alerts(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} job alert emails'))
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:30
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vectors(apps, schema_editor):
+    """
+    Build the search vector for all existing job listings, including deleted ones.
+    """
+    JobListing = apps.get_model('core', 'JobListing')
+    JobListing._base_manager.update(search_vector=(
+        SearchVector('title', weight='A', config='simple') +
+        SearchVector('company', weight='B', config='simple') +
+        SearchVector('description', weight='C', config='simple')
+    ))
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_pricingpackage_pricingfeature'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='core_joblisting_search_gin'),
+        ),
+        migrations.RunPython(populate_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:37
+
+from django.db import migrations, models
+
+PREMIUM_RANKS = {
+    'premium': 1,
+    'premium_plus': 2,
+}
+
+
+def populate_premium_rank(apps, schema_editor):
+    """
+    Set the numeric rank for existing premium jobs; standard jobs keep the default 0.
+    """
+    JobListing = apps.get_model('core', 'JobListing')
+    for premium_level, premium_rank in PREMIUM_RANKS.items():
+        JobListing._base_manager.filter(premium_level=premium_level).update(premium_rank=premium_rank)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_joblisting_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='premium_rank',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='პრემიუმ რანგი'),
+        ),
+        migrations.RunPython(populate_premium_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status', 'approved')), fields=['-premium_rank', '-posted_at', 'id'], include=('expires_at',), name='core_joblisting_feed_idx'),
+        ),
+    ]
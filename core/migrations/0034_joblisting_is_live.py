@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:41
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def populate_is_live(apps, schema_editor):
+    """
+    Mark approved jobs that have not expired yet as live.
+    """
+    JobListing = apps.get_model('core', 'JobListing')
+    JobListing._base_manager.filter(status='approved').filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+    ).update(is_live=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_joblisting_premium_rank'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='joblisting',
+            name='core_joblisting_feed_idx',
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='is_live',
+            field=models.BooleanField(default=False, editable=False, verbose_name='აქტიური'),
+        ),
+        migrations.RunPython(populate_is_live, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_live', True)), fields=['-premium_rank', '-posted_at', 'id'], name='core_joblisting_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('is_live', True)), fields=['expires_at'], name='core_joblisting_live_exp_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:47
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import F, Max
+
+SALARY_MONTHLY_FACTORS = {
+    'თვეში': Decimal('1'),
+    'კვირაში': Decimal('52') / 12,
+    'დღეში': Decimal('52') * 5 / 12,
+    'საათში': Decimal('52') * 40 / 12,
+}
+BATCH_SIZE = 1000
+
+
+def populate_monthly_salaries(apps, schema_editor):
+    """
+    Fill the monthly salary columns one id range at a time, so no single
+    statement rewrites the whole table. The migration is not atomic, so each
+    batch commits, and releases its row locks, on its own.
+    """
+    JobListing = apps.get_model('core', 'JobListing')
+    last_id = JobListing._base_manager.aggregate(last_id=Max('id'))['last_id'] or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        batch = JobListing._base_manager.filter(id__gte=start, id__lt=start + BATCH_SIZE)
+        for salary_type, factor in SALARY_MONTHLY_FACTORS.items():
+            batch.filter(salary_type=salary_type).update(
+                salary_min_monthly=F('salary_min') * factor,
+                salary_max_monthly=F('salary_max') * factor,
+            )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0034_joblisting_is_live'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='salary_max_monthly',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=12, null=True, verbose_name='მაქსიმალური თვიური ხელფასი'),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='salary_min_monthly',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=12, null=True, verbose_name='მინიმალური თვიური ხელფასი'),
+        ),
+        migrations.RunPython(populate_monthly_salaries, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_live', True), ('salary_min_monthly__isnull', False)), fields=['-salary_min_monthly', '-posted_at', 'id'], name='core_joblisting_salary_idx'),
+        ),
+    ]
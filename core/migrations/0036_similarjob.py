@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_joblisting_salary_monthly'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='similar_computed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='მსგავსი ვაკანსიების გამოთვლის თარიღი'),
+        ),
+        migrations.CreateModel(
+            name='SimilarJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='მსგავსება')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='რიგი')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_entries', to='core.joblisting', verbose_name='ვაკანსია')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.joblisting', verbose_name='მსგავსი ვაკანსია')),
+            ],
+            options={
+                'verbose_name': 'მსგავსი ვაკანსია',
+                'verbose_name_plural': 'მსგავსი ვაკანსიები',
+                'ordering': ['job', 'rank'],
+                'unique_together': {('job', 'rank')},
+            },
+        ),
+    ]
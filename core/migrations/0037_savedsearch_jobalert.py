@@ -0,0 +1,70 @@
+# Generated by Django 5.1.7 on 2026-10-17 05:01
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_similarjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filters', models.JSONField(default=dict, verbose_name='ფილტრები')),
+                ('category', models.CharField(blank=True, max_length=100, verbose_name='კატეგორია')),
+                ('location', models.CharField(blank=True, max_length=100, verbose_name='ლოკაცია')),
+                ('experience', models.CharField(blank=True, max_length=100, verbose_name='გამოცდილება')),
+                ('premium_level', models.CharField(blank=True, max_length=20, verbose_name='პრემიუმ დონე')),
+                ('job_preferences', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=255), blank=True, default=list, size=None, verbose_name='სამუშაო გრაფიკი')),
+                ('salary_min_monthly', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True, verbose_name='მინიმალური თვიური ხელფასი')),
+                ('keywords', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=100), blank=True, default=list, size=None, verbose_name='საკვანძო სიტყვები')),
+                ('is_active', models.BooleanField(default=True, verbose_name='აქტიური')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='შექმნის თარიღი')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL, verbose_name='მომხმარებელი')),
+            ],
+            options={
+                'verbose_name': 'შენახული ძიება',
+                'verbose_name_plural': 'შენახული ძიებები',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='შექმნის თარიღი')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='გაგზავნის თარიღი')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.joblisting', verbose_name='ვაკანსია')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='core.savedsearch', verbose_name='შენახული ძიება')),
+            ],
+            options={
+                'verbose_name': 'ვაკანსიის შეტყობინება',
+                'verbose_name_plural': 'ვაკანსიის შეტყობინებები',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'location'], name='core_savedsearch_match_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['keywords'], name='core_savedsearch_keywords_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobalert',
+            index=models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['saved_search'], name='core_jobalert_pending_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobalert',
+            unique_together={('saved_search', 'job')},
+        ),
+    ]
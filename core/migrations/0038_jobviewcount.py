@@ -0,0 +1,25 @@
+# Generated by Django 5.1.7 on 2026-10-17 05:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_savedsearch_jobalert'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobViewCount',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='view_stats', serialize=False, to='core.joblisting', verbose_name='ვაკანსია')),
+                ('views', models.PositiveBigIntegerField(default=0, verbose_name='ნახვები')),
+            ],
+            options={
+                'verbose_name': 'ვაკანსიის ნახვები',
+                'verbose_name_plural': 'ვაკანსიის ნახვები',
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.7 on 2026-10-17 05:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+STATUS_COLUMNS = {
+    'განხილვის_პროცესში': 'in_review',
+    'გასაუბრება': 'interview',
+    'რეზერვი': 'reserve',
+}
+
+
+def populate_daily_applications(apps, schema_editor):
+    """Build the rollup from the existing applications with one grouped query"""
+    JobApplication = apps.get_model('core', 'JobApplication')
+    JobApplicationDaily = apps.get_model('core', 'JobApplicationDaily')
+    daily = (
+        JobApplication._base_manager.filter(job__isnull=False)
+        .annotate(day=TruncDate('applied_at')).order_by()
+        .values('job_id', 'day')
+        .annotate(
+            applications=Count('id'),
+            unread=Count('id', filter=Q(is_read=False)),
+            **{column: Count('id', filter=Q(status=status)) for status, column in STATUS_COLUMNS.items()},
+        )
+    )
+    JobApplicationDaily.objects.bulk_create(
+        (JobApplicationDaily(**row) for row in daily.iterator(chunk_size=2000)), batch_size=2000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0038_jobviewcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='დღე')),
+                ('applications', models.IntegerField(default=0, verbose_name='აპლიკაციები')),
+                ('unread', models.IntegerField(default=0, verbose_name='წაუკითხავი')),
+                ('in_review', models.IntegerField(default=0, verbose_name='განხილვის პროცესში')),
+                ('interview', models.IntegerField(default=0, verbose_name='გასაუბრება')),
+                ('reserve', models.IntegerField(default=0, verbose_name='რეზერვი')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_applications', to='core.joblisting', verbose_name='ვაკანსია')),
+            ],
+            options={
+                'verbose_name': 'დღიური აპლიკაციები',
+                'verbose_name_plural': 'დღიური აპლიკაციები',
+                'ordering': ['job', 'day'],
+                'unique_together': {('job', 'day')},
+            },
+        ),
+        migrations.RunPython(populate_daily_applications, migrations.RunPython.noop),
+    ]
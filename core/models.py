@@ -1,14 +1,19 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.dispatch import receiver, Signal
 from django.urls import reverse
+from django.utils.http import urlencode
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 import logging
 from django.db import transaction
 from datetime import timedelta
+from decimal import Decimal
 
 # Import storage backends if S3 is enabled
 if hasattr(settings, 'USE_S3') and settings.USE_S3:
@@ -19,9 +24,14 @@ else:
 
 logger = logging.getLogger(__name__)
 
+# Sent after a bulk soft delete, which is a plain UPDATE and fires no post_save
+soft_deleted = Signal()
+
 class SoftDeletionQuerySet(models.QuerySet):
     def delete(self):
-        return super().update(deleted_at=timezone.now())
+        count = super().update(deleted_at=timezone.now())
+        soft_deleted.send(sender=self.model, count=count)
+        return count
         
     def hard_delete(self):
         return super().delete()
@@ -134,6 +144,16 @@ class JobListing(SoftDeletionModel):
     salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, db_index=True, verbose_name=_("მინიმალური ხელფასი"))
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name=_("მაქსიმალური ხელფასი"))
     salary_type = models.CharField(max_length=50, choices=SALARY_TYPE_CHOICES, default='თვეში', verbose_name=_("ხელფასის ტიპი"))
+    # Multipliers from each salary type to a monthly amount (52 weeks, 5 days, 40 hours a week)
+    SALARY_MONTHLY_FACTORS = {
+        'თვეში': Decimal('1'),
+        'კვირაში': Decimal('52') / 12,
+        'დღეში': Decimal('52') * 5 / 12,
+        'საათში': Decimal('52') * 40 / 12,
+    }
+    # Monthly equivalents of salary_min/salary_max, kept in sync by save()
+    salary_min_monthly = models.DecimalField(max_digits=12, decimal_places=2, null=True, editable=False, verbose_name=_("მინიმალური თვიური ხელფასი"))
+    salary_max_monthly = models.DecimalField(max_digits=12, decimal_places=2, null=True, editable=False, verbose_name=_("მაქსიმალური თვიური ხელფასი"))
     category = models.CharField(max_length=100, choices=CATEGORY_CHOICES, db_index=True, verbose_name=_("კატეგორია"))
     location = models.CharField(max_length=100, choices=LOCATION_CHOICES, db_index=True, verbose_name=_("ლოკაცია"))
     employer = models.ForeignKey('EmployerProfile', on_delete=models.CASCADE, related_name='job_listings', verbose_name=_("დამსაქმებელი"))
@@ -158,17 +178,90 @@ class JobListing(SoftDeletionModel):
         ('premium_plus', _('Premium +')),
     ]
     premium_level = models.CharField(max_length=20, choices=PREMIUM_LEVEL_CHOICES, default='standard', db_index=True, verbose_name=_("პრემიუმ დონე"))
+    # Numeric sort key for premium_level, kept in sync by save()
+    PREMIUM_RANKS = {
+        'standard': 0,
+        'premium': 1,
+        'premium_plus': 2,
+    }
+    premium_rank = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name=_("პრემიუმ რანგი"))
+    # Approved and not expired. Set by save(); expiry is applied by the
+    # expire_jobs sweeper (see core.expiry) so public queries need no clock
+    is_live = models.BooleanField(default=False, editable=False, verbose_name=_("აქტიური"))
     georgian_language_only = models.BooleanField(choices=[(True, 'კი'), (False, 'არა')], default=False, verbose_name=_("პოზიციაზე მოთხოვნილია მხოლოდ ქართული ენის ცოდნა"))
+    # Maintained by the post_save signal in core.signals, see core.search
+    search_vector = SearchVectorField(null=True, editable=False)
+    # When SimilarJob rows were last computed for this job; cleared when its text changes
+    similar_computed_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_("მსგავსი ვაკანსიების გამოთვლის თარიღი"))
 
     def __str__(self):
         return f"{self.title} at {self.company}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded values so signal handlers can tell what changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.premium_rank = self.PREMIUM_RANKS.get(self.premium_level, 0)
+        self.is_live = self.status == 'approved' and not self.is_expired()
+        self.salary_min_monthly = self.monthly_salary(self.salary_min)
+        self.salary_max_monthly = self.monthly_salary(self.salary_max)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'premium_level' in update_fields:
+                update_fields.add('premium_rank')
+            if update_fields & {'status', 'expires_at'}:
+                update_fields.add('is_live')
+            if update_fields & {'salary_min', 'salary_max', 'salary_type'}:
+                update_fields |= {'salary_min_monthly', 'salary_max_monthly'}
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    def monthly_salary(self, amount):
+        """Convert a salary amount of this job's salary_type to a monthly amount"""
+        if amount is None:
+            return None
+        factor = self.SALARY_MONTHLY_FACTORS.get(self.salary_type, Decimal('1'))
+        return (Decimal(str(amount)) * factor).quantize(Decimal('0.01'))
+
+    def has_changed(self, *fields):
+        """Check if any of the given fields differ from the values last loaded or saved"""
+        loaded_values = getattr(self, '_loaded_values', None)
+        if loaded_values is None:
+            return True
+        return any(
+            field not in loaded_values or loaded_values[field] != getattr(self, field)
+            for field in fields
+        )
+
     def is_expired(self):
         """Check if the job posting has expired"""
         if not self.expires_at:
             return False
         return timezone.now() >= self.expires_at
 
+    @staticmethod
+    def live_filter(prefix=''):
+        """
+        Return a Q matching the listings shown to the public, optionally through
+        the relation ``prefix`` (e.g. ``'similar__'``). The expiry sweeper clears
+        ``is_live`` in batches; comparing ``expires_at`` too keeps an expired
+        listing off public pages before it runs, or when it doesn't run at all.
+        """
+        return models.Q(**{f'{prefix}is_live': True}) & (
+            models.Q(**{f'{prefix}expires_at__isnull': True})
+            | models.Q(**{f'{prefix}expires_at__gt': timezone.now()})
+        )
+
     class Meta:
         ordering = ['-posted_at']
         indexes = [
@@ -176,6 +269,25 @@ class JobListing(SoftDeletionModel):
             models.Index(fields=['status', 'location']),
             models.Index(fields=['employer', 'status']),
             models.Index(fields=['expires_at']),
+            GinIndex(fields=['search_vector'], name='core_joblisting_search_gin'),
+            # Public feed: live, not deleted, ordered by rank then date
+            models.Index(
+                fields=['-premium_rank', '-posted_at', 'id'],
+                condition=models.Q(is_live=True, deleted_at__isnull=True),
+                name='core_joblisting_feed_idx',
+            ),
+            # Salary filters and sorting: a range scan over live jobs that list a salary
+            models.Index(
+                fields=['-salary_min_monthly', '-posted_at', 'id'],
+                condition=models.Q(is_live=True, deleted_at__isnull=True, salary_min_monthly__isnull=False),
+                name='core_joblisting_salary_idx',
+            ),
+            # Lets the expiry sweeper find live jobs past their expiry date
+            models.Index(
+                fields=['expires_at'],
+                condition=models.Q(is_live=True),
+                name='core_joblisting_live_exp_idx',
+            ),
         ]
         verbose_name = _("ვაკანსია")
         verbose_name_plural = _("ვაკანსიები")
@@ -240,11 +352,23 @@ class JobApplication(models.Model):
     rejection_reasons = models.ManyToManyField(RejectionReason, blank=True, related_name='applications', verbose_name=_("უარის მიზეზები"))
     feedback = models.TextField(blank=True, verbose_name=_("უკუკავშირი"))
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded values so the daily rollup can apply the change (see core.rollups)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def save(self, *args, **kwargs):
         if self.job and (not self.job_title or not self.job_company):
             self.job_title = self.job.title
             self.job_company = self.job.company
         super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
     
     class Meta:
         ordering = ['-applied_at']
@@ -459,6 +583,100 @@ class SavedJob(models.Model):
         job_info = self.job_title if self.job is None else self.job.title
         return f"{self.user.username} - {job_info}"
 
+class SimilarJob(models.Model):
+    """Precomputed nearest neighbours of a job listing, see core.recommendations"""
+    job = models.ForeignKey('JobListing', on_delete=models.CASCADE, related_name='similar_entries', verbose_name=_("ვაკანსია"))
+    similar = models.ForeignKey('JobListing', on_delete=models.CASCADE, related_name='+', verbose_name=_("მსგავსი ვაკანსია"))
+    score = models.FloatField(verbose_name=_("მსგავსება"))
+    rank = models.PositiveSmallIntegerField(verbose_name=_("რიგი"))
+
+    class Meta:
+        unique_together = ('job', 'rank')
+        verbose_name = _("მსგავსი ვაკანსია")
+        verbose_name_plural = _("მსგავსი ვაკანსიები")
+        ordering = ['job', 'rank']
+
+class JobApplicationDaily(models.Model):
+    """
+    Applications to a job per day applied, with how many of them are unread
+    and in each status now. Kept current by core.rollups.
+    """
+    job = models.ForeignKey('JobListing', on_delete=models.CASCADE, related_name='daily_applications', verbose_name=_("ვაკანსია"))
+    day = models.DateField(verbose_name=_("დღე"))
+    applications = models.IntegerField(default=0, verbose_name=_("აპლიკაციები"))
+    unread = models.IntegerField(default=0, verbose_name=_("წაუკითხავი"))
+    in_review = models.IntegerField(default=0, verbose_name=_("განხილვის პროცესში"))
+    interview = models.IntegerField(default=0, verbose_name=_("გასაუბრება"))
+    reserve = models.IntegerField(default=0, verbose_name=_("რეზერვი"))
+
+    class Meta:
+        unique_together = ('job', 'day')
+        verbose_name = _("დღიური აპლიკაციები")
+        verbose_name_plural = _("დღიური აპლიკაციები")
+        ordering = ['job', 'day']
+
+class JobViewCount(models.Model):
+    """Total detail page views of a job, written in batches by core.counters"""
+    job = models.OneToOneField('JobListing', on_delete=models.CASCADE, primary_key=True, related_name='view_stats', verbose_name=_("ვაკანსია"))
+    views = models.PositiveBigIntegerField(default=0, verbose_name=_("ნახვები"))
+
+    class Meta:
+        verbose_name = _("ვაკანსიის ნახვები")
+        verbose_name_plural = _("ვაკანსიის ნახვები")
+
+class SavedSearch(models.Model):
+    """
+    A candidate's job_list filter set, matched against jobs as they go live
+    (see core.alerts). Empty fields match any job.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='saved_searches', verbose_name=_("მომხმარებელი"))
+    # Normalised query parameters, used to link back to the results
+    filters = models.JSONField(default=dict, verbose_name=_("ფილტრები"))
+    category = models.CharField(max_length=100, blank=True, verbose_name=_("კატეგორია"))
+    location = models.CharField(max_length=100, blank=True, verbose_name=_("ლოკაცია"))
+    experience = models.CharField(max_length=100, blank=True, verbose_name=_("გამოცდილება"))
+    premium_level = models.CharField(max_length=20, blank=True, verbose_name=_("პრემიუმ დონე"))
+    job_preferences = ArrayField(models.CharField(max_length=255), default=list, blank=True, verbose_name=_("სამუშაო გრაფიკი"))
+    salary_min_monthly = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, verbose_name=_("მინიმალური თვიური ხელფასი"))
+    # Stemmed search terms; a job must contain each of them (as a prefix, like search does)
+    keywords = ArrayField(models.CharField(max_length=100), default=list, blank=True, verbose_name=_("საკვანძო სიტყვები"))
+    is_active = models.BooleanField(default=True, verbose_name=_("აქტიური"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("შექმნის თარიღი"))
+
+    class Meta:
+        verbose_name = _("შენახული ძიება")
+        verbose_name_plural = _("შენახული ძიებები")
+        ordering = ['-created_at']
+        indexes = [
+            # The reverse index: jobs look up the searches they satisfy
+            models.Index(
+                fields=['category', 'location'], name='core_savedsearch_match_idx',
+                condition=models.Q(is_active=True),
+            ),
+            GinIndex(fields=['keywords'], name='core_savedsearch_keywords_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.filters}"
+
+    def get_absolute_url(self):
+        return f"{reverse('job_list')}?{urlencode(dict(self.filters, show_filters=1))}"
+
+class JobAlert(models.Model):
+    """A job matched by a saved search, waiting to be emailed (see core.alerts)"""
+    saved_search = models.ForeignKey('SavedSearch', on_delete=models.CASCADE, related_name='alerts', verbose_name=_("შენახული ძიება"))
+    job = models.ForeignKey('JobListing', on_delete=models.CASCADE, related_name='+', verbose_name=_("ვაკანსია"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("შექმნის თარიღი"))
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name=_("გაგზავნის თარიღი"))
+
+    class Meta:
+        unique_together = ('saved_search', 'job')
+        verbose_name = _("ვაკანსიის შეტყობინება")
+        verbose_name_plural = _("ვაკანსიის შეტყობინებები")
+        indexes = [
+            models.Index(fields=['saved_search'], name='core_jobalert_pending_idx', condition=models.Q(sent_at__isnull=True)),
+        ]
+
 # Add signals to ensure user profile and employer profile are properly created
 @receiver(post_save, sender=UserProfile)
 def ensure_employer_profile(sender, instance, created, **kwargs):
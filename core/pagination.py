@@ -0,0 +1,194 @@
+"""
+Keyset (seek) pagination.
+
+Instead of ``COUNT(*)`` plus ``OFFSET``, each page continues from the ordering
+values of the last row shown, so page N costs the same as page 1. Cursors are
+opaque URL-safe tokens carrying those values and the paging direction.
+"""
+import base64
+import datetime
+import decimal
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded for the paginator's ordering"""
+
+
+def _cursor_value(value):
+    # Full precision matters: a truncated timestamp would skip or repeat rows
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f'Cannot put {type(value).__name__} in a cursor')
+
+
+class KeysetPage:
+    """A page of results with cursors to its neighbours"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking on its ordering.
+
+    ``ordering`` must end with a unique field (normally ``id``) and none of its
+    fields may be NULL, otherwise rows could be skipped between pages.
+
+    When ``ordered_ids`` holds the already ordered primary keys of the whole
+    result (e.g. from a cache), pages are sliced from that list and only the
+    rows shown are fetched. Cursors are the same in both modes.
+    """
+
+    def __init__(self, queryset, per_page, ordering, ordered_ids=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        self.ordered_ids = ordered_ids
+
+    def page(self, cursor=None):
+        """Return the page after (or before) ``cursor``, or the first page"""
+        if self.ordered_ids is not None:
+            page = self._page_from_ids(cursor)
+            if page is not None:
+                return page
+
+        if not cursor:
+            rows = list(self.queryset.order_by(*self.ordering)[:self.per_page + 1])
+            return self._build_page(rows, has_more=len(rows) > self.per_page, came_from_cursor=False)
+
+        direction, values = self.decode_cursor(cursor)
+        if direction == 'n':
+            rows = list(
+                self.queryset.filter(self._seek_filter(values, forward=True))
+                .order_by(*self.ordering)[:self.per_page + 1]
+            )
+            return self._build_page(rows, has_more=len(rows) > self.per_page, came_from_cursor=True)
+
+        # Walk backwards with the ordering reversed, then restore display order
+        rows = list(
+            self.queryset.filter(self._seek_filter(values, forward=False))
+            .order_by(*self._reversed_ordering())[:self.per_page + 1]
+        )
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor('n', rows[-1]) if rows else None,
+            previous_cursor=self.encode_cursor('p', rows[0]) if rows and has_more else None,
+        )
+
+    def _page_from_ids(self, cursor):
+        """Slice a page out of ``ordered_ids``; None if the cursor row is not in the list"""
+        ids = self.ordered_ids
+        if not cursor:
+            start = 0
+            end = self.per_page
+        else:
+            direction, values = self.decode_cursor(cursor)
+            try:
+                position = ids.index(values[-1])
+            except ValueError:
+                return None
+            if direction == 'n':
+                start = position + 1
+                end = start + self.per_page
+            else:
+                start = max(0, position - self.per_page)
+                end = position
+        page_ids = ids[start:end]
+        rows_by_id = self.queryset.in_bulk(page_ids)
+        rows = [rows_by_id[pk] for pk in page_ids if pk in rows_by_id]
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor('n', rows[-1]) if rows and end < len(ids) else None,
+            previous_cursor=self.encode_cursor('p', rows[0]) if rows and start > 0 else None,
+        )
+
+    def _build_page(self, rows, has_more, came_from_cursor):
+        rows = rows[:self.per_page]
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor('n', rows[-1]) if rows and has_more else None,
+            previous_cursor=self.encode_cursor('p', rows[0]) if rows and came_from_cursor else None,
+        )
+
+    def _reversed_ordering(self):
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering)
+
+    def _seek_filter(self, values, forward):
+        """
+        Build ``(a, b, c) > (x, y, z)`` for mixed sort directions:
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        """
+        condition = Q(pk__in=[])
+        for position, name in enumerate(self.ordering):
+            descending = name.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            step = Q(**{f'{self.fields[position]}__{lookup}': values[position]})
+            for earlier in range(position):
+                step &= Q(**{self.fields[earlier]: values[earlier]})
+            condition |= step
+        # Redundant bound on the leading column lets the ordering index narrow the scan
+        leading = 'lte' if self.ordering[0].startswith('-') == forward else 'gte'
+        return condition & Q(**{f'{self.fields[0]}__{leading}': values[0]})
+
+    def encode_cursor(self, direction, obj):
+        values = [getattr(obj, field) for field in self.fields]
+        payload = json.dumps({'d': direction, 'v': values}, default=_cursor_value, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction, raw_values = payload['d'], payload['v']
+        except (ValueError, TypeError, KeyError):
+            raise InvalidCursor('Malformed cursor')
+        if direction not in ('n', 'p') or not isinstance(raw_values, list) or len(raw_values) != len(self.fields):
+            raise InvalidCursor('Cursor does not match this ordering')
+        return direction, [self._to_python(field, value) for field, value in zip(self.fields, raw_values)]
+
+    def _to_python(self, field_name, value):
+        if value is None:
+            raise InvalidCursor(f'Missing value for {field_name}')
+        try:
+            field = self.queryset.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            # Annotations such as a search rank are plain numbers
+            if not isinstance(value, (int, float)):
+                raise InvalidCursor(f'Invalid value for {field_name}')
+            return value
+        try:
+            return field.to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            # A JSON list or object where a date or number belongs
+            raise InvalidCursor(f'Invalid value for {field_name}')
@@ -0,0 +1,129 @@
+"""
+Similar-job recommendations.
+
+Live listings are turned into TF-IDF vectors (sublinear term frequency,
+L2-normalised) over the same stemmed terms the search engine uses, stored as
+a SciPy sparse matrix. Cosine similarity is then a sparse matrix product,
+computed for a block of jobs at a time and kept sparse so memory stays
+bounded. The top neighbours of each job are stored as SimilarJob rows, which
+``job_detail`` reads back with one indexed query.
+
+Saving a job with new text clears its ``similar_computed_at`` (see
+core.signals). ``manage.py build_similar_jobs`` refreshes those jobs, which is
+cheap enough to run every few minutes, or every job with ``--all``, which
+also lets older jobs pick up newer neighbours.
+"""
+import logging
+
+import numpy as np
+from scipy import sparse
+
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_content_version
+from .models import JobListing, SimilarJob
+from .search.tokenizer import tokenize
+
+logger = logging.getLogger(__name__)
+
+SIMILAR_JOBS_COUNT = 5
+# Jobs compared against the whole corpus per matrix product
+BLOCK_SIZE = 256
+
+
+def job_document(job):
+    # The title and category say more about a job than its description; count them twice
+    return ' '.join([job.title, job.title, job.category, job.category, job.description])
+
+
+def tfidf_matrix(documents):
+    """Return the L2-normalised TF-IDF matrix (documents x terms) as CSR"""
+    vocabulary = {}
+    indices = []
+    data = []
+    indptr = [0]
+    for document in documents:
+        counts = {}
+        for term in tokenize(document):
+            column = vocabulary.setdefault(term, len(vocabulary))
+            counts[column] = counts.get(column, 0) + 1
+        indices.extend(counts)
+        data.extend(counts.values())
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(documents), len(vocabulary)),
+    )
+    matrix.data = 1 + np.log(matrix.data)
+    document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    matrix = matrix @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix)
+
+
+def top_neighbours(matrix, rows, count=SIMILAR_JOBS_COUNT, block_size=BLOCK_SIZE):
+    """
+    Yield ``(row, [(neighbour_row, score), ...])`` with the ``count`` most
+    similar other rows of ``matrix`` for each of ``rows``, best first.
+    """
+    transposed = matrix.T.tocsc()
+    for start in range(0, len(rows), block_size):
+        block_rows = rows[start:start + block_size]
+        # Products stay sparse: only jobs sharing a term with the row get a score
+        scores = (matrix[block_rows] @ transposed).tocsr()
+        for position, row in enumerate(block_rows):
+            row_slice = slice(scores.indptr[position], scores.indptr[position + 1])
+            columns = scores.indices[row_slice]
+            values = scores.data[row_slice]
+            # A job is not similar to itself
+            keep = (columns != row) & (values > 0)
+            columns, values = columns[keep], values[keep]
+            if len(values) > count:
+                best = np.argpartition(-values, count - 1)[:count]
+            else:
+                best = np.arange(len(values))
+            best = best[np.argsort(-values[best], kind='stable')]
+            yield row, [(int(columns[i]), float(values[i])) for i in best]
+
+
+def refresh_similar_jobs(job_ids=None, count=SIMILAR_JOBS_COUNT):
+    """
+    Recompute the SimilarJob rows of the given live jobs, or of every live job
+    whose neighbours are missing or outdated when ``job_ids`` is None.
+    Returns the number of jobs refreshed.
+    """
+    if job_ids is None:
+        targets = set(
+            JobListing.objects.filter(is_live=True, similar_computed_at__isnull=True).values_list('id', flat=True)
+        )
+    else:
+        targets = set(job_ids)
+    if not targets:
+        return 0
+    jobs = list(JobListing.objects.filter(is_live=True).only('id', 'title', 'category', 'description').order_by('id'))
+    ids = [job.id for job in jobs]
+    rows = [row for row, job_id in enumerate(ids) if job_id in targets]
+    if not rows:
+        return 0
+
+    matrix = tfidf_matrix([job_document(job) for job in jobs])
+    refreshed = []
+    entries = []
+    for row, neighbours in top_neighbours(matrix, rows, count):
+        refreshed.append(ids[row])
+        entries.extend(
+            SimilarJob(job_id=ids[row], similar_id=ids[neighbour], score=score, rank=rank)
+            for rank, (neighbour, score) in enumerate(neighbours)
+        )
+    with transaction.atomic():
+        SimilarJob.objects.filter(job_id__in=refreshed).delete()
+        SimilarJob.objects.bulk_create(entries, batch_size=1000)
+        JobListing.all_objects.filter(id__in=refreshed).update(similar_computed_at=timezone.now())
+    # Job detail pages show the new neighbours
+    bump_content_version()
+    logger.info(f"Refreshed similar jobs for {len(refreshed)} job listings")
+    return len(refreshed)
+
@@ -0,0 +1,92 @@
+"""
+In-process registry for near-static lookup tables.
+
+Rejection reasons and pricing packages change a few times a year but are
+read on every status change and pricing page view. Each table is loaded once
+per process in the shape it is read in, so reads need no
+database work.
+
+Changes reach every process through a version number in the shared cache,
+as with the search index: the RejectionReason, PricingPackage and
+PricingFeature signal handlers in core.signals bump it, and a process that
+sees a version other than the one it loaded reloads the table on next use.
+Bumps wait for the transaction to commit, so no process ever caches rows
+that are later rolled back. Without a shared cache (no REDIS_URL) no process
+sees another's bumps, so each reloads a table once its copy is
+UNSHARED_RELOAD_INTERVAL seconds old.
+"""
+import threading
+import time
+
+from django.db import transaction
+from django.db.models import Prefetch
+
+from .models import PricingFeature, PricingPackage, RejectionReason
+from .search.engine import bump_shared_version, local_copy_expired, shared_version
+
+REJECTION_REASONS_VERSION_KEY = 'registry:rejection_reasons_version'
+PRICING_PACKAGES_VERSION_KEY = 'registry:pricing_packages_version'
+
+
+class Registry:
+    """A table loaded by ``load`` and reloaded when ``version_key`` changes"""
+
+    def __init__(self, version_key, load):
+        self.version_key = version_key
+        self.load = load
+        self._lock = threading.Lock()
+        self._data = None
+        self._version = None
+        self._loaded_at = None
+
+    def get(self):
+        with self._lock:
+            version = shared_version(self.version_key)
+            if self._data is None or version != self._version or local_copy_expired(self._loaded_at):
+                self._data = self.load()
+                self._version = version
+                self._loaded_at = time.monotonic()
+            return self._data
+
+    def invalidate(self):
+        """Make every process reload the table before its next lookup, once the transaction commits"""
+        transaction.on_commit(lambda: bump_shared_version(self.version_key))
+
+
+def _load_rejection_reasons():
+    return {reason.name: reason for reason in RejectionReason.objects.all()}
+
+
+def _load_pricing_packages():
+    return list(
+        PricingPackage.objects.filter(is_active=True)
+        .prefetch_related(Prefetch('features', queryset=PricingFeature.objects.order_by('display_order', 'id')))
+        .order_by('display_order')
+    )
+
+
+rejection_reason_registry = Registry(REJECTION_REASONS_VERSION_KEY, _load_rejection_reasons)
+pricing_package_registry = Registry(PRICING_PACKAGES_VERSION_KEY, _load_pricing_packages)
+
+
+def rejection_reason_ids(names):
+    """
+    Return the ids of the rejection reasons called ``names``, creating the
+    rows of valid choices that don't exist yet. Unknown names are ignored.
+    """
+    valid = dict(RejectionReason.REASON_CHOICES)
+    names = [name for name in dict.fromkeys(names) if name in valid]
+    reasons = {name: reason.id for name, reason in rejection_reason_registry.get().items()}
+    missing = [name for name in names if name not in reasons]
+    if missing:
+        RejectionReason.objects.bulk_create([RejectionReason(name=name) for name in missing], ignore_conflicts=True)
+        # The new rows are read directly; the registry picks them up once they
+        # are committed (bulk_create sends no signal, so invalidate here)
+        reasons.update(RejectionReason.objects.filter(name__in=missing).values_list('name', 'id'))
+        rejection_reason_registry.invalidate()
+    return [reasons[name] for name in names if name in reasons]
+
+
+def active_pricing_packages():
+    """Return the active pricing packages in display order, features prefetched"""
+    return pricing_package_registry.get()
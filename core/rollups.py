@@ -0,0 +1,173 @@
+"""
+Daily per-job application rollups.
+
+JobApplicationDaily holds, per job and day applied, the number of
+applications and how many of them are unread and in each status. The
+dashboards read a job's history from these rows instead of aggregating
+JobApplication on every load.
+
+Rows are maintained incrementally: saving or deleting an application moves
+its contribution from the old values to the new ones (see core.signals), and
+bulk changes go through ``update_applications``, which does the same for
+every row it updates. All changes are applied as additive upserts, so
+concurrent updates to the same day never overwrite each other.
+``manage.py backfill_application_rollups`` rebuilds the table from scratch.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import JobApplication, JobApplicationDaily
+
+# Rollup column counting the applications in each status
+STATUS_COLUMNS = {
+    'განხილვის_პროცესში': 'in_review',
+    'გასაუბრება': 'interview',
+    'რეზერვი': 'reserve',
+}
+ROLLUP_COLUMNS = ('applications', 'unread', 'in_review', 'interview', 'reserve')
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def _add_contribution(deltas, job_id, applied_at, status, is_read, sign):
+    """Add (sign=1) or remove (sign=-1) one application's counts in ``deltas``"""
+    if job_id is None or applied_at is None:
+        return
+    counts = deltas[(job_id, timezone.localdate(applied_at))]
+    counts['applications'] += sign
+    if not is_read:
+        counts['unread'] += sign
+    if status in STATUS_COLUMNS:
+        counts[STATUS_COLUMNS[status]] += sign
+
+
+def _new_deltas():
+    return defaultdict(lambda: dict.fromkeys(ROLLUP_COLUMNS, 0))
+
+
+def apply_deltas(deltas):
+    """Add ``{(job_id, day): {column: delta}}`` to the rollup rows in one upsert"""
+    rows = [
+        (job_id, day, *(counts[column] for column in ROLLUP_COLUMNS))
+        for (job_id, day), counts in sorted(deltas.items())
+        if any(counts.values())
+    ]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_SQL, [list(values) for values in zip(*rows)])
+
+
+_TABLE = JobApplicationDaily._meta.db_table
+UPSERT_SQL = f"""
+    INSERT INTO {_TABLE} (job_id, day, {', '.join(ROLLUP_COLUMNS)})
+    SELECT * FROM unnest(%s::bigint[], %s::date[], {', '.join(['%s::integer[]'] * len(ROLLUP_COLUMNS))})
+    ON CONFLICT (job_id, day) DO UPDATE SET
+    {', '.join(f'{column} = {_TABLE}.{column} + EXCLUDED.{column}' for column in ROLLUP_COLUMNS)}
+"""
+
+
+def record_application_change(application, created=False, deleted=False):
+    """Move a saved or deleted application's contribution in the rollup"""
+    deltas = _new_deltas()
+    loaded = getattr(application, '_loaded_values', None)
+    # Without loaded values an update can't be undone, but a deletion takes away what is there
+    if not created and (loaded is not None or deleted):
+        loaded = loaded or {}
+        _add_contribution(
+            deltas,
+            loaded.get('job_id', application.job_id),
+            loaded.get('applied_at', application.applied_at),
+            loaded.get('status', application.status),
+            loaded.get('is_read', application.is_read),
+            -1,
+        )
+    if not deleted:
+        _add_contribution(
+            deltas, application.job_id, application.applied_at, application.status, application.is_read, 1
+        )
+    apply_deltas(deltas)
+
+
+def update_applications(queryset, **values):
+    """
+    ``queryset.update(**values)`` that keeps the rollup in step.
+    Returns the number of applications updated.
+    """
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update(of=('self',)).order_by()
+            .values_list('id', 'job_id', 'applied_at', 'status', 'is_read')
+        )
+        if not rows:
+            return 0
+        JobApplication.objects.filter(id__in=[row[0] for row in rows]).update(**values)
+        deltas = _new_deltas()
+        for application_id, job_id, applied_at, status, is_read in rows:
+            _add_contribution(deltas, job_id, applied_at, status, is_read, -1)
+            _add_contribution(
+                deltas,
+                values.get('job_id', job_id),
+                applied_at,
+                values.get('status', status),
+                values.get('is_read', is_read),
+                1,
+            )
+        apply_deltas(deltas)
+    return len(rows)
+
+
+def backfill_application_rollups(batch_size=BACKFILL_BATCH_SIZE):
+    """Rebuild every rollup row from the applications; returns the number of rows written"""
+    daily = (
+        JobApplication.objects.filter(job__isnull=False)
+        .annotate(day=TruncDate('applied_at')).order_by()
+        .values('job_id', 'day')
+        .annotate(
+            applications=Count('id'),
+            unread=Count('id', filter=Q(is_read=False)),
+            **{column: Count('id', filter=Q(status=status)) for status, column in STATUS_COLUMNS.items()},
+        )
+    )
+    written = 0
+    with transaction.atomic():
+        JobApplicationDaily.objects.all().delete()
+        batch = []
+        for row in daily.iterator(chunk_size=batch_size):
+            batch.append(JobApplicationDaily(**row))
+            if len(batch) == batch_size:
+                JobApplicationDaily.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        JobApplicationDaily.objects.bulk_create(batch)
+        written += len(batch)
+    return written
+
+
+def daily_applications(job_id, start, end):
+    """
+    Return the rollup of a job for each day from ``start`` to ``end``
+    (inclusive) as a list of dicts, with zeros for days without applications
+    """
+    rows = {
+        row['day']: row for row in JobApplicationDaily.objects.filter(
+            job_id=job_id, day__gte=start, day__lte=end
+        ).values('day', *ROLLUP_COLUMNS)
+    }
+    series = []
+    day = start
+    while day <= end:
+        row = rows.get(day) or dict.fromkeys(ROLLUP_COLUMNS, 0)
+        series.append({
+            'day': day.isoformat(),
+            'applications': row['applications'],
+            'unread': row['unread'],
+            'statuses': {status: row[column] for status, column in STATUS_COLUMNS.items()},
+        })
+        day += timedelta(days=1)
+    return series
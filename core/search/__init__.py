@@ -0,0 +1,32 @@
+"""
+Job search.
+
+Two interchangeable backends filter a JobListing queryset by a search term
+and annotate a ``search_rank`` for ordering by relevance:
+
+* ``database`` (default): PostgreSQL full-text search over the GIN-indexed
+  ``search_vector`` column, see core.search.database.
+* ``memory``: an in-process BM25 inverted index with a Georgian-aware
+  tokenizer, see core.search.engine. Searches need no database work until
+  the matching rows are fetched.
+
+The backend is chosen with the JOB_SEARCH_BACKEND setting.
+"""
+from django.conf import settings
+
+from . import database, engine
+from .database import SEARCH_CONFIG, build_search_query, job_search_vector
+
+SEARCH_BACKENDS = {
+    'database': database.search_jobs,
+    'memory': engine.search_jobs,
+}
+
+
+def search_backend():
+    return getattr(settings, 'JOB_SEARCH_BACKEND', 'database')
+
+
+def search_jobs(queryset, search_term):
+    """Filter a JobListing queryset by ``search_term`` with the configured backend"""
+    return SEARCH_BACKENDS[search_backend()](queryset, search_term)
@@ -0,0 +1,116 @@
+"""
+Search-as-you-type suggestions.
+
+Suggestions come from live job titles, the company names of employers with
+live jobs and the category labels. They are held in a sorted array of keys
+in each process, one key per word start of every suggestion, so a prefix
+lookup is two binary searches and no database work.
+
+Changes to listings bump a version in the shared cache (see core.signals
+and core.expiry); each process rebuilds its array lazily when it sees a new
+version. Without a shared cache a process never sees the others' bumps, so
+it rebuilds its array once it is UNSHARED_RELOAD_INTERVAL seconds old.
+"""
+import bisect
+import threading
+import time
+
+from django.db.models import Count
+
+from .engine import bump_shared_version, local_copy_expired, shared_version
+
+AUTOCOMPLETE_VERSION_KEY = 'search:autocomplete_version'
+
+# Only this many prefix matches are ranked, which bounds the cost of short prefixes
+MAX_CANDIDATES = 500
+
+
+def normalise(text):
+    return ' '.join(text.casefold().split())
+
+
+class PrefixIndex:
+    """Suggestions keyed by every word start, searchable by prefix with bisect"""
+
+    def __init__(self, suggestions):
+        # suggestions: (label, type, weight) tuples
+        self.suggestions = list(suggestions)
+        entries = []
+        for position, (label, suggestion_type, weight) in enumerate(self.suggestions):
+            words = normalise(label).split(' ')
+            for start in range(len(words)):
+                entries.append((' '.join(words[start:]), start, position))
+        entries.sort()
+        self.keys = [key for key, start, position in entries]
+        self.entries = [(start, position) for key, start, position in entries]
+
+    def __len__(self):
+        return len(self.suggestions)
+
+    def suggest(self, prefix, limit=8):
+        """
+        Return up to ``limit`` suggestions with a word starting with ``prefix``.
+        Suggestions that start with the prefix come first, then the ones with
+        the most live jobs.
+        """
+        prefix = normalise(prefix)
+        if not prefix:
+            return []
+        low = bisect.bisect_left(self.keys, prefix)
+        high = min(bisect.bisect_left(self.keys, prefix + '\uffff'), low + MAX_CANDIDATES)
+        best = {}
+        for start, position in self.entries[low:high]:
+            if position not in best or start < best[position]:
+                best[position] = start
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (item[1] > 0, -self.suggestions[item[0]][2], self.suggestions[item[0]][0])
+        )
+        return [
+            {'label': self.suggestions[position][0], 'type': self.suggestions[position][1]}
+            for position, start in ranked[:limit]
+        ]
+
+
+def _build_index():
+    from ..models import EmployerProfile, JobListing
+
+    suggestions = []
+    live_jobs = JobListing.objects.filter(is_live=True)
+    for title, count in live_jobs.values_list('title').annotate(count=Count('id')).order_by():
+        suggestions.append((title, 'title', count))
+    companies = EmployerProfile.objects.filter(
+        job_listings__is_live=True, job_listings__deleted_at__isnull=True
+    ).exclude(company_name='').values_list('company_name').annotate(count=Count('job_listings')).order_by()
+    for company_name, count in companies:
+        suggestions.append((company_name, 'company', count))
+    for value, label in JobListing.CATEGORY_CHOICES:
+        suggestions.append((str(label), 'category', 0))
+    return PrefixIndex(suggestions)
+
+
+_lock = threading.Lock()
+_index = None
+_index_version = None
+_index_loaded_at = None
+
+
+def get_autocomplete_index():
+    """Return this process's suggestion index, rebuilding it after listing changes"""
+    global _index, _index_version, _index_loaded_at
+    with _lock:
+        version = shared_version(AUTOCOMPLETE_VERSION_KEY)
+        if _index is None or version != _index_version or local_copy_expired(_index_loaded_at):
+            _index = _build_index()
+            _index_version = version
+            _index_loaded_at = time.monotonic()
+        return _index
+
+
+def invalidate_autocomplete():
+    """Make every process rebuild its suggestions before the next lookup"""
+    bump_shared_version(AUTOCOMPLETE_VERSION_KEY)
+
+
+def suggest(prefix, limit=8):
+    return get_autocomplete_index().suggest(prefix, limit)
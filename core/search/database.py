@@ -0,0 +1,55 @@
+"""
+PostgreSQL full-text search backend.
+
+Every listing keeps a ``search_vector`` column built from its title (weight A),
+company (weight B) and description (weight C). The column is GIN-indexed, so a
+search is an index lookup instead of a scan over every description.
+
+PostgreSQL ships no Georgian dictionary, so the ``simple`` configuration is
+used: it lowercases and tokenises Georgian script without stemming. Terms are
+matched as prefixes so partial words keep working the way ``icontains`` did.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'simple'
+
+_TERM_RE = re.compile(r'\w+')
+
+
+def job_search_vector():
+    """Return the weighted search vector expression for a JobListing row"""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+        SearchVector('company', weight='B', config=SEARCH_CONFIG) +
+        SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def build_search_query(search_term):
+    """
+    Turn user input into a prefix tsquery (every term must match).
+    Returns None when the input contains no searchable terms.
+    """
+    terms = _TERM_RE.findall(search_term.lower())
+    if not terms:
+        return None
+    raw_query = ' & '.join(f'{term}:*' for term in terms)
+    return SearchQuery(raw_query, search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_jobs(queryset, search_term):
+    """
+    Filter a JobListing queryset by a search term and annotate ``search_rank``
+    so callers can order by relevance. The rank is cast to double precision so
+    it survives a round trip through a pagination cursor exactly.
+    """
+    query = build_search_query(search_term)
+    if query is None:
+        return queryset.none()
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+    )
@@ -0,0 +1,298 @@
+"""
+In-memory BM25 search backend.
+
+Each process keeps an inverted index over the title, company and description
+of live job listings, so matching and ranking a search needs no database
+work. The index is built lazily on first use and kept current by the
+JobListing signal handlers in core.signals.
+
+Other processes learn about changes through a version number in the shared
+cache. Every saved job bumps it and logs the job's id under the new version,
+and a process that is behind replays the logged changes, re-reading only
+those jobs, before the next search. It rebuilds its index when it is too far
+behind or a change is missing from the log; ``manage.py
+rebuild_search_index`` bumps the version without logging to force that
+everywhere.
+
+With a per-process cache (no REDIS_URL) versions can't travel between
+processes, so each one rebuilds its index once it is UNSHARED_RELOAD_INTERVAL
+seconds old instead.
+"""
+import bisect
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+from .tokenizer import tokenize
+
+SEARCH_INDEX_VERSION_KEY = 'search:index_version'
+
+# Field weights: a term in the title counts as much as three in the description
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'company': 2.0,
+    'description': 1.0,
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Ranked results passed on to the database; anything past this is too weak to page to
+MAX_RESULTS = 1000
+
+# How long changes stay in the shared log, and how many a process replays
+# before it rebuilds its index instead
+CHANGE_LOG_TIMEOUT = 60 * 60
+MAX_REPLAYED_CHANGES = 200
+
+# Seconds a per-process copy is trusted when versions aren't shared
+UNSHARED_RELOAD_INTERVAL = 60
+
+
+class SearchIndex:
+    """An inverted index over job listings scored with BM25"""
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0.0
+        self._vocabulary = None
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def add(self, job):
+        """Index a job, replacing any previous version of it"""
+        self.remove(job.pk)
+        frequencies = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(getattr(job, field) or ''):
+                frequencies[term] += weight
+        for term, frequency in frequencies.items():
+            if term not in self.postings:
+                self._vocabulary = None
+            self.postings[term][job.pk] = frequency
+        self.doc_terms[job.pk] = tuple(frequencies)
+        self.doc_lengths[job.pk] = sum(frequencies.values())
+        self.total_length += self.doc_lengths[job.pk]
+
+    def remove(self, job_id):
+        terms = self.doc_terms.pop(job_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings[term]
+            del postings[job_id]
+            if not postings:
+                del self.postings[term]
+                self._vocabulary = None
+        self.total_length -= self.doc_lengths.pop(job_id)
+
+    def vocabulary(self):
+        """Return the indexed terms in sorted order"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        return self._vocabulary
+
+    def expand(self, prefix):
+        """Return the indexed terms starting with ``prefix``"""
+        vocabulary = self.vocabulary()
+        start = bisect.bisect_left(vocabulary, prefix)
+        end = bisect.bisect_left(vocabulary, prefix + '\uffff')
+        return vocabulary[start:end]
+
+    def search(self, text, limit=MAX_RESULTS):
+        """
+        Return ``(job_id, score)`` pairs for jobs matching every term of
+        ``text`` as a prefix, best first. ``limit=None`` returns them all.
+        """
+        terms = list(dict.fromkeys(tokenize(text)))
+        if not terms or not self.doc_terms:
+            return []
+        average_length = self.total_length / len(self.doc_terms)
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for indexed_term in self.expand(term):
+                for job_id, score in self._bm25(indexed_term, average_length).items():
+                    # A prefix may expand to several forms; the best one counts
+                    if score > term_scores.get(job_id, 0.0):
+                        term_scores[job_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {job_id: scores[job_id] + score for job_id, score in term_scores.items() if job_id in scores}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked if limit is None else ranked[:limit]
+
+    def _bm25(self, term, average_length):
+        postings = self.postings[term]
+        count = len(self.doc_terms)
+        idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+        return {
+            job_id: idf * frequency * (K1 + 1) / (
+                frequency + K1 * (1 - B + B * self.doc_lengths[job_id] / average_length)
+            )
+            for job_id, frequency in postings.items()
+        }
+
+
+_lock = threading.RLock()
+_index = None
+_index_version = None
+_index_loaded_at = None
+
+
+def _live_jobs():
+    from ..models import JobListing
+
+    return JobListing.objects.filter(is_live=True).only(*FIELD_WEIGHTS)
+
+
+def _build_index():
+    index = SearchIndex()
+    for job in _live_jobs().iterator(chunk_size=2000):
+        index.add(job)
+    return index
+
+
+def _change_key(version):
+    return f'search:change:{version}'
+
+
+def _replay_changes(version):
+    """
+    Bring this process's index from its version up to ``version`` with the
+    logged changes. Returns False, changing nothing, when it can't.
+    """
+    if _index is None or _index_version is None or not 0 < version - _index_version <= MAX_REPLAYED_CHANGES:
+        return False
+    keys = [_change_key(number) for number in range(_index_version + 1, version + 1)]
+    changes = cache.get_many(keys)
+    if len(changes) < len(keys):
+        return False
+    job_ids = set(changes.values())
+    live = {job.pk: job for job in _live_jobs().filter(id__in=job_ids)}
+    for job_id in job_ids:
+        if job_id in live:
+            _index.add(live[job_id])
+        else:
+            _index.remove(job_id)
+    return True
+
+
+def shared_version(key):
+    """Return the version stored under ``key`` in the shared cache"""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 0, None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_shared_version(key):
+    """Increment the version stored under ``key`` and return the new value"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+        return 1
+
+
+def versions_are_shared():
+    """Whether every process reads the versions from the same cache"""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def local_copy_expired(loaded_at):
+    """
+    Whether a per-process copy loaded at ``loaded_at`` (``time.monotonic()``)
+    must be reloaded whatever its version: without a shared cache other
+    processes' changes never move it.
+    """
+    return not versions_are_shared() and time.monotonic() - loaded_at >= UNSHARED_RELOAD_INTERVAL
+
+
+def get_search_index():
+    """Return this process's index, brought up to date with other processes' changes"""
+    global _index, _index_version, _index_loaded_at
+    with _lock:
+        version = shared_version(SEARCH_INDEX_VERSION_KEY)
+        if _index is not None and not local_copy_expired(_index_loaded_at):
+            if version == _index_version:
+                return _index
+            if _replay_changes(version):
+                _index_version = version
+                return _index
+        _index = _build_index()
+        _index_version = version
+        _index_loaded_at = time.monotonic()
+        return _index
+
+
+def rebuild_search_index():
+    """Rebuild the index here and make every other process rebuild its own"""
+    global _index, _index_version, _index_loaded_at
+    with _lock:
+        _index_version = bump_shared_version(SEARCH_INDEX_VERSION_KEY)
+        _index = _build_index()
+        _index_loaded_at = time.monotonic()
+        return _index
+
+
+def update_job(job, deleted=False):
+    """Add, replace or drop a job in the index after it was saved or deleted"""
+    global _index_version
+    with _lock:
+        version = bump_shared_version(SEARCH_INDEX_VERSION_KEY)
+        cache.set(_change_key(version), job.pk, CHANGE_LOG_TIMEOUT)
+        if _index is not None and _index_version == version - 1:
+            if job.is_live and job.deleted_at is None and not deleted:
+                _index.add(job)
+            else:
+                _index.remove(job.pk)
+            _index_version = version
+        # Otherwise another process changed something too; the next search replays it
+
+
+def invalidate_search_index():
+    """Make every process rebuild its index before the next search"""
+    bump_shared_version(SEARCH_INDEX_VERSION_KEY)
+
+
+def search_jobs(queryset, search_term):
+    """
+    Filter a JobListing queryset to the jobs matching ``search_term`` and
+    annotate their BM25 score as ``search_rank``.
+
+    Only the best MAX_RESULTS matches are passed on. When there are more, they
+    are picked among the jobs ``queryset`` admits, so apply the other filters
+    first or their matches past the cut are lost.
+    """
+    with _lock:
+        results = get_search_index().search(search_term, limit=None)
+    if len(results) > MAX_RESULTS:
+        admitted = set(queryset.order_by().values_list('id', flat=True))
+        results = [result for result in results if result[0] in admitted][:MAX_RESULTS]
+    if not results:
+        return queryset.none()
+    job_ids = [job_id for job_id, score in results]
+    scores = [score for job_id, score in results]
+    table = queryset.model._meta.db_table
+    rank = RawSQL(
+        f'(%s::float8[])[array_position(%s::bigint[], "{table}"."id")]',
+        (scores, job_ids),
+        output_field=FloatField(),
+    )
+    return queryset.filter(id__in=job_ids).annotate(search_rank=rank)
@@ -0,0 +1,41 @@
+"""
+Tokenizer for the in-memory search engine.
+
+Text is lowercased and split into word tokens. Georgian words go through a
+light suffix stripper: the longest matching case ending, plural marker or
+postposition is removed, so ``დეველოპერი``, ``დეველოპერის`` and
+``დეველოპერებისთვის`` all index as ``დეველოპერ``. Latin words only lose a
+plural ``s``. The stripper is deliberately conservative; query terms are also
+matched as prefixes, which covers most of the forms it leaves alone.
+"""
+import re
+
+_WORD_RE = re.compile(r'\w+')
+_GEORGIAN_RE = re.compile(r'[ა-ჿ]')
+
+# Longest first, so compound endings win over their tails
+GEORGIAN_SUFFIXES = sorted([
+    'ებისთვის', 'ისთვის', 'ებიდან', 'ებთან', 'ებში', 'ებზე', 'ებით', 'ების',
+    'ებმა', 'ებს', 'ები', 'იდან', 'თვის', 'ში', 'ზე', 'თან', 'დან', 'ის',
+    'ით', 'ად', 'მა', 'ს', 'ი', 'ა',
+], key=len, reverse=True)
+
+# Never strip a word below this many letters
+MIN_STEM_LENGTH = 3
+
+
+def stem(word):
+    """Reduce a lowercased word to its search stem"""
+    if _GEORGIAN_RE.match(word):
+        for suffix in GEORGIAN_SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+                return word[:-len(suffix)]
+        return word
+    if word.endswith('s') and not word.endswith('ss') and len(word) > MIN_STEM_LENGTH + 1:
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Split text into a list of stemmed search terms"""
+    return [stem(word) for word in _WORD_RE.findall(text.lower())]
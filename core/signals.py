@@ -1,7 +1,21 @@
-from django.db.models.signals import post_save, post_migrate
+from django.db.models.signals import post_save, post_delete, post_migrate
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile
+from .models import (
+    UserProfile, EmployerProfile, JobListing, JobApplication, SavedJob, RejectionReason, PricingPackage,
+    PricingFeature, soft_deleted
+)
+from .search import job_search_vector, search_backend
+from .search import engine as search_engine
+from .search.autocomplete import invalidate_autocomplete
+from .alerts import queue_job_alerts
+from .stats import invalidate_employer_stats
+from .rollups import record_application_change
+from .registry import rejection_reason_registry, pricing_package_registry
+from .caching import (
+    FACET_FIELDS, CATALOG_FIELDS, invalidate_job_facets, bump_catalog_version, bump_content_version,
+    invalidate_user_job_state
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -46,6 +60,166 @@ def save_user_profile(sender, instance, **kwargs):
     else:
         logger.warning(f"Signal: User {instance.username} has no UserProfile, this is unexpected")
 
+@receiver(post_save, sender=JobListing)
+def update_job_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Rebuild the full-text search vector when the searchable text of a job changes.
+    """
+    searchable_fields = ('title', 'company', 'description')
+    if update_fields is not None and not set(update_fields) & set(searchable_fields):
+        return
+    if not created and not instance.has_changed(*searchable_fields):
+        return
+    JobListing.all_objects.filter(pk=instance.pk).update(search_vector=job_search_vector())
+
+@receiver(post_save, sender=JobListing)
+def update_job_search_index(sender, instance, created, **kwargs):
+    """
+    Keep the in-memory search index current when a job's text or visibility changes.
+    """
+    if search_backend() != 'memory':
+        return
+    if created or instance.has_changed('title', 'company', 'description', 'is_live', 'deleted_at'):
+        search_engine.update_job(instance)
+
+@receiver(post_delete, sender=JobListing)
+def remove_job_from_search_index(sender, instance, **kwargs):
+    if search_backend() == 'memory':
+        search_engine.update_job(instance, deleted=True)
+
+@receiver(post_save, sender=JobListing)
+def invalidate_autocomplete_on_job_save(sender, instance, created, **kwargs):
+    """
+    Rebuild search suggestions when a live job's title or company appears or goes.
+    """
+    if created:
+        if instance.is_live:
+            invalidate_autocomplete()
+    elif instance.has_changed('title', 'employer_id', 'is_live', 'deleted_at'):
+        invalidate_autocomplete()
+
+@receiver(post_delete, sender=JobListing)
+def invalidate_autocomplete_on_job_delete(sender, instance, **kwargs):
+    invalidate_autocomplete()
+
+@receiver(post_save, sender=EmployerProfile)
+def invalidate_autocomplete_on_employer_save(sender, instance, **kwargs):
+    # Company names are suggested; employer profiles are saved rarely enough not to track changes
+    invalidate_autocomplete()
+
+@receiver(post_save, sender=JobListing)
+def mark_similar_jobs_stale(sender, instance, created, **kwargs):
+    """
+    Queue a job for the next build_similar_jobs run when its text or visibility changes.
+    """
+    if created or instance.similar_computed_at is None:
+        return
+    if instance.has_changed('title', 'category', 'description', 'is_live'):
+        JobListing.all_objects.filter(pk=instance.pk).update(similar_computed_at=None)
+
+@receiver(post_save, sender=JobListing)
+def queue_job_alerts_on_publish(sender, instance, created, **kwargs):
+    """
+    Match a job against the saved searches once, when it goes live.
+    """
+    if instance.is_live and instance.deleted_at is None and (created or instance.has_changed('is_live')):
+        queue_job_alerts(instance)
+
+@receiver(post_save, sender=JobListing)
+def invalidate_job_facets_on_save(sender, instance, created, **kwargs):
+    """
+    Drop the cached category/location facets when a job enters, leaves or
+    moves between facet values. Soft deletion goes through save() as well.
+    """
+    if created:
+        if instance.is_live:
+            invalidate_job_facets()
+    elif instance.has_changed(*FACET_FIELDS):
+        invalidate_job_facets()
+
+@receiver(post_delete, sender=JobListing)
+def invalidate_job_facets_on_delete(sender, instance, **kwargs):
+    invalidate_job_facets()
+
+@receiver(post_save, sender=JobListing)
+def bump_catalog_version_on_save(sender, instance, created, **kwargs):
+    """
+    Orphan every cached job list when a change can affect which jobs match
+    a filter set or how they are ordered.
+    """
+    if created:
+        if instance.status == 'approved':
+            bump_catalog_version()
+    elif instance.has_changed(*CATALOG_FIELDS):
+        bump_catalog_version()
+
+@receiver(post_delete, sender=JobListing)
+def bump_catalog_version_on_delete(sender, instance, **kwargs):
+    bump_catalog_version()
+
+@receiver(soft_deleted, sender=JobListing)
+def invalidate_job_caches_on_bulk_soft_delete(sender, count, **kwargs):
+    if count:
+        invalidate_job_facets()
+        bump_catalog_version()
+        bump_content_version()
+        invalidate_autocomplete()
+        if search_backend() == 'memory':
+            search_engine.invalidate_search_index()
+
+@receiver(post_save, sender=JobListing)
+@receiver(post_delete, sender=JobListing)
+@receiver(post_save, sender=EmployerProfile)
+def bump_content_version_on_change(sender, instance, **kwargs):
+    """
+    Change the validators of the public job pages (see core.conditional);
+    any saved field may be shown on one of them.
+    """
+    bump_content_version()
+
+@receiver(post_save, sender=SavedJob)
+@receiver(post_delete, sender=SavedJob)
+@receiver(post_save, sender=JobApplication)
+@receiver(post_delete, sender=JobApplication)
+def invalidate_user_job_state_on_change(sender, instance, **kwargs):
+    """
+    Drop a user's cached saved/applied job ids when they save, unsave or apply.
+    """
+    if instance.user_id:
+        invalidate_user_job_state(instance.user_id)
+
+@receiver(post_save, sender=JobListing)
+@receiver(post_delete, sender=JobListing)
+def invalidate_employer_stats_on_job_change(sender, instance, **kwargs):
+    invalidate_employer_stats(instance.employer_id)
+
+@receiver(post_save, sender=JobApplication)
+@receiver(post_delete, sender=JobApplication)
+def invalidate_employer_stats_on_application_change(sender, instance, **kwargs):
+    # The job is normally already loaded by the code that saved the application
+    if instance.job_id:
+        invalidate_employer_stats(instance.job.employer_id)
+
+@receiver(post_save, sender=JobApplication)
+def update_application_rollup_on_save(sender, instance, created, **kwargs):
+    record_application_change(instance, created=created)
+
+@receiver(post_delete, sender=JobApplication)
+def update_application_rollup_on_delete(sender, instance, **kwargs):
+    record_application_change(instance, deleted=True)
+
+@receiver(post_save, sender=RejectionReason)
+@receiver(post_delete, sender=RejectionReason)
+def reload_rejection_reasons(sender, instance, **kwargs):
+    rejection_reason_registry.invalidate()
+
+@receiver(post_save, sender=PricingPackage)
+@receiver(post_delete, sender=PricingPackage)
+@receiver(post_save, sender=PricingFeature)
+@receiver(post_delete, sender=PricingFeature)
+def reload_pricing_packages(sender, instance, **kwargs):
+    pricing_package_registry.invalidate()
+
 # Ensure admin user/profile exists after migrations
 @receiver(post_migrate)
 def ensure_admin_user(sender, **kwargs):
@@ -0,0 +1,170 @@
+"""
+Summary numbers for the employer dashboards.
+
+EmployerStats computes every headline metric of an employer in one aggregate
+query over their job listings joined to the applications, using conditional
+counts. The result is cached per employer and dropped by the JobListing and
+JobApplication signal handlers in core.signals. A short timeout covers the
+changes that send no signal (bulk updates, jobs reaching the expiry window).
+
+HistoricalStats counts every table of the admin historical data page,
+deleted rows included, with one conditional aggregate per table. Tables
+past HISTORICAL_EXACT_MAX_ROWS are estimated from PostgreSQL's statistics
+instead: totals from pg_class.reltuples, the filtered counts from the
+planner's row estimate, so the page never scans the whole history.
+"""
+import json
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Q
+from django.utils import timezone
+
+EMPLOYER_STATS_CACHE_TIMEOUT = 60 * 5
+# Live jobs expiring within this window count as expiring soon
+EXPIRING_SOON = timedelta(days=7)
+
+
+def employer_stats_cache_key(employer_id):
+    return f'employer:stats:{employer_id}'
+
+
+@dataclass(frozen=True)
+class EmployerStats:
+    total_jobs: int = 0
+    active_jobs: int = 0
+    expiring_soon: int = 0
+    total_applicants: int = 0
+    unread_applicants: int = 0
+
+    @property
+    def avg_applicants(self):
+        """Applications per job, over all of the employer's jobs"""
+        return round(self.total_applicants / self.total_jobs, 2) if self.total_jobs else 0
+
+    @classmethod
+    def compute(cls, employer_id):
+        from .models import JobListing
+
+        now = timezone.now()
+        # Job counts are distinct because the applications join repeats each job per applicant
+        values = JobListing.objects.filter(employer_id=employer_id).aggregate(
+            total_jobs=Count('id', distinct=True),
+            active_jobs=Count('id', filter=Q(status='approved'), distinct=True),
+            expiring_soon=Count(
+                'id', filter=Q(is_live=True, expires_at__gte=now, expires_at__lte=now + EXPIRING_SOON), distinct=True
+            ),
+            total_applicants=Count('applications'),
+            unread_applicants=Count('applications', filter=Q(applications__is_read=False)),
+        )
+        return cls(**values)
+
+    @classmethod
+    def for_employer(cls, employer_id):
+        """Return the employer's stats, from the cache when possible"""
+        key = employer_stats_cache_key(employer_id)
+        values = cache.get(key)
+        if values is not None:
+            return cls(**values)
+        stats = cls.compute(employer_id)
+        cache.set(key, asdict(stats), EMPLOYER_STATS_CACHE_TIMEOUT)
+        return stats
+
+
+def invalidate_employer_stats(employer_id):
+    if employer_id is not None:
+        cache.delete(employer_stats_cache_key(employer_id))
+
+
+HISTORICAL_STATS_CACHE_TIMEOUT = 60
+# Above this many rows (by the planner's statistics) the counts are estimated
+HISTORICAL_EXACT_MAX_ROWS = 1_000_000
+
+
+def historical_stats_cache_key(approximate):
+    mode = {None: 'auto', True: 'approximate', False: 'exact'}[approximate]
+    return f'admin:historical_stats:{mode}'
+
+
+def table_row_estimates(models):
+    """Return ``{model: rows}`` from pg_class.reltuples; -1 for tables never analysed"""
+    tables = {model._meta.db_table: model for model in models}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relname, reltuples FROM pg_class WHERE relkind = 'r' AND relname = ANY(%s)",
+            [list(tables)]
+        )
+        return {tables[name]: int(rows) for name, rows in cursor.fetchall()}
+
+
+def planner_rows(queryset):
+    """Return the planner's estimate of the rows ``queryset`` matches, without running it"""
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+@dataclass(frozen=True)
+class HistoricalStats:
+    total_jobs: int = 0
+    active_jobs: int = 0
+    deleted_jobs: int = 0
+    total_employers: int = 0
+    active_employers: int = 0
+    deleted_employers: int = 0
+    total_applications: int = 0
+    applications_with_deleted_jobs: int = 0
+    total_saved: int = 0
+    saved_with_deleted_jobs: int = 0
+    approximate: bool = False
+    # Prefixes ('jobs', 'employers', ...) of the tables whose counts are estimates
+    estimated: tuple = ()
+
+    @staticmethod
+    def _tables():
+        from .models import EmployerProfile, JobApplication, JobListing, SavedJob
+
+        # (prefix, rows of the table, condition of the second count, its name)
+        return (
+            ('jobs', JobListing.all_objects.all(), Q(deleted_at__isnull=False), 'deleted_jobs'),
+            ('employers', EmployerProfile.all_objects.all(), Q(deleted_at__isnull=False), 'deleted_employers'),
+            ('applications', JobApplication.objects.all(), Q(job__isnull=True), 'applications_with_deleted_jobs'),
+            ('saved', SavedJob.objects.all(), Q(job__isnull=True), 'saved_with_deleted_jobs'),
+        )
+
+    @classmethod
+    def compute(cls, approximate=None):
+        """
+        Count every table, estimating those past HISTORICAL_EXACT_MAX_ROWS.
+        ``approximate`` forces the estimates on (True) or off (False).
+        """
+        tables = cls._tables()
+        estimates = table_row_estimates([queryset.model for _, queryset, _, _ in tables])
+        values = {}
+        estimated = []
+        for prefix, queryset, condition, name in tables:
+            rows = estimates.get(queryset.model, -1)
+            estimate = approximate if approximate is not None else rows > HISTORICAL_EXACT_MAX_ROWS
+            if estimate:
+                total = rows if rows >= 0 else planner_rows(queryset)
+                counts = {'total': total, name: min(planner_rows(queryset.filter(condition)), total)}
+                estimated.append(prefix)
+            else:
+                counts = queryset.aggregate(total=Count('pk'), **{name: Count('pk', filter=condition)})
+            values[f'total_{prefix}'] = counts.pop('total')
+            values.update(counts)
+        values['active_jobs'] = values['total_jobs'] - values['deleted_jobs']
+        values['active_employers'] = values['total_employers'] - values['deleted_employers']
+        return cls(approximate=bool(estimated), estimated=tuple(estimated), **values)
+
+    @classmethod
+    def for_admin(cls, approximate=None):
+        """Return the historical stats, from the cache when possible"""
+        key = historical_stats_cache_key(approximate)
+        values = cache.get(key)
+        if values is not None:
+            return cls(**values)
+        stats = cls.compute(approximate)
+        cache.set(key, asdict(stats), HISTORICAL_STATS_CACHE_TIMEOUT)
+        return stats
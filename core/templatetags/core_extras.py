@@ -8,4 +8,19 @@ def get_item(dictionary, key):
     Get an item from a dictionary by key
     Usage: {{ mydict|get_item:key }}
     """
-    return dictionary.get(key, '') 
\ No newline at end of file
+    return dictionary.get(key, '') 
+
+@register.simple_tag(takes_context=True)
+def job_card(context, job, template_name=None):
+    """
+    Output a job's card from the fragments the view prepared with
+    core.caching.render_job_cards, or render it through the cache on its own.
+    Usage: {% job_card job %}
+    """
+    from core.caching import JOB_CARD_TEMPLATE, render_job_cards
+
+    template_name = template_name or JOB_CARD_TEMPLATE
+    job_cards = context.get('job_cards') or {}
+    if job.pk in job_cards:
+        return job_cards[job.pk]
+    return render_job_cards([job], template_name)[job.pk]
@@ -0,0 +1,57 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from core.models import UserProfile, JobListing, JobApplication, SavedJob, RejectionReason
+
+
+class AdminChangelistQueryTest(TestCase):
+    """Changelist pages must cost the same number of queries however many rows they show"""
+
+    CHANGELISTS = (
+        'admin:core_joblisting_changelist',
+        'admin:core_employerprofile_changelist',
+        'admin:core_jobapplication_changelist',
+        'admin:core_savedjob_changelist',
+        'admin:auth_user_changelist',
+    )
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser('moderator', 'moderator@example.com', 'moderatorpass')
+        self.reason = RejectionReason.objects.create(name='ლოკაცია')
+        self.client = Client()
+        self.client.login(username='moderator', password='moderatorpass')
+        self.add_rows(0)
+
+    def add_rows(self, start, count=2):
+        for i in range(start, start + count):
+            employer_user = User.objects.create_user(f'employer{i}', f'employer{i}@example.com', 'pass')
+            profile = UserProfile.objects.get(user=employer_user)
+            profile.role = 'employer'
+            profile.save()
+            job = JobListing.objects.create(
+                title=f'Job {i}', company=f'Company {i}', description='Description',
+                employer=profile.employer_profile, status='approved'
+            )
+            candidate = User.objects.create_user(f'candidate{i}', f'candidate{i}@example.com', 'pass')
+            application = JobApplication.objects.create(
+                job=job, user=candidate, cover_letter='Hello', resume='resumes/cv.pdf', status='რეზერვი'
+            )
+            application.rejection_reasons.add(self.reason)
+            SavedJob.objects.create(user=candidate, job=job)
+
+    def changelist_queries(self):
+        counts = {}
+        for name in self.CHANGELISTS:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            counts[name] = len(context.captured_queries)
+        return counts
+
+    def test_query_count_independent_of_rows(self):
+        """Test that doubling the rows on each changelist adds no queries"""
+        before = self.changelist_queries()
+        self.add_rows(2, count=10)
+        self.assertEqual(self.changelist_queries(), before)
@@ -0,0 +1,121 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.core import mail
+from django.contrib.auth.models import User
+from django.http import QueryDict
+from core.models import UserProfile, JobListing, SavedSearch, JobAlert
+from core.alerts import save_search, matching_searches, send_job_alerts
+
+
+class SavedSearchAlertTest(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'candidatepass')
+        self.client = Client()
+
+    def create_job(self, **kwargs):
+        fields = {
+            'title': 'Python Developer',
+            'company': 'Test Company',
+            'description': 'Backend development with Django',
+            'employer': self.company,
+            'category': 'IT/პროგრამირება',
+            'location': 'თბილისი',
+            'experience': 'საშუალო დონე',
+            'job_preferences': 'სრული განაკვეთი',
+            'salary_min': 2000,
+        }
+        fields.update(kwargs)
+        return JobListing.objects.create(**fields)
+
+    def save(self, query):
+        return save_search(self.user, QueryDict(query))[0]
+
+    def test_filters_are_normalised(self):
+        """Test that equivalent filter sets are saved once"""
+        first = self.save('category=IT/პროგრამირება&search=  python   dev ')
+        second = self.save('search=python dev&category=IT/პროგრამირება&page=3')
+        self.assertEqual(first, second)
+        self.assertEqual(first.keywords, ['dev', 'python'])
+        with self.assertRaises(ValueError):
+            self.save('page=3')
+
+    def test_invalid_salary_rejected(self):
+        """Test that salaries filter_jobs wouldn't read or the column can't hold are rejected"""
+        for salary in ('abc', '1500.5', 'NaN', 'Infinity', '1e20', '-100', '10000000000'):
+            with self.assertRaises(ValueError):
+                self.save(f'salary_min={salary}')
+        self.assertEqual(self.save('salary_min=9999999999').salary_min_monthly, 9999999999)
+        self.assertIsNone(self.save('salary_min=0').salary_min_monthly)
+
+        self.client.login(username='candidate', password='candidatepass')
+        response = self.client.post(reverse('save_search'), {'salary_min': '1e20'})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(SavedSearch.objects.filter(filters__salary_min='1e20').exists())
+
+    def test_job_matches_searches(self):
+        """Test that a job matches the searches whose every filter it satisfies"""
+        matching = [
+            self.save('category=IT/პროგრამირება'),
+            self.save('location=თბილისი&search=pyth'),
+            self.save('salary_min=1500&job_preferences=ცვლები,სრული განაკვეთი'),
+            self.save('search=django developers'),
+        ]
+        self.save('category=დიზაინი')
+        self.save('search=java')
+        self.save('salary_min=2500')
+        self.save('location=თბილისი&experience=პროფესიონალი')
+        job = self.create_job()
+        self.assertEqual(set(matching_searches(job)), set(matching))
+
+    def test_alerts_queued_when_job_goes_live(self):
+        """Test that alerts are queued once, when a job is approved"""
+        saved_search = self.save('search=python')
+        job = self.create_job()
+        self.assertFalse(JobAlert.objects.exists())
+
+        job.status = 'approved'
+        job.save()
+        self.assertEqual(list(JobAlert.objects.values_list('saved_search', 'job')), [(saved_search.id, job.id)])
+        job.title = 'Senior Python Developer'
+        job.save()
+        self.assertEqual(JobAlert.objects.count(), 1)
+
+    def test_send_job_alerts(self):
+        """Test that each user gets one digest and alerts are sent once"""
+        self.save('search=python')
+        self.save('category=IT/პროგრამირება')
+        first = self.create_job(status='approved')
+        second = self.create_job(title='Python Engineer', status='approved')
+        self.create_job(title='Expired Python Job', status='approved').delete()
+
+        self.assertEqual(send_job_alerts(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['candidate@example.com'])
+        self.assertIn(reverse('job_detail', args=[first.id]), mail.outbox[0].body)
+        self.assertIn(reverse('job_detail', args=[second.id]), mail.outbox[0].body)
+        self.assertNotIn('Expired Python Job', mail.outbox[0].body)
+
+        self.assertEqual(send_job_alerts(), 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_save_and_delete_views(self):
+        """Test saving the current filters from the job list and deleting them from the profile"""
+        self.client.login(username='candidate', password='candidatepass')
+        response = self.client.post(reverse('save_search'), {'category': 'დიზაინი', 'show_filters': '1'})
+        self.assertEqual(response.status_code, 302)
+        saved_search = SavedSearch.objects.get(user=self.user)
+        self.assertEqual(saved_search.filters, {'category': 'დიზაინი'})
+
+        other = User.objects.create_user('other', 'other@example.com', 'otherpass')
+        self.client.login(username='other', password='otherpass')
+        self.client.post(reverse('delete_saved_search', args=[saved_search.id]))
+        self.assertTrue(SavedSearch.objects.filter(id=saved_search.id).exists())
+
+        self.client.login(username='candidate', password='candidatepass')
+        self.client.post(reverse('delete_saved_search', args=[saved_search.id]))
+        self.assertFalse(SavedSearch.objects.filter(id=saved_search.id).exists())
@@ -0,0 +1,102 @@
+import gzip
+import json
+from unittest.mock import patch
+
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from core.models import UserProfile, JobListing
+
+
+class JobApiTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        self.jobs = [
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status='approved',
+                category='IT',
+                salary_min=1000 + i,
+                premium_level='premium' if i % 2 else 'standard'
+            )
+            for i in range(5)
+        ]
+        self.pending_job = JobListing.objects.create(
+            title='Pending Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.company,
+            category='IT'
+        )
+        self.client = Client()
+
+    def get_json(self, url, data=None, **extra):
+        response = self.client.get(url, data, **extra)
+        return response, json.loads(response.content)
+
+    def test_list_pages_through_live_jobs(self):
+        """Test that cursors walk every live job once, premium jobs first"""
+        seen = []
+        data = {'limit': 2}
+        while True:
+            response, payload = self.get_json(reverse('job_list_api'), data)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(job['id'] for job in payload['results'])
+            if not payload['next_cursor']:
+                break
+            data['cursor'] = payload['next_cursor']
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(set(seen), {job.id for job in self.jobs})
+        self.assertNotIn(self.pending_job.id, seen)
+        self.assertEqual(seen[:2], [self.jobs[3].id, self.jobs[1].id])
+
+    def test_fields_select_columns(self):
+        """Test that fields= limits both the output and the loaded columns"""
+        with self.assertNumQueries(2):
+            response, payload = self.get_json(reverse('job_list_api'), {'fields': 'id,title,url'})
+        job = payload['results'][0]
+        self.assertEqual(set(job), {'id', 'title', 'url'})
+        self.assertEqual(job['url'], reverse('job_detail', args=[job['id']]))
+        self.assertNotIn('description', payload['results'][1])
+
+        response, payload = self.get_json(reverse('job_list_api'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_filters_match_job_list(self):
+        """Test that the job list filters apply to the API"""
+        response, payload = self.get_json(reverse('job_list_api'), {'salary_min': 1003, 'sort': 'salary'})
+        self.assertEqual([job['id'] for job in payload['results']], [self.jobs[4].id, self.jobs[3].id])
+
+        response, payload = self.get_json(reverse('job_list_api'), {'salary_min': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        response, payload = self.get_json(reverse('job_list_api'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail(self):
+        """Test that the detail endpoint serves live jobs only"""
+        response, payload = self.get_json(reverse('job_detail_api', args=[self.jobs[0].id]))
+        self.assertEqual(payload['title'], 'Test Job 0')
+        self.assertEqual(payload['description'], 'Test job description')
+        response, payload = self.get_json(reverse('job_detail_api', args=[self.pending_job.id]))
+        self.assertEqual(response.status_code, 404)
+
+    @patch('core.conditional.versions_are_shared', return_value=True)
+    def test_gzip_and_conditional_get(self, shared):
+        """Test that responses are gzipped and revalidate with their ETag"""
+        url = reverse('job_list_api')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), 5)
+
+        repeat = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(repeat.status_code, 304)
@@ -0,0 +1,374 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.utils import timezone
+from datetime import timedelta
+from unittest.mock import patch
+from django.utils import translation
+from core.models import UserProfile, JobListing, SavedJob, JobApplication
+from core.expiry import expire_jobs
+from core.conditional import versions_are_shared
+from core.caching import (
+    get_job_facets, FACETS_CACHE_KEY, get_catalog_version, get_cached_job_ids, job_ids_cache_key,
+    render_job_cards, get_user_job_state
+)
+
+
+class JobFacetCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        self.job = JobListing.objects.create(
+            title='Test Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.company,
+            status='approved',
+            category='მარკეტინგი',
+            location='თბილისი'
+        )
+        JobListing.objects.create(
+            title='Second Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.company,
+            status='approved',
+            category='მარკეტინგი',
+            location='აჭარა'
+        )
+        JobListing.objects.create(
+            title='Pending Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.company,
+            status='pending_review',
+            category='დიზაინი',
+            location='თბილისი'
+        )
+
+    def test_facet_counts(self):
+        """Test that facets list the values of live jobs with job counts"""
+        facets = get_job_facets()
+        self.assertEqual(facets['categories'], [('მარკეტინგი', 2)])
+        self.assertEqual(sorted(facets['locations']), [('აჭარა', 1), ('თბილისი', 1)])
+
+    def test_warm_cache_costs_no_queries(self):
+        """Test that facets are served from the cache once computed"""
+        get_job_facets()
+        with self.assertNumQueries(0):
+            get_job_facets()
+
+    def test_category_change_invalidates(self):
+        """Test that changing a job's category drops the cached facets"""
+        get_job_facets()
+        job = JobListing.objects.get(pk=self.job.pk)
+        job.category = 'დიზაინი'
+        job.save()
+        self.assertIsNone(cache.get(FACETS_CACHE_KEY))
+        self.assertEqual(get_job_facets()['categories'], [('დიზაინი', 1), ('მარკეტინგი', 1)])
+
+    def test_soft_delete_invalidates(self):
+        """Test that soft-deleting a job drops the cached facets"""
+        get_job_facets()
+        JobListing.objects.get(pk=self.job.pk).delete()
+        self.assertEqual(get_job_facets()['categories'], [('მარკეტინგი', 1)])
+
+    def test_expired_jobs_not_counted(self):
+        """Test that expired jobs leave the counts, like they leave the list beside them"""
+        get_job_facets()
+        job = JobListing.objects.get(pk=self.job.pk)
+        job.expires_at = timezone.now() - timedelta(minutes=1)
+        job.save()
+        self.assertIsNone(cache.get(FACETS_CACHE_KEY))
+        self.assertEqual(get_job_facets()['locations'], [('აჭარა', 1)])
+
+        JobListing.objects.filter(location='აჭარა').update(expires_at=timezone.now() - timedelta(minutes=1))
+        cache.clear()
+        self.assertEqual(get_job_facets(), {'categories': [], 'locations': []})
+
+    def test_unrelated_change_keeps_cache(self):
+        """Test that editing the title keeps the cached facets"""
+        get_job_facets()
+        job = JobListing.objects.get(pk=self.job.pk)
+        job.title = 'Renamed Job'
+        job.save()
+        self.assertIsNotNone(cache.get(FACETS_CACHE_KEY))
+
+
+class JobResultCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        for i in range(3):
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status='approved',
+                location='თბილისი'
+            )
+        self.params = {'show_filters': '1', 'location': 'თბილისი'}
+        self.ordering = ('-premium_rank', '-posted_at', 'id')
+        self.client = Client()
+
+    def test_ids_cached_per_filter_set(self):
+        """Test that a repeated filter set is answered from the cache"""
+        jobs = JobListing.objects.filter(location='თბილისი')
+        job_ids = get_cached_job_ids(self.params, jobs, self.ordering)
+        self.assertEqual(job_ids, list(jobs.order_by(*self.ordering).values_list('id', flat=True)))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_job_ids(self.params, jobs, self.ordering), job_ids)
+
+    def test_key_normalisation(self):
+        """Test that equivalent filter sets share a key and searches are not cached"""
+        self.assertEqual(
+            job_ids_cache_key({'job_preferences': 'ცვლები,სრული განაკვეთი', 'location': ' თბილისი '}),
+            job_ids_cache_key({'location': 'თბილისი', 'job_preferences': 'სრული განაკვეთი,ცვლები'})
+        )
+        self.assertIsNone(job_ids_cache_key({'search': 'python'}))
+
+    def test_relevant_change_bumps_version(self):
+        """Test that saving a listed job with a changed filter field bumps the version"""
+        version = get_catalog_version()
+        job = JobListing.objects.first()
+        job.title = 'Renamed'
+        job.save()
+        self.assertEqual(get_catalog_version(), version)
+
+        job.location = 'აჭარა'
+        job.save()
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_bulk_soft_delete_bumps_version(self):
+        """Test that a queryset soft delete bumps the version"""
+        version = get_catalog_version()
+        JobListing.objects.filter(location='თბილისი').delete()
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_sweeper_bumps_version_only_when_jobs_expire(self):
+        """Test that cached lists are orphaned by the sweeper only when it expires something"""
+        version = get_catalog_version()
+        self.assertEqual(expire_jobs(), 0)
+        self.assertEqual(get_catalog_version(), version)
+
+        JobListing.objects.filter(pk=JobListing.objects.first().pk).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(expire_jobs(), 1)
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_job_list_reflects_new_job(self):
+        """Test that the job list picks up a newly approved job after caching"""
+        response = self.client.get(reverse('job_list'), self.params)
+        self.assertEqual(response.context['jobs_count'], 3)
+
+        JobListing.objects.create(
+            title='New Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.company,
+            status='approved',
+            location='თბილისი'
+        )
+        response = self.client.get(reverse('job_list'), self.params)
+        self.assertEqual(response.context['jobs_count'], 4)
+        self.assertEqual(response.context['jobs'][0].title, 'New Job')
+
+
+class JobCardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        for i in range(3):
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status='approved',
+                premium_level='premium'
+            )
+        self.client = Client()
+
+    def jobs(self):
+        return list(JobListing.objects.select_related('employer').order_by('id'))
+
+    def test_warm_cards_are_not_rendered(self):
+        """Test that cached cards are fetched instead of rendered"""
+        cards = render_job_cards(self.jobs())
+        self.assertIn('Test Job 0', cards[self.jobs()[0].pk])
+        with patch('core.caching.render_to_string') as mock_render:
+            self.assertEqual(render_job_cards(self.jobs()), cards)
+        mock_render.assert_not_called()
+
+    def test_save_refreshes_card(self):
+        """Test that saving a job makes its card render again"""
+        render_job_cards(self.jobs())
+        job = self.jobs()[0]
+        job.title = 'Renamed Job'
+        job.save()
+        self.assertIn('Renamed Job', render_job_cards([JobListing.objects.select_related('employer').get(pk=job.pk)])[job.pk])
+
+    def test_cards_are_cached_per_language(self):
+        """Test that each language gets its own fragment"""
+        job = self.jobs()[0]
+        with translation.override('ka'):
+            render_job_cards([job])
+        with translation.override('en'), patch('core.caching.render_to_string', return_value='card') as mock_render:
+            render_job_cards([job])
+        mock_render.assert_called_once()
+
+    def test_pages_use_cached_cards(self):
+        """Test that the job list and company profile render their cards from the cache"""
+        response = self.client.get(reverse('job_list'))
+        self.assertEqual(len(response.context['job_cards']), 3)
+        self.assertContains(response, 'Test Job 2')
+
+        response = self.client.get(reverse('company_profile', args=[self.company.id]))
+        self.assertContains(response, 'Test Job 1')
+
+
+class UserJobStateTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+        self.user = User.objects.create_user('candidate', 'candidate@example.com', 'candidatepass')
+
+        self.jobs = [
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status='approved',
+                premium_level='premium'
+            )
+            for i in range(3)
+        ]
+        SavedJob.objects.create(user=self.user, job=self.jobs[0])
+        JobApplication.objects.create(job=self.jobs[1], user=self.user, cover_letter='Hello', resume='resumes/cv.pdf')
+        self.client = Client()
+
+    def test_state_loaded_in_one_query(self):
+        """Test that saved and applied ids come from one query, then from the cache"""
+        with self.assertNumQueries(1):
+            state = get_user_job_state(self.user)
+        self.assertEqual(state, {'saved': {self.jobs[0].id}, 'applied': {self.jobs[1].id}})
+        with self.assertNumQueries(0):
+            get_user_job_state(self.user)
+
+    def test_save_and_unsave_invalidate(self):
+        """Test that saving and unsaving through the views refresh the state"""
+        self.client.login(username='candidate', password='candidatepass')
+        get_user_job_state(self.user)
+        self.client.post(reverse('save_job', args=[self.jobs[2].id]))
+        self.assertIn(self.jobs[2].id, get_user_job_state(self.user)['saved'])
+        self.client.post(reverse('unsave_job', args=[self.jobs[0].id]))
+        self.assertNotIn(self.jobs[0].id, get_user_job_state(self.user)['saved'])
+
+    def test_job_list_shows_badges(self):
+        """Test that the job list marks saved and applied jobs for the signed-in user"""
+        self.client.login(username='candidate', password='candidatepass')
+        response = self.client.get(reverse('job_list'))
+        self.assertContains(response, 'შენახული', count=1)
+        self.assertContains(response, 'გაგზავნილი', count=1)
+
+        response = self.client.get(reverse('job_detail', args=[self.jobs[0].id]))
+        self.assertTrue(response.context['is_saved'])
+
+
+# The test cache is per-process; pretend it is shared like the production Redis cache
+@patch('core.conditional.versions_are_shared', return_value=True)
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+        self.job = JobListing.objects.create(
+            title='Test Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.company,
+            status='approved'
+        )
+        self.client = Client()
+        self.urls = [
+            reverse('job_list'),
+            reverse('job_detail', args=[self.job.id]),
+            reverse('company_profile', args=[self.company.id]),
+        ]
+
+    def test_unchanged_pages_answer_not_modified(self, shared):
+        """Test that repeating a request with its ETag or date gets a 304 without queries"""
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            with self.assertNumQueries(0):
+                repeat = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(repeat.status_code, 304)
+            repeat = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+            self.assertEqual(repeat.status_code, 304)
+
+    def test_changes_refresh_validators(self, shared):
+        """Test that editing a job or employer profile changes the ETag"""
+        etags = {url: self.client.get(url)['ETag'] for url in self.urls}
+        self.job.title = 'Renamed Job'
+        self.job.save()
+        for url in self.urls:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code, 200)
+
+        etags = {url: self.client.get(url)['ETag'] for url in self.urls}
+        self.company.company_name = 'Renamed Company'
+        self.company.save()
+        for url in self.urls:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code, 200)
+
+    def test_expiry_refreshes_validators(self, shared):
+        """Test that the expiry sweep changes the ETag of the job list"""
+        url = reverse('job_list')
+        etag = self.client.get(url)['ETag']
+        JobListing.objects.filter(id=self.job.id).update(expires_at=timezone.now() - timedelta(days=1))
+        expire_jobs()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_signed_in_users_get_no_validators(self, shared):
+        """Test that pages showing per-user state are never answered with a 304"""
+        self.client.login(username='employer', password='employerpass')
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertFalse(response.has_header('ETag'))
+            self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_per_process_cache_gets_no_validators(self, shared):
+        """Test that without a shared cache no page can be answered from a stale version"""
+        shared.return_value = False
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertFalse(response.has_header('ETag'))
+            self.assertFalse(response.has_header('Last-Modified'))
+        # The real check, imported before the patch: the test cache is per-process
+        self.assertFalse(versions_are_shared())
@@ -0,0 +1,83 @@
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth.models import User
+from core.models import UserProfile, JobListing, JobViewCount
+from core.counters import record_job_view, flush_job_views, pending_job_views
+from unittest.mock import patch
+
+
+@override_settings(JOB_VIEW_FLUSH_INTERVAL=3600)
+class JobViewCounterTest(TestCase):
+    def setUp(self):
+        # Drop views buffered by other tests
+        flush_job_views()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.jobs = [
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.employer_profile.employer_profile,
+                status='approved'
+            )
+            for i in range(2)
+        ]
+        self.client = Client()
+
+    def views(self, job):
+        return JobViewCount.objects.filter(job=job).values_list('views', flat=True).first()
+
+    def test_views_are_buffered_then_flushed_in_one_statement(self):
+        """Test that views stay in memory until a flush adds them with one upsert"""
+        for _ in range(3):
+            record_job_view(self.jobs[0].id)
+        record_job_view(self.jobs[1].id)
+        self.assertIsNone(self.views(self.jobs[0]))
+        self.assertEqual(pending_job_views(), {self.jobs[0].id: 3, self.jobs[1].id: 1})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(flush_job_views(), 4)
+        self.assertEqual(len([query for query in queries if 'INSERT' in query['sql']]), 1)
+        self.assertEqual(pending_job_views(), {})
+        self.assertEqual(self.views(self.jobs[0]), 3)
+
+        record_job_view(self.jobs[0].id)
+        flush_job_views()
+        self.assertEqual(self.views(self.jobs[0]), 4)
+        self.assertEqual(self.views(self.jobs[1]), 1)
+
+    def test_views_of_deleted_jobs_are_dropped(self):
+        """Test that a job removed before the flush doesn't break the batch"""
+        record_job_view(self.jobs[0].id)
+        record_job_view(self.jobs[1].id)
+        self.jobs[1].hard_delete()
+        flush_job_views()
+        self.assertEqual(self.views(self.jobs[0]), 1)
+        self.assertFalse(JobViewCount.objects.filter(job_id=self.jobs[1].id).exists())
+
+    def test_job_detail_counts_views(self):
+        """Test that the job detail page records a view and the dashboards show the count"""
+        self.client.get(reverse('job_detail', args=[self.jobs[0].id]))
+        self.client.get(reverse('job_detail', args=[self.jobs[0].id]))
+        self.assertEqual(pending_job_views(), {self.jobs[0].id: 2})
+        flush_job_views()
+        JobViewCount.objects.all().delete()
+
+        # A browser revalidating its copy gets a 304 and still counts as a view
+        with patch('core.conditional.versions_are_shared', return_value=True):
+            url = reverse('job_detail', args=[self.jobs[0].id])
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(pending_job_views(), {self.jobs[0].id: 2})
+        flush_job_views()
+
+        self.client.login(username='employer', password='employerpass')
+        for name in ('employer_home', 'employer_dashboard'):
+            response = self.client.get(reverse(name))
+            view_counts = {job.id: job.view_count for job in response.context['all_jobs']}
+            self.assertEqual(view_counts, {self.jobs[0].id: 2, self.jobs[1].id: 0})
@@ -0,0 +1,116 @@
+from django.test import TestCase, Client, override_settings
+from django.apps import apps
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from django.utils import timezone
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.http import QueryDict
+from core.models import UserProfile, JobListing, JobAlert
+from core.expiry import expire_jobs
+from core.alerts import save_search
+from core.caching import FACETS_CACHE_KEY, get_job_facets, get_content_version
+
+
+class JobExpiryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        for i in range(5):
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status='approved',
+                premium_level='premium'
+            )
+        self.client = Client()
+
+    def test_is_live_follows_status_and_expiry(self):
+        """Test that save() keeps is_live in sync with status and expires_at"""
+        job = JobListing.objects.create(
+            title='Pending Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.company
+        )
+        self.assertFalse(job.is_live)
+
+        job.status = 'approved'
+        job.save(update_fields=['status'])
+        job.refresh_from_db()
+        self.assertTrue(job.is_live)
+
+        job.expires_at = timezone.now() - timedelta(days=1)
+        job.save()
+        job.refresh_from_db()
+        self.assertFalse(job.is_live)
+
+    def test_sweeper_expires_in_batches(self):
+        """Test that the sweeper expires every overdue job, one batch at a time"""
+        JobListing.objects.update(expires_at=timezone.now() - timedelta(minutes=1))
+        with self.assertNumQueries(9):
+            self.assertEqual(expire_jobs(batch_size=2), 5)
+        self.assertFalse(JobListing.objects.filter(is_live=True).exists())
+        self.assertEqual(expire_jobs(), 0)
+
+    def test_sweeper_invalidates_like_save(self):
+        """Test that expiring jobs drops what saving them as expired would"""
+        user = User.objects.create_user('candidate', 'candidate@example.com', 'candidatepass')
+        saved_search = save_search(user, QueryDict('search=Test'))[0]
+        job = JobListing.objects.first()
+        JobListing.objects.filter(pk=job.pk).update(similar_computed_at=timezone.now())
+        JobAlert.objects.create(saved_search=saved_search, job=job)
+        get_job_facets()
+        content_version = get_content_version()
+
+        JobListing.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(expire_jobs(), 1)
+        self.assertIsNone(cache.get(FACETS_CACHE_KEY))
+        self.assertNotEqual(get_content_version(), content_version)
+        self.assertFalse(JobAlert.objects.filter(job=job).exists())
+        job.refresh_from_db()
+        self.assertIsNone(job.similar_computed_at)
+
+    def test_expired_jobs_leave_the_job_list(self):
+        """Test that the job list drops swept jobs"""
+        response = self.client.get(reverse('job_list'))
+        self.assertEqual(len(response.context['jobs']), 5)
+
+        JobListing.objects.filter(pk=JobListing.objects.first().pk).update(
+            expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        out = StringIO()
+        call_command('expire_jobs', stdout=out)
+        self.assertIn('Expired 1 job listings', out.getvalue())
+
+        response = self.client.get(reverse('job_list'))
+        self.assertEqual(len(response.context['jobs']), 4)
+
+    def test_expired_jobs_hidden_before_sweep(self):
+        """Test that public pages hide expired jobs the sweeper hasn't flipped yet"""
+        self.client.get(reverse('job_list'))
+        job = JobListing.objects.first()
+        JobListing.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        response = self.client.get(reverse('job_list'))
+        self.assertEqual(len(response.context['jobs']), 4)
+        self.assertNotIn(job, response.context['jobs'])
+        self.assertEqual(self.client.get(reverse('job_detail_api', args=[job.pk])).status_code, 404)
+        self.assertNotContains(self.client.get(reverse('jobs_feed_rss')), reverse('job_detail', args=[job.pk]))
+
+    @override_settings(JOB_EXPIRY_SWEEP_INTERVAL=60)
+    @patch('core.expiry.threading.Thread')
+    def test_app_loading_starts_no_sweeper(self, thread):
+        """Test that loading the app (migrate, shell, tests) starts no sweeper thread"""
+        apps.get_app_config('core').ready()
+        thread.assert_not_called()
@@ -0,0 +1,108 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.utils import timezone
+from datetime import timedelta
+from core.models import UserProfile, JobListing
+from core.expiry import expire_jobs
+from core.views.sitemap_views import SITEMAP_SHARD_SIZE
+
+
+class SitemapTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        self.jobs = [
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status='approved'
+            )
+            for i in range(3)
+        ]
+        self.pending_job = JobListing.objects.create(
+            title='Pending Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.company
+        )
+        self.shard = self.jobs[0].id // SITEMAP_SHARD_SIZE
+        self.client = Client()
+
+    def get_shard(self):
+        response = self.client.get(reverse('sitemap_jobs', args=[self.shard]))
+        self.assertEqual(response.status_code, 200)
+        if response.streaming:
+            return b''.join(response.streaming_content).decode()
+        return response.content.decode()
+
+    def test_index_lists_shards(self):
+        """Test that the sitemap index points at the shard holding the live jobs"""
+        response = self.client.get(reverse('sitemap_index'))
+        self.assertContains(response, reverse('sitemap_jobs', args=[self.shard]))
+
+    def test_shard_lists_live_jobs(self):
+        """Test that a shard lists the live jobs and nothing else"""
+        content = self.get_shard()
+        for job in self.jobs:
+            self.assertIn(f'http://testserver{reverse("job_detail", args=[job.id])}</loc>', content)
+        self.assertNotIn(reverse('job_detail', args=[self.pending_job.id]), content)
+
+        response = self.client.get(reverse('sitemap_jobs', args=[self.shard + 1]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_shard_is_cached_until_it_changes(self):
+        """Test that a shard is streamed once, then served from the cache until a job in it changes"""
+        response = self.client.get(reverse('sitemap_jobs', args=[self.shard]))
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content).decode()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('sitemap_jobs', args=[self.shard]))
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content.decode(), content)
+
+        JobListing.objects.filter(id=self.jobs[0].id).update(expires_at=timezone.now() - timedelta(days=1))
+        expire_jobs()
+        self.assertNotIn(reverse('job_detail', args=[self.jobs[0].id]), self.get_shard())
+
+        self.pending_job.status = 'approved'
+        self.pending_job.save()
+        self.assertIn(reverse('job_detail', args=[self.pending_job.id]), self.get_shard())
+
+
+class JobFeedTest(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.job = JobListing.objects.create(
+            title='Live Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.employer_profile.employer_profile,
+            status='approved'
+        )
+        JobListing.objects.create(
+            title='Pending Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.employer_profile.employer_profile
+        )
+        self.client = Client()
+
+    def test_feeds_list_live_jobs(self):
+        """Test that the RSS and Atom feeds carry live jobs only"""
+        for name in ('jobs_feed_rss', 'jobs_feed_atom'):
+            response = self.client.get(reverse(name))
+            self.assertContains(response, 'Live Job - Test Company')
+            self.assertContains(response, reverse('job_detail', args=[self.job.id]))
+            self.assertNotContains(response, 'Pending Job')
@@ -1,9 +1,12 @@
-from django.test import TestCase
+from django.test import TestCase, Client
+from django.urls import reverse
 from django.contrib.auth.models import User
 from core.models import UserProfile, EmployerProfile, JobListing, JobApplication
 from django.utils import timezone
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from datetime import timedelta
+from decimal import Decimal
 
 
 class UserProfileModelTest(TestCase):
@@ -178,4 +181,109 @@ class JobApplicationModelTest(TestCase):
         self.assertEqual(application.job, self.job)
         self.assertEqual(application.guest_name, 'Guest User')
         self.assertEqual(application.guest_email, 'guest@example.com')
-        self.assertIsNone(application.user) 
\ No newline at end of file
+        self.assertIsNone(application.user) 
+
+class JobListingPremiumRankTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.user_profile = UserProfile.objects.get(user=self.user)
+        self.user_profile.role = 'employer'
+        self.user_profile.save()
+        self.employer_profile = self.user_profile.employer_profile
+
+    def test_premium_rank_follows_premium_level(self):
+        """Test that premium_rank is kept in sync with premium_level"""
+        job = JobListing.objects.create(
+            title='Test Job',
+            company='Test Company',
+            description='This is a test job description',
+            employer=self.employer_profile,
+            premium_level='premium_plus'
+        )
+        self.assertEqual(job.premium_rank, 2)
+
+        job.premium_level = 'premium'
+        job.save(update_fields=['premium_level'])
+        job.refresh_from_db()
+        self.assertEqual(job.premium_rank, 1)
+
+    def test_public_feed_uses_index_order(self):
+        """Test that the public feed ordering is read from the feed index without sorting"""
+        jobs = JobListing.objects.filter(is_live=True, premium_rank__gte=1).order_by('-premium_rank', '-posted_at', 'id')[:10]
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_bitmapscan = off')
+        plan = jobs.explain()
+        self.assertIn('core_joblisting_feed_idx', plan)
+        self.assertNotIn('Sort', plan)
+
+
+class JobListingMonthlySalaryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.user_profile = UserProfile.objects.get(user=self.user)
+        self.user_profile.role = 'employer'
+        self.user_profile.save()
+        self.employer_profile = self.user_profile.employer_profile
+
+        self.hourly_job = JobListing.objects.create(
+            title='Hourly Job',
+            company='Test Company',
+            description='This is a test job description',
+            employer=self.employer_profile,
+            status='approved',
+            salary_min=20,
+            salary_max=25,
+            salary_type='საათში'
+        )
+        self.monthly_job = JobListing.objects.create(
+            title='Monthly Job',
+            company='Test Company',
+            description='This is a test job description',
+            employer=self.employer_profile,
+            status='approved',
+            salary_min=2500,
+            salary_type='თვეში'
+        )
+        JobListing.objects.create(
+            title='Unpaid Job',
+            company='Test Company',
+            description='This is a test job description',
+            employer=self.employer_profile,
+            status='approved'
+        )
+        self.client = Client()
+
+    def test_monthly_salary_computed_on_save(self):
+        """Test that salaries are converted to monthly amounts on save"""
+        self.assertEqual(self.hourly_job.salary_min_monthly, Decimal('3466.67'))
+        self.assertEqual(self.hourly_job.salary_max_monthly, Decimal('4333.33'))
+        self.assertEqual(self.monthly_job.salary_min_monthly, Decimal('2500.00'))
+        self.assertIsNone(self.monthly_job.salary_max_monthly)
+
+        self.monthly_job.salary_type = 'კვირაში'
+        self.monthly_job.save(update_fields=['salary_type'])
+        self.monthly_job.refresh_from_db()
+        self.assertEqual(self.monthly_job.salary_min_monthly, Decimal('10833.33'))
+
+    def test_salary_filter_uses_monthly_amount(self):
+        """Test that the salary filter compares monthly equivalents"""
+        response = self.client.get(reverse('job_list'), {'show_filters': '1', 'salary_min': '3000'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['Hourly Job'])
+
+    def test_sort_by_salary(self):
+        """Test that sorting by salary lists the best paid jobs first"""
+        response = self.client.get(reverse('job_list'), {'show_filters': '1', 'sort': 'salary'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['Hourly Job', 'Monthly Job'])
+
+    def test_salary_sort_uses_index_order(self):
+        """Test that a salary filter and sort is an index range scan without sorting"""
+        jobs = JobListing.objects.filter(
+            is_live=True, salary_min_monthly__isnull=False, salary_min_monthly__gte=3000
+        ).order_by('-salary_min_monthly', '-posted_at', 'id')[:10]
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_bitmapscan = off')
+        plan = jobs.explain()
+        self.assertIn('core_joblisting_salary_idx', plan)
+        self.assertNotIn('Sort', plan)
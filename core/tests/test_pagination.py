@@ -0,0 +1,175 @@
+import base64
+import json
+
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from core.models import UserProfile, JobListing
+from core.pagination import KeysetPaginator, InvalidCursor
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        # Create a test employer
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        # Mixed premium levels with identical timestamps to exercise the id tiebreaker
+        levels = ['standard', 'premium', 'premium_plus']
+        for i in range(20):
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status='approved',
+                premium_level=levels[i % 3]
+            )
+        JobListing.objects.filter(id__in=JobListing.objects.values('id')[:6]).update(
+            posted_at=JobListing.objects.first().posted_at
+        )
+
+        self.ordering = ('-premium_rank', '-posted_at', 'id')
+        self.expected = list(JobListing.objects.order_by(*self.ordering))
+        self.paginator = KeysetPaginator(JobListing.objects.all(), 6, self.ordering)
+
+    def test_forward_pages_match_offset_order(self):
+        """Test that walking forward visits every job once in order"""
+        seen = []
+        page = self.paginator.page()
+        self.assertFalse(page.has_previous())
+        while True:
+            seen.extend(page)
+            if not page.has_next():
+                break
+            page = self.paginator.page(page.next_cursor)
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_cursor_returns_previous_page(self):
+        """Test that the previous cursor restores the earlier page"""
+        first = self.paginator.page()
+        second = self.paginator.page(first.next_cursor)
+        third = self.paginator.page(second.next_cursor)
+
+        self.assertEqual(list(self.paginator.page(third.previous_cursor)), list(second))
+        back_to_first = self.paginator.page(second.previous_cursor)
+        self.assertEqual(list(back_to_first), list(first))
+        self.assertFalse(back_to_first.has_previous())
+        self.assertTrue(back_to_first.has_next())
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors are rejected"""
+        for cursor in ['not-a-cursor', 'e30', 'eyJkIjoibiIsInYiOlsxXX0']:
+            with self.assertRaises(InvalidCursor):
+                self.paginator.page(cursor)
+
+    def test_cursor_value_of_wrong_type(self):
+        """Test that a well-formed cursor holding values of the wrong type is rejected"""
+        for values in ([1, [1, 2, 3], 1], [1, {'a': 1}, 1], [1, '2025-01-01T00:00:00', [1]]):
+            cursor = base64.urlsafe_b64encode(json.dumps({'d': 'n', 'v': values}).encode()).decode().rstrip('=')
+            with self.assertRaises(InvalidCursor):
+                self.paginator.page(cursor)
+
+
+class JobListPaginationTest(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        for i in range(12):
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status='approved',
+                premium_level='premium'
+            )
+        self.client = Client()
+
+    def test_cursor_pagination(self):
+        """Test that the main page follows cursors"""
+        response = self.client.get(reverse('job_list'))
+        first_page = response.context['jobs']
+        self.assertEqual(len(first_page), 9)
+        self.assertTrue(first_page.has_next())
+
+        response = self.client.get(reverse('job_list'), {'cursor': first_page.next_cursor})
+        self.assertEqual(len(response.context['jobs']), 3)
+        self.assertFalse(response.context['jobs'].has_next())
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        """Test that a broken cursor shows the first page"""
+        response = self.client.get(reverse('job_list'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['jobs']), 9)
+
+    def test_page_number_links_still_work(self):
+        """Test that old page-number URLs are still served"""
+        response = self.client.get(reverse('job_list'), {'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['jobs'].number, 2)
+        self.assertEqual(len(response.context['jobs']), 3)
+
+
+class JobListLoadMoreTest(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        for i in range(30):
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status='approved',
+                location='თბილისი'
+            )
+        self.client = Client()
+
+    def test_filtered_list_is_bounded(self):
+        """Test that the filtered list renders only the first batch"""
+        response = self.client.get(reverse('job_list'), {'show_filters': '1', 'location': 'თბილისი'})
+        self.assertEqual(len(response.context['jobs']), 24)
+        self.assertEqual(response.context['jobs_count'], 30)
+        self.assertTrue(response.context['jobs'].has_next())
+
+    def test_load_more_returns_next_batch(self):
+        """Test that the load-more endpoint continues from the cursor"""
+        response = self.client.get(reverse('job_list'), {'show_filters': '1', 'location': 'თბილისი'})
+        cursor = response.context['jobs'].next_cursor
+
+        response = self.client.get(reverse('job_list_more'), {
+            'show_filters': '1', 'location': 'თბილისი', 'cursor': cursor
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertFalse(data['has_next'])
+        self.assertIsNone(data['next_cursor'])
+        self.assertEqual(data['html'].count('/jobs/'), 6)
+
+    def test_load_more_rejects_invalid_cursor(self):
+        """Test that a broken cursor is a client error"""
+        response = self.client.get(reverse('job_list_more'), {'show_filters': '1', 'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+        cursor = base64.urlsafe_b64encode(json.dumps({'d': 'n', 'v': [1, [1, 2, 3], 1]}).encode()).decode()
+        response = self.client.get(reverse('job_list_more'), {'show_filters': '1', 'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_salary_filter(self):
+        """Test that a malformed salary is a client error for load-more and ignored by the page"""
+        response = self.client.get(reverse('job_list_more'), {'show_filters': '1', 'salary_min': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('job_list'), {'show_filters': '1', 'salary_min': 'abc'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['jobs_count'], 30)
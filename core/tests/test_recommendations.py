@@ -0,0 +1,86 @@
+import numpy as np
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from django.utils.timesince import timesince
+from io import StringIO
+from core.models import UserProfile, JobListing, SimilarJob
+from core.recommendations import tfidf_matrix, top_neighbours, refresh_similar_jobs
+
+
+class TfidfTest(TestCase):
+    def test_rows_are_normalised(self):
+        """Test that every document vector has unit length"""
+        matrix = tfidf_matrix(['python developer', 'python python tester', 'ბუღალტერი'])
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        np.testing.assert_allclose(norms, 1)
+
+    def test_neighbours_ranked_by_cosine(self):
+        """Test that neighbours are the most similar other documents, best first"""
+        matrix = tfidf_matrix([
+            'python django developer',
+            'python django engineer',
+            'python tester',
+            'ბუღალტერი',
+        ])
+        neighbours = dict(top_neighbours(matrix, [0, 3], count=2, block_size=1))
+        self.assertEqual([row for row, score in neighbours[0]], [1, 2])
+        self.assertEqual(neighbours[3], [])
+
+
+class SimilarJobsTest(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        self.jobs = [
+            JobListing.objects.create(
+                title=title,
+                company='Test Company',
+                description=description,
+                employer=self.company,
+                status='approved',
+                category='IT/პროგრამირება'
+            )
+            for title, description in [
+                ('Python Developer', 'Django and PostgreSQL'),
+                ('Senior Python Developer', 'Django, PostgreSQL and Redis'),
+                ('Accountant', 'Bookkeeping and taxes'),
+            ]
+        ]
+        self.client = Client()
+
+    def test_refresh_stores_neighbours(self):
+        """Test that refreshing computes neighbours for every stale job"""
+        self.assertEqual(refresh_similar_jobs(), 3)
+        self.assertEqual(
+            list(SimilarJob.objects.filter(job=self.jobs[0]).values_list('similar_id', flat=True)),
+            [self.jobs[1].id, self.jobs[2].id]
+        )
+        self.assertEqual(refresh_similar_jobs(), 0)
+
+    def test_job_detail_reads_precomputed_neighbours(self):
+        """Test that the detail page shows the stored neighbours"""
+        refresh_similar_jobs()
+        response = self.client.get(reverse('job_detail', args=[self.jobs[2].id]))
+        self.assertEqual(len(response.context['similar_jobs']), 2)
+        response = self.client.get(reverse('job_detail', args=[self.jobs[0].id]))
+        self.assertEqual(response.context['similar_jobs'][0], self.jobs[1])
+        # The relative posting time is rendered around the cached card, so it stays current
+        self.assertContains(response, f"{timesince(self.jobs[1].posted_at)} წინ")
+
+    def test_edit_marks_job_stale(self):
+        """Test that editing a job's text queues it for the next refresh"""
+        refresh_similar_jobs()
+        job = JobListing.objects.get(pk=self.jobs[2].pk)
+        job.title = 'Python Accountant'
+        job.save()
+        self.assertEqual(refresh_similar_jobs(), 1)
+
+        out = StringIO()
+        call_command('build_similar_jobs', '--all', stdout=out)
+        self.assertIn('Refreshed similar jobs for 3 job listings', out.getvalue())
@@ -0,0 +1,92 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from unittest.mock import patch
+import time
+from core.search.engine import UNSHARED_RELOAD_INTERVAL
+from core.models import PricingPackage, PricingFeature, RejectionReason
+from core.registry import (
+    rejection_reason_registry, pricing_package_registry, rejection_reason_ids,
+    active_pricing_packages
+)
+
+
+class RegistryTest(TestCase):
+    def setUp(self):
+        # Tables loaded by earlier tests were rolled back
+        with self.captureOnCommitCallbacks(execute=True):
+            rejection_reason_registry.invalidate()
+            pricing_package_registry.invalidate()
+
+        self.standard = PricingPackage.objects.create(
+            package_type='standard', name='Standard', current_price=0, description='Free', display_order=1
+        )
+        self.premium = PricingPackage.objects.create(
+            package_type='premium', name='Premium', current_price=50, description='More', display_order=2
+        )
+        PricingFeature.objects.create(package=self.premium, text='Highlighted', display_order=1)
+        self.client = Client()
+
+    def test_pricing_packages_loaded_once(self):
+        """Test that the pricing page reads the packages and features from memory after the first view"""
+        self.client.get(reverse('pricing'))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('pricing'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('core_pricing' in query['sql'] for query in context.captured_queries))
+        self.assertContains(response, 'Highlighted')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(active_pricing_packages(), [self.standard, self.premium])
+
+    def test_saves_reload(self):
+        """Test that saving a package or feature makes the registry reload once committed"""
+        self.assertEqual([p.package_type for p in active_pricing_packages()], ['standard', 'premium'])
+        with self.captureOnCommitCallbacks(execute=True):
+            PricingFeature.objects.create(package=self.premium, text='Top of the list', display_order=2)
+        self.assertEqual(
+            [f.text for f in active_pricing_packages()[1].features.all()], ['Highlighted', 'Top of the list']
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.standard.is_active = False
+            self.standard.save()
+        self.assertEqual([p.package_type for p in active_pricing_packages()], ['premium'])
+
+    def test_unshared_registry_reloads_after_interval(self):
+        """Test that without a shared cache a process picks up other processes' edits once its copy is old"""
+        active_pricing_packages()
+        # An edit made in another process, which bumped only its own cache
+        PricingPackage.objects.filter(pk=self.standard.pk).update(is_active=False)
+        self.assertEqual(len(active_pricing_packages()), 2)
+        later = time.monotonic() + UNSHARED_RELOAD_INTERVAL
+        with patch('core.search.engine.versions_are_shared', return_value=True), \
+                patch('core.search.engine.time.monotonic', return_value=later):
+            self.assertEqual(len(active_pricing_packages()), 2)
+        with patch('core.search.engine.time.monotonic', return_value=later):
+            self.assertEqual(active_pricing_packages(), [self.premium])
+
+    def test_rejection_reason_ids(self):
+        """Test that reasons are created once, unknown names ignored and later lookups are free"""
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = rejection_reason_ids(['ლოკაცია', 'unknown', 'უნარების_ნაკლებობა', 'ლოკაცია'])
+        reasons = dict(RejectionReason.objects.values_list('name', 'id'))
+        self.assertEqual(ids, [reasons['ლოკაცია'], reasons['უნარების_ნაკლებობა']])
+        # The commit makes the registry reload once to pick up the new rows
+        self.assertIn('ლოკაცია', rejection_reason_registry.get())
+        with self.assertNumQueries(0):
+            self.assertEqual(rejection_reason_ids(['უნარების_ნაკლებობა']), [reasons['უნარების_ნაკლებობა']])
+
+    def test_rolled_back_reasons_not_cached(self):
+        """Test that reasons created in a rolled-back transaction never reach the registry"""
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.assertEqual(len(rejection_reason_ids(['ლოკაცია'])), 1)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertFalse(RejectionReason.objects.exists())
+        self.assertNotIn('ლოკაცია', rejection_reason_registry.get())
+        ids = rejection_reason_ids(['ლოკაცია'])
+        self.assertEqual(ids, [RejectionReason.objects.get(name='ლოკაცია').id])
@@ -0,0 +1,109 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.utils import timezone
+from datetime import timedelta
+from core.models import UserProfile, JobListing, JobApplication, JobApplicationDaily
+from core.rollups import update_applications, backfill_application_rollups, daily_applications
+
+
+class ApplicationRollupTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        self.job = JobListing.objects.create(
+            title='Test Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.company,
+            status='approved'
+        )
+        self.today = timezone.localdate()
+        self.client = Client()
+
+    def apply(self, **kwargs):
+        return JobApplication.objects.create(
+            job=self.job, guest_name='Guest', guest_email='guest@example.com',
+            cover_letter='Hello', resume='resumes/cv.pdf', **kwargs
+        )
+
+    def rollup(self):
+        return dict(JobApplicationDaily.objects.filter(job=self.job, day=self.today).values(
+            'applications', 'unread', 'in_review', 'interview', 'reserve'
+        ).get())
+
+    def test_changes_update_rollup(self):
+        """Test that creating, changing and deleting applications keep the day's counts"""
+        first = self.apply()
+        second = self.apply()
+        self.assertEqual(self.rollup(), {
+            'applications': 2, 'unread': 2, 'in_review': 2, 'interview': 0, 'reserve': 0
+        })
+
+        first.status = 'გასაუბრება'
+        first.is_read = True
+        first.save()
+        self.assertEqual(self.rollup(), {
+            'applications': 2, 'unread': 1, 'in_review': 1, 'interview': 1, 'reserve': 0
+        })
+
+        second.delete()
+        self.assertEqual(self.rollup(), {
+            'applications': 1, 'unread': 0, 'in_review': 0, 'interview': 1, 'reserve': 0
+        })
+
+    def test_bulk_update(self):
+        """Test that update_applications moves every updated row's counts"""
+        for _ in range(3):
+            self.apply()
+        updated = update_applications(JobApplication.objects.filter(job=self.job), is_read=True, status='რეზერვი')
+        self.assertEqual(updated, 3)
+        self.assertFalse(JobApplication.objects.filter(job=self.job, is_read=False).exists())
+        self.assertEqual(self.rollup(), {
+            'applications': 3, 'unread': 0, 'in_review': 0, 'interview': 0, 'reserve': 3
+        })
+
+    def test_backfill_matches_incremental(self):
+        """Test that rebuilding the table gives the incrementally kept rows"""
+        old = self.apply()
+        JobApplication.objects.filter(id=old.id).update(applied_at=timezone.now() - timedelta(days=3))
+        self.apply(is_read=True)
+        self.apply(status='გასაუბრება')
+        backfill_application_rollups()
+        expected = list(JobApplicationDaily.objects.values('job_id', 'day', 'applications', 'unread', 'interview'))
+        self.assertEqual(len(expected), 2)
+
+        JobApplicationDaily.objects.all().delete()
+        self.assertEqual(backfill_application_rollups(batch_size=1), 2)
+        self.assertEqual(
+            list(JobApplicationDaily.objects.values('job_id', 'day', 'applications', 'unread', 'interview')),
+            expected
+        )
+        self.assertEqual(daily_applications(self.job.id, self.today, self.today)[0]['applications'], 2)
+
+    def test_daily_endpoint(self):
+        """Test that the endpoint returns every day, zero-filled, to the job's employer only"""
+        self.apply()
+        self.client.login(username='employer', password='employerpass')
+        response = self.client.get(reverse('job_applications_daily', args=[self.job.id]), {'days': 7})
+        self.assertEqual(response.status_code, 200)
+        days = response.json()['days']
+        self.assertEqual(len(days), 7)
+        self.assertEqual(days[-1]['day'], self.today.isoformat())
+        self.assertEqual(days[-1]['applications'], 1)
+        self.assertEqual(days[-1]['statuses']['განხილვის_პროცესში'], 1)
+        self.assertEqual(sum(day['applications'] for day in days[:-1]), 0)
+
+        other = User.objects.create_user('other', 'other@example.com', 'otherpass')
+        other_profile = UserProfile.objects.get(user=other)
+        other_profile.role = 'employer'
+        other_profile.save()
+        self.client.login(username='other', password='otherpass')
+        response = self.client.get(reverse('job_applications_daily', args=[self.job.id]))
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,259 @@
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from unittest.mock import patch
+import time
+from core.models import UserProfile, JobListing
+from core.search import search_jobs, build_search_query
+from core.search import engine
+from core.search.engine import SearchIndex, rebuild_search_index, get_search_index
+from core.search.tokenizer import tokenize
+from core.search.autocomplete import PrefixIndex, get_autocomplete_index
+
+
+class JobSearchTest(TestCase):
+    def setUp(self):
+        # Create a test employer
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+        self.company.company_name = 'Test Company'
+        self.company.save()
+
+        self.developer_job = JobListing.objects.create(
+            title='პროგრამისტი',
+            company='Test Company',
+            description='Python დეველოპერი თბილისში',
+            employer=self.company,
+            status='approved'
+        )
+        self.accountant_job = JobListing.objects.create(
+            title='ბუღალტერი',
+            company='Test Company',
+            description='ვეძებთ ბუღალტერს, პროგრამისტი არ გვჭირდება',
+            employer=self.company,
+            status='approved'
+        )
+
+        self.client = Client()
+
+    def test_search_vector_populated_on_save(self):
+        """Test that saving a job builds its search vector"""
+        self.developer_job.refresh_from_db()
+        self.assertIsNotNone(self.developer_job.search_vector)
+
+    def test_search_vector_follows_title_change(self):
+        """Test that editing the title refreshes the search vector"""
+        self.developer_job.title = 'დიზაინერი'
+        self.developer_job.save()
+
+        results = search_jobs(JobListing.objects.all(), 'დიზაინ')
+        self.assertEqual(list(results), [self.developer_job])
+
+    def test_georgian_prefix_search(self):
+        """Test that partial Georgian words match"""
+        results = search_jobs(JobListing.objects.all(), 'ბუღალტ')
+        self.assertEqual(list(results), [self.accountant_job])
+
+    def test_title_match_ranks_above_description_match(self):
+        """Test that a title match is ranked higher than a description match"""
+        results = search_jobs(JobListing.objects.all(), 'პროგრამისტი').order_by('-search_rank')
+        self.assertEqual(list(results), [self.developer_job, self.accountant_job])
+
+    def test_query_without_terms(self):
+        """Test that punctuation-only input produces no query"""
+        self.assertIsNone(build_search_query('!!! &'))
+        self.assertFalse(search_jobs(JobListing.objects.all(), '!!! &').exists())
+
+    def test_job_list_search(self):
+        """Test the job list view uses full-text search"""
+        response = self.client.get(reverse('job_list'), {'search': 'პითონ python', 'show_filters': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job.title for job in response.context['jobs']], [])
+
+        response = self.client.get(reverse('job_list'), {'search': 'python', 'show_filters': '1'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['პროგრამისტი'])
+
+
+class GeorgianTokenizerTest(TestCase):
+    def test_case_endings_share_a_stem(self):
+        """Test that inflected Georgian forms reduce to the same stem"""
+        forms = ['დეველოპერი', 'დეველოპერის', 'დეველოპერები', 'დეველოპერებისთვის']
+        self.assertEqual({term for form in forms for term in tokenize(form)}, {'დეველოპერ'})
+        self.assertEqual(tokenize('თბილისში'), tokenize('თბილისი'))
+
+    def test_short_words_are_kept(self):
+        """Test that stripping never leaves a stem shorter than three letters"""
+        self.assertEqual(tokenize('ის და IT'), ['ის', 'და', 'it'])
+
+
+@override_settings(JOB_SEARCH_BACKEND='memory')
+class MemorySearchTest(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        self.developer_job = JobListing.objects.create(
+            title='პროგრამისტი',
+            company='Test Company',
+            description='Python დეველოპერი თბილისში',
+            employer=self.company,
+            status='approved'
+        )
+        self.accountant_job = JobListing.objects.create(
+            title='ბუღალტერი',
+            company='Test Company',
+            description='ვეძებთ ბუღალტერს, პროგრამისტი არ გვჭირდება',
+            employer=self.company,
+            status='approved'
+        )
+        rebuild_search_index()
+        self.client = Client()
+
+    def test_title_match_ranks_above_description_match(self):
+        """Test that BM25 ranks a title match above a description match"""
+        results = search_jobs(JobListing.objects.all(), 'პროგრამისტის').order_by('-search_rank')
+        self.assertEqual(list(results), [self.developer_job, self.accountant_job])
+
+    def test_every_term_must_match(self):
+        """Test that all query terms are required and match as prefixes"""
+        results = search_jobs(JobListing.objects.all(), 'პროგრამ თბილის')
+        self.assertEqual(list(results), [self.developer_job])
+
+    def test_index_follows_saves_and_deletes(self):
+        """Test that the index is updated incrementally from the model signals"""
+        self.developer_job.title = 'დიზაინერი'
+        self.developer_job.save()
+        self.assertEqual(list(search_jobs(JobListing.objects.all(), 'დიზაინ')), [self.developer_job])
+
+        self.developer_job.delete()
+        self.assertFalse(search_jobs(JobListing.objects.all(), 'დიზაინ').exists())
+
+    def test_other_process_changes_are_replayed(self):
+        """Test that a change logged by another process is applied without rebuilding the index"""
+        JobListing.objects.filter(pk=self.accountant_job.pk).update(title='დიზაინერი')
+        # What update_job does in the process that saved the job
+        cache.set(engine._change_key(engine.bump_shared_version(engine.SEARCH_INDEX_VERSION_KEY)), self.accountant_job.pk)
+        with self.assertNumQueries(1):
+            index = get_search_index()
+        self.assertEqual([job_id for job_id, score in index.search('დიზაინ')], [self.accountant_job.pk])
+
+        # A change missing from the log makes the process rebuild
+        JobListing.objects.filter(pk=self.accountant_job.pk).update(title='ბუღალტერი')
+        engine.invalidate_search_index()
+        self.assertEqual(get_search_index().search('დიზაინ'), [])
+
+    def test_unshared_index_reloads_after_interval(self):
+        """Test that without a shared cache the index is rebuilt once it is old, and only then"""
+        get_search_index()
+        JobListing.objects.filter(pk=self.accountant_job.pk).update(title='დიზაინერი')
+        self.assertEqual(get_search_index().search('დიზაინ'), [])
+        later = time.monotonic() + engine.UNSHARED_RELOAD_INTERVAL
+        with patch('core.search.engine.versions_are_shared', return_value=True), \
+                patch('core.search.engine.time.monotonic', return_value=later):
+            self.assertEqual(get_search_index().search('დიზაინ'), [])
+        with patch('core.search.engine.time.monotonic', return_value=later):
+            self.assertEqual(len(get_search_index().search('დიზაინ')), 1)
+
+    def test_cap_applies_after_filters(self):
+        """Test that capped matches are picked among the jobs the other filters admit"""
+        with patch('core.search.engine.MAX_RESULTS', 1):
+            self.assertEqual(list(search_jobs(JobListing.objects.all(), 'პროგრამისტ')), [self.developer_job])
+            self.assertEqual(
+                list(search_jobs(JobListing.objects.exclude(pk=self.developer_job.pk), 'პროგრამისტ')),
+                [self.accountant_job]
+            )
+
+    def test_job_list_search(self):
+        """Test that the job list view can page through memory search results"""
+        response = self.client.get(reverse('job_list'), {'search': 'python', 'show_filters': '1'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['პროგრამისტი'])
+
+
+class SearchIndexTest(TestCase):
+    def test_remove_drops_unused_terms(self):
+        """Test that removing the last document with a term removes the term"""
+        index = SearchIndex()
+        job = JobListing(pk=1, title='Python', company='Acme', description='')
+        index.add(job)
+        self.assertIn('python', index.vocabulary())
+        index.remove(1)
+        self.assertEqual(index.vocabulary(), [])
+        self.assertEqual(index.search('python'), [])
+
+
+class AutocompleteTest(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+        self.company.company_name = 'Python Software Georgia'
+        self.company.save()
+
+        for title in ['Senior Python Developer', 'Senior Python Developer', 'Python Intern']:
+            JobListing.objects.create(
+                title=title,
+                company='Python Software Georgia',
+                description='Test job description',
+                employer=self.company,
+                status='approved'
+            )
+        self.client = Client()
+
+    def test_prefix_index_matches_word_starts(self):
+        """Test that suggestions match at any word start, leading matches first"""
+        index = PrefixIndex([
+            ('Senior Python Developer', 'title', 2),
+            ('Python Intern', 'title', 1),
+            ('Data Analyst', 'title', 5),
+        ])
+        self.assertEqual(
+            [suggestion['label'] for suggestion in index.suggest('pyt')],
+            ['Python Intern', 'Senior Python Developer']
+        )
+        self.assertEqual(index.suggest('  '), [])
+
+    def test_autocomplete_endpoint(self):
+        """Test that the endpoint suggests titles and companies without querying the database when warm"""
+        url = reverse('job_autocomplete')
+        response = self.client.get(url, {'q': 'pyth'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['suggestions'], [
+            {'label': 'Python Software Georgia', 'type': 'company'},
+            {'label': 'Python Intern', 'type': 'title'},
+            {'label': 'Senior Python Developer', 'type': 'title'},
+        ])
+        with self.assertNumQueries(0):
+            self.client.get(url, {'q': 'sen'})
+
+    def test_suggestions_follow_new_jobs(self):
+        """Test that a newly approved job is suggested"""
+        url = reverse('job_autocomplete')
+        self.assertEqual(self.client.get(url, {'q': 'data'}).json()['suggestions'], [])
+        JobListing.objects.create(
+            title='Data Analyst',
+            company='Python Software Georgia',
+            description='Test job description',
+            employer=self.company,
+            status='approved'
+        )
+        self.assertEqual(
+            self.client.get(url, {'q': 'data'}).json()['suggestions'],
+            [{'label': 'Data Analyst', 'type': 'title'}]
+        )
+
+    def test_unshared_suggestions_reload_after_interval(self):
+        """Test that without a shared cache suggestions are rebuilt once they are old"""
+        get_autocomplete_index()
+        JobListing.objects.filter(title='Python Intern').update(title='Data Analyst')
+        self.assertEqual(get_autocomplete_index().suggest('data'), [])
+        with patch('core.search.engine.time.monotonic', return_value=time.monotonic() + engine.UNSHARED_RELOAD_INTERVAL):
+            self.assertEqual(get_autocomplete_index().suggest('data'), [{'label': 'Data Analyst', 'type': 'title'}])
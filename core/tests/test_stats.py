@@ -0,0 +1,166 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.utils import timezone
+from datetime import timedelta
+from django.db import connection
+from unittest.mock import patch
+from core.models import UserProfile, JobListing, JobApplication, SavedJob
+from core.stats import EmployerStats, HistoricalStats
+
+
+class EmployerStatsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+        self.company = self.employer_profile.employer_profile
+
+        self.jobs = [
+            JobListing.objects.create(
+                title=f'Test Job {i}',
+                company='Test Company',
+                description='Test job description',
+                employer=self.company,
+                status=status
+            )
+            for i, status in enumerate(['approved', 'approved', 'pending_review'])
+        ]
+        JobListing.objects.filter(id=self.jobs[0].id).update(expires_at=timezone.now() + timedelta(days=3))
+        for i in range(3):
+            JobApplication.objects.create(
+                job=self.jobs[0], guest_name=f'Guest {i}', guest_email=f'guest{i}@example.com',
+                cover_letter='Hello', resume='resumes/cv.pdf', is_read=i == 0
+            )
+        JobApplication.objects.create(
+            job=self.jobs[1], guest_name='Guest', guest_email='guest@example.com',
+            cover_letter='Hello', resume='resumes/cv.pdf'
+        )
+        self.client = Client()
+
+    def test_stats_in_one_query(self):
+        """Test that every metric comes from one aggregate, then from the cache"""
+        with self.assertNumQueries(1):
+            stats = EmployerStats.for_employer(self.company.id)
+        self.assertEqual(stats, EmployerStats(
+            total_jobs=3, active_jobs=2, expiring_soon=1, total_applicants=4, unread_applicants=3
+        ))
+        self.assertEqual(stats.avg_applicants, 1.33)
+        with self.assertNumQueries(0):
+            EmployerStats.for_employer(self.company.id)
+
+    def test_changes_invalidate(self):
+        """Test that new jobs, new applications and read marking refresh the stats"""
+        EmployerStats.for_employer(self.company.id)
+        JobApplication.objects.create(
+            job=self.jobs[1], guest_name='Guest', guest_email='guest@example.com',
+            cover_letter='Hello', resume='resumes/cv.pdf'
+        )
+        self.assertEqual(EmployerStats.for_employer(self.company.id).unread_applicants, 4)
+
+        self.jobs[2].status = 'approved'
+        self.jobs[2].save()
+        self.assertEqual(EmployerStats.for_employer(self.company.id).active_jobs, 3)
+
+        self.client.login(username='employer', password='employerpass')
+        self.client.get(reverse('job_applications', args=[self.jobs[0].id]))
+        self.assertEqual(EmployerStats.for_employer(self.company.id).unread_applicants, 2)
+
+    def test_dashboards_show_stats(self):
+        """Test that both dashboards get the same numbers"""
+        self.client.login(username='employer', password='employerpass')
+        for name in ('employer_home', 'employer_dashboard'):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.context['total_jobs'], 3)
+            self.assertEqual(response.context['active_jobs'], 2)
+            self.assertEqual(response.context['total_applicants'], 4)
+            self.assertEqual(response.context['unread_applicants'], 3)
+            counts = {job.id: job.applications_count for job in response.context['all_jobs']}
+            self.assertEqual(counts, {self.jobs[0].id: 3, self.jobs[1].id: 1, self.jobs[2].id: 0})
+
+
+class HistoricalStatsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_superuser('moderator', 'moderator@example.com', 'moderatorpass')
+        employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        profile = UserProfile.objects.get(user=employer_user)
+        profile.role = 'employer'
+        profile.save()
+        self.jobs = [
+            JobListing.objects.create(
+                title=f'Test Job {i}', company='Test Company', description='Test job description',
+                employer=profile.employer_profile, status='approved'
+            )
+            for i in range(3)
+        ]
+        JobApplication.objects.create(
+            job=self.jobs[0], guest_name='Guest', guest_email='guest@example.com',
+            cover_letter='Hello', resume='resumes/cv.pdf'
+        )
+        JobApplication.objects.create(
+            job=None, guest_name='Guest', guest_email='guest@example.com',
+            cover_letter='Hello', resume='resumes/cv.pdf'
+        )
+        SavedJob.objects.create(user=self.admin_user, job=self.jobs[1])
+        self.jobs[2].delete()
+
+    def test_exact_counts(self):
+        """Test that every table is counted in one aggregate, then served from the cache"""
+        # One statistics lookup plus one aggregate per table
+        with self.assertNumQueries(5):
+            stats = HistoricalStats.for_admin()
+        self.assertEqual(stats, HistoricalStats(
+            total_jobs=3, active_jobs=2, deleted_jobs=1,
+            total_employers=1, active_employers=1, deleted_employers=0,
+            total_applications=2, applications_with_deleted_jobs=1,
+            total_saved=1, saved_with_deleted_jobs=0,
+        ))
+        with self.assertNumQueries(0):
+            HistoricalStats.for_admin()
+
+    def test_approximate_counts(self):
+        """Test that large tables are estimated from the statistics without counting rows"""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE core_joblisting, core_employerprofile, core_jobapplication, core_savedjob')
+        with patch('core.stats.HISTORICAL_EXACT_MAX_ROWS', 0):
+            stats = HistoricalStats.for_admin()
+        self.assertTrue(stats.approximate)
+        self.assertEqual(stats.estimated, ('jobs', 'employers', 'applications', 'saved'))
+        self.assertEqual(stats.total_jobs, 3)
+        self.assertEqual(stats.total_applications, 2)
+        self.assertLessEqual(stats.deleted_jobs, stats.total_jobs)
+        self.assertEqual(stats.active_jobs, stats.total_jobs - stats.deleted_jobs)
+
+        self.assertFalse(HistoricalStats.for_admin(approximate=False).approximate)
+
+    def test_admin_page(self):
+        """Test that the admin page shows the counts and the mode"""
+        self.client.login(username='moderator', password='moderatorpass')
+        response = self.client.get(reverse('admin_historical_data'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['deleted_jobs'], 1)
+        self.assertEqual(len(response.context['all_jobs']), 3)
+        self.assertNotContains(response, '&asymp;')
+        response = self.client.get(reverse('admin_historical_data'), {'approximate': '1'})
+        self.assertTrue(response.context['approximate'])
+        self.assertContains(response, 'Show exact counts')
+
+    def test_only_estimates_marked(self):
+        """Test that only the counts of estimated tables, deleted ones included, are marked"""
+        cache.clear()
+        with patch('core.stats.table_row_estimates', return_value={JobListing: 2_000_000}):
+            stats = HistoricalStats.for_admin()
+        self.assertEqual(stats.estimated, ('jobs',))
+        self.assertEqual(stats.total_jobs, 2_000_000)
+        self.assertEqual(stats.total_applications, 2)
+
+        self.client.login(username='moderator', password='moderatorpass')
+        response = self.client.get(reverse('admin_historical_data'))
+        self.assertContains(response, '&asymp; 2000000</div>')
+        self.assertContains(response, f'&asymp; {stats.deleted_jobs} deleted')
+        self.assertContains(response, '>2</div>')
+        self.assertContains(response, '>1 for deleted jobs')
@@ -2,7 +2,10 @@ from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
-from core.models import UserProfile, EmployerProfile, JobListing, JobApplication
+from core.models import UserProfile, EmployerProfile, JobListing, JobApplication, RejectionReason
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from core.registry import rejection_reason_registry, rejection_reason_ids
 from unittest.mock import patch
 
 
@@ -234,4 +237,134 @@ class AuthViewsTest(TestCase):
         
         # User should be logged out
         user = response.wsgi_request.user
-        self.assertFalse(user.is_authenticated) 
\ No newline at end of file
+        self.assertFalse(user.is_authenticated) 
+
+class JobApplicationsViewTest(TestCase):
+    def setUp(self):
+        self.employer_user = User.objects.create_user('employer', 'employer@example.com', 'employerpass')
+        self.employer_profile = UserProfile.objects.get(user=self.employer_user)
+        self.employer_profile.role = 'employer'
+        self.employer_profile.save()
+
+        self.job = JobListing.objects.create(
+            title='Test Job',
+            company='Test Company',
+            description='Test job description',
+            employer=self.employer_profile.employer_profile,
+            status='approved'
+        )
+        statuses = ['გასაუბრება', 'რეზერვი', 'განხილვის_პროცესში', 'განხილვის_პროცესში', 'განხილვის_პროცესში']
+        self.applications = [
+            JobApplication.objects.create(
+                job=self.job, guest_name=f'Guest {i}', guest_email=f'guest{i}@example.com',
+                cover_letter='Hello', resume='resumes/cv.pdf', status=status
+            )
+            for i, status in enumerate(statuses)
+        ]
+        self.client = Client()
+        self.client.login(username='employer', password='employerpass')
+
+    @patch('core.views.employer_views.APPLICATIONS_PER_PAGE', 2)
+    def test_pages_and_read_marking(self):
+        """Test that pages follow the status order and only shown applications are marked read"""
+        url = reverse('job_applications', args=[self.job.id])
+        response = self.client.get(url)
+        page = response.context['applications']
+        self.assertEqual([a.id for a in page], [self.applications[0].id, self.applications[1].id])
+        self.assertEqual(
+            set(JobApplication.objects.filter(is_read=True).values_list('id', flat=True)),
+            {self.applications[0].id, self.applications[1].id}
+        )
+        self.assertEqual(response.context['total_applications'], 5)
+        self.assertEqual(response.context['review_applications'], 3)
+        self.assertEqual(response.context['interview_applications'], 1)
+        self.assertEqual(response.context['reserve_applications'], 1)
+
+        seen = [a.id for a in page]
+        while page.has_next():
+            page = self.client.get(url, {'cursor': page.next_cursor}).context['applications']
+            seen += [a.id for a in page]
+        self.assertEqual(
+            seen, [a.id for a in self.applications[:2]] + [a.id for a in reversed(self.applications[2:])]
+        )
+        self.assertFalse(JobApplication.objects.filter(is_read=False).exists())
+
+    def test_status_filter_keeps_totals(self):
+        """Test that filtering by status keeps every tab's count"""
+        response = self.client.get(
+            reverse('job_applications', args=[self.job.id]), {'status': 'განხილვის_პროცესში'}
+        )
+        self.assertEqual(len(response.context['applications']), 3)
+        self.assertEqual(response.context['total_applications'], 5)
+        self.assertEqual(response.context['interview_applications'], 1)
+
+    def test_query_count_independent_of_applications(self):
+        """Test that the page costs the same number of queries however many applications there are"""
+        url = reverse('job_applications', args=[self.job.id])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        for i in range(5):
+            application = JobApplication.objects.create(
+                job=self.job, guest_name=f'Extra {i}', guest_email=f'extra{i}@example.com',
+                cover_letter='Hello', resume='resumes/cv.pdf', status='რეზერვი'
+            )
+            application.rejection_reasons.add(RejectionReason.objects.get_or_create(name='ლოკაცია')[0])
+        JobApplication.objects.update(is_read=True)
+        with self.assertNumQueries(len(context.captured_queries)):
+            self.client.get(url)
+
+    def test_bulk_status_update(self):
+        """Test that many applications move to reserve with their reasons in a fixed number of queries"""
+        self.applications[0].rejection_reasons.add(RejectionReason.objects.create(name='ლოკაცია'))
+        ids = [a.id for a in self.applications[:4]]
+        url = reverse('bulk_update_application_status', args=[self.job.id])
+        data = {
+            'status': 'რეზერვი',
+            'application_ids': ids,
+            'rejection_reasons': ['არასაკმარისი_გამოცდილება', 'უნარების_ნაკლებობა', 'unknown'],
+            'feedback': 'Thank you',
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            rejection_reason_registry.invalidate()
+            rejection_reason_ids(data['rejection_reasons'])
+        rejection_reason_registry.get()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(url, data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.json(), {'success': True, 'updated': 4})
+        self.assertEqual(sum('UPDATE "core_jobapplication"' in q['sql'] for q in context.captured_queries), 1)
+        self.assertEqual(sum('INSERT INTO "core_jobapplication_rejection_reasons"' in q['sql'] for q in context.captured_queries), 1)
+
+        for application in JobApplication.objects.filter(id__in=ids):
+            self.assertEqual(application.status, 'რეზერვი')
+            self.assertEqual(application.feedback, 'Thank you')
+            self.assertEqual(
+                set(application.rejection_reasons.values_list('name', flat=True)),
+                {'არასაკმარისი_გამოცდილება', 'უნარების_ნაკლებობა'}
+            )
+        self.assertEqual(JobApplication.objects.get(id=self.applications[4].id).status, 'განხილვის_პროცესში')
+
+        # Query count doesn't grow with the number of applications
+        more = [
+            JobApplication.objects.create(
+                job=self.job, guest_name=f'Extra {i}', guest_email=f'extra{i}@example.com',
+                cover_letter='Hello', resume='resumes/cv.pdf'
+            ).id
+            for i in range(10)
+        ]
+        with self.assertNumQueries(len(context.captured_queries)):
+            self.client.post(url, dict(data, application_ids=ids + more), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    def test_bulk_status_update_other_job(self):
+        """Test that applications of other employers' jobs are not touched"""
+        other_user = User.objects.create_user('other', 'other@example.com', 'otherpass')
+        other_profile = UserProfile.objects.get(user=other_user)
+        other_profile.role = 'employer'
+        other_profile.save()
+        self.client.login(username='other', password='otherpass')
+        response = self.client.post(
+            reverse('bulk_update_application_status', args=[self.job.id]),
+            {'status': 'გასაუბრება', 'application_ids': [self.applications[2].id]}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(JobApplication.objects.get(id=self.applications[2].id).status, 'განხილვის_პროცესში')
@@ -1,13 +1,16 @@
 from django.urls import path
 from .views import main
-from .views.job_views import save_job, unsave_job
+from .views.job_views import save_job, unsave_job, job_list_more, job_autocomplete, save_search_view, delete_saved_search
 from .views.file_views import serve_cv_file
 from .views.profile_views import get_application_rejection_reasons
-from .views.employer_views import company_profile, application_detail
+from .views.employer_views import company_profile, application_detail, job_applications_daily, bulk_update_application_status
+from .views.api_views import job_list_api, job_detail_api
 
 urlpatterns = [
     path('', main.home_redirect, name='home_redirect'),
     path('jobs/', main.job_list, name='job_list'),
+    path('jobs/more/', job_list_more, name='job_list_more'),
+    path('jobs/autocomplete/', job_autocomplete, name='job_autocomplete'),
     path('login/', main.login_view, name='login'),
     path('logout/', main.logout_view, name='logout'),
     path('register/', main.register, name='register'),
@@ -26,6 +29,8 @@ urlpatterns = [
     path('employer/jobs/<int:job_id>/delete/', main.delete_job, name='delete_job'),
     path('employer/home/', main.employer_home, name='employer_home'),
     path('employer/jobs/<int:job_id>/applications/', main.job_applications, name='job_applications'),
+    path('employer/jobs/<int:job_id>/applications/daily/', job_applications_daily, name='job_applications_daily'),
+    path('employer/jobs/<int:job_id>/applications/bulk-status/', bulk_update_application_status, name='bulk_update_application_status'),
     path('employer/applications/<int:application_id>/', application_detail, name='application_detail'),
     path('employer/applications/<int:application_id>/update-status/', main.update_application_status, name='update_application_status'),
     path('company/<int:employer_id>/', company_profile, name='company_profile'),
@@ -36,8 +41,12 @@ urlpatterns = [
     path('jobs/<int:job_id>/apply/', main.apply_job, name='apply_job'),
     path('jobs/<int:job_id>/save/', save_job, name='save_job'),
     path('jobs/<int:job_id>/unsave/', unsave_job, name='unsave_job'),
+    path('jobs/saved-searches/', save_search_view, name='save_search'),
+    path('jobs/saved-searches/<int:search_id>/delete/', delete_saved_search, name='delete_saved_search'),
     
     # API routes
+    path('api/jobs/', job_list_api, name='job_list_api'),
+    path('api/jobs/<int:job_id>/', job_detail_api, name='job_detail_api'),
     path('api/applications/<int:application_id>/rejection-reasons/', get_application_rejection_reasons, name='get_application_rejection_reasons'),
     
     # Admin routes
@@ -0,0 +1,133 @@
+"""
+Read-only JSON API over the public job listings.
+
+``/api/jobs/`` takes the same filters as the job list and pages with the
+same keyset cursors; ``/api/jobs/<id>/`` returns one live job. ``fields=``
+picks the returned fields, and only their columns are loaded. Responses are
+gzipped and carry the same validators as the public HTML pages (see
+core.conditional), so polling clients mostly get 304s.
+"""
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import condition, require_GET
+
+from ..caching import get_cached_job_ids
+from ..conditional import public_page_etag, public_page_last_modified
+from ..models import JobListing
+from ..pagination import KeysetPaginator, InvalidCursor
+from .job_views import filter_jobs
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 100
+
+# Fields a client may ask for, read straight off the model
+JOB_API_FIELDS = (
+    'id', 'title', 'company', 'description', 'category', 'location', 'experience', 'job_preferences',
+    'salary_min', 'salary_max', 'salary_type', 'salary_min_monthly', 'salary_max_monthly',
+    'premium_level', 'considers_students', 'georgian_language_only', 'employer_id', 'posted_at', 'expires_at',
+)
+# Computed fields and the columns they need
+JOB_API_EXTRA_FIELDS = {
+    'url': ('id',),
+}
+# Descriptions are large; list responses leave them out unless asked
+JOB_API_LIST_FIELDS = tuple(field for field in JOB_API_FIELDS if field != 'description') + ('url',)
+JOB_API_DETAIL_FIELDS = JOB_API_FIELDS + ('url',)
+
+
+def _error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def _requested_fields(params, default):
+    """Return the fields named in ``fields=``, or ``default``; None if one is unknown"""
+    names = [name.strip() for name in params.get('fields', '').split(',') if name.strip()]
+    if not names:
+        return default
+    if any(name not in JOB_API_FIELDS and name not in JOB_API_EXTRA_FIELDS for name in names):
+        return None
+    return tuple(dict.fromkeys(names))
+
+
+def _columns(fields):
+    columns = set()
+    for name in fields:
+        columns.update(JOB_API_EXTRA_FIELDS.get(name, (name,)))
+    # employer_id is loaded as the foreign key column
+    return {'employer' if column == 'employer_id' else column for column in columns}
+
+
+def _ordering_columns(ordering):
+    # Cursors are built from the ordering columns; annotations such as the search rank are selected anyway
+    model_fields = {field.name for field in JobListing._meta.concrete_fields}
+    return [name.lstrip('-') for name in ordering if name.lstrip('-') in model_fields]
+
+
+def serialize_job(job, fields):
+    data = {}
+    for name in fields:
+        if name == 'url':
+            data[name] = reverse('job_detail', args=[job.id])
+        else:
+            data[name] = getattr(job, name)
+    return data
+
+
+@gzip_page
+@require_GET
+@condition(etag_func=public_page_etag, last_modified_func=public_page_last_modified)
+def job_list_api(request):
+    """
+    Return a page of live jobs as JSON, filtered and ordered like the job list
+    with its filters shown.
+    """
+    fields = _requested_fields(request.GET, JOB_API_LIST_FIELDS)
+    if fields is None:
+        return _error(f"Unknown field; available fields: {', '.join(JOB_API_DETAIL_FIELDS)}")
+    try:
+        page_size = min(int(request.GET.get('limit', API_PAGE_SIZE)), API_MAX_PAGE_SIZE)
+    except ValueError:
+        return _error('Invalid limit')
+    if page_size < 1:
+        return _error('Invalid limit')
+
+    # All live jobs, not just the premium ones the job list starts with
+    params = request.GET.copy()
+    params['show_filters'] = '1'
+    params.pop('show_expired', None)
+    try:
+        jobs, ordering, filtered, active_filters, filter_remove_urls = filter_jobs(params)
+    except ValueError:
+        return _error('Invalid filter value')
+
+    ordering = ordering + ('id',)
+    paginator = KeysetPaginator(
+        jobs.select_related(None).only(*_columns(fields), *_ordering_columns(ordering)),
+        page_size,
+        ordering,
+        ordered_ids=get_cached_job_ids(params, jobs, ordering),
+    )
+    try:
+        page = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
+        return _error('Invalid cursor')
+    return JsonResponse({
+        'results': [serialize_job(job, fields) for job in page],
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    })
+
+
+@gzip_page
+@require_GET
+@condition(etag_func=public_page_etag, last_modified_func=public_page_last_modified)
+def job_detail_api(request, job_id):
+    """Return one live job as JSON"""
+    fields = _requested_fields(request.GET, JOB_API_DETAIL_FIELDS)
+    if fields is None:
+        return _error(f"Unknown field; available fields: {', '.join(JOB_API_DETAIL_FIELDS)}")
+    job = JobListing.objects.filter(JobListing.live_filter(), id=job_id).only(*_columns(fields)).first()
+    if job is None:
+        return _error('Job not found', status=404)
+    return JsonResponse(serialize_job(job, fields))
@@ -1,10 +1,18 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import condition, require_POST
+from django.db import transaction
 from django.db.models import Count, Prefetch, Q, Case, When, Value, IntegerField
+from django.db.models.functions import Coalesce
 from ..models import JobListing, EmployerProfile, JobApplication, UserProfile, RejectionReason
 from ..forms import JobListingForm, EmployerProfileForm
+from ..caching import render_job_cards
+from ..stats import EmployerStats, invalidate_employer_stats
+from ..rollups import update_applications, daily_applications
+from ..registry import rejection_reason_ids
+from ..conditional import public_page_etag, public_page_last_modified
+from ..pagination import KeysetPaginator, InvalidCursor
 import logging
 from django.utils import timezone
 from datetime import timedelta
@@ -25,30 +33,12 @@ def is_employer(user):
     except:
         return False
 
-@login_required
-@user_passes_test(is_employer)
-def employer_home(request):
+def employer_jobs(employer_profile):
     """
-    Display the employer metrics/summary page (not job management)
+    The employer's jobs for the dashboards: approved first, then pending
+    review, then rejected, with their application and view counts
     """
-    employer_profile = request.user.userprofile.employer_profile
-    jobs = JobListing.objects.filter(employer=employer_profile)
-
-    # Metrics
-    total_jobs = jobs.count()
-    active_jobs = jobs.filter(status='approved').count()
-    total_applicants = JobApplication.objects.filter(job__employer=employer_profile).count()
-    unread_applicants = JobApplication.objects.filter(job__employer=employer_profile, is_read=False).count()
-    avg_applicants = round(total_applicants / total_jobs, 2) if total_jobs > 0 else 0
-    # Jobs expiring soon (example: jobs expiring in next 7 days)
-    soon = timezone.now() + timedelta(days=7)
-    jobs_expiring_soon = jobs.filter(expiry_date__lte=soon, expiry_date__gte=timezone.now()) if hasattr(jobs.first(), 'expiry_date') else []
-    
-    # All jobs for this employer ordered by most recent first
-    all_jobs = jobs.order_by('-posted_at')
-    
-    # Sort jobs by status (approved first, then pending review, then rejected)
-    all_jobs = jobs.annotate(
+    return JobListing.objects.filter(employer=employer_profile).annotate(
         status_order=Case(
             When(status='approved', then=Value(1)),
             When(status='pending_review', then=Value(2)),
@@ -59,9 +49,33 @@ def employer_home(request):
         unread_applications_count=Count(
             'applications',
             filter=Q(applications__is_read=False)
-        )
+        ),
+        applications_count=Count('applications'),
+        view_count=Coalesce('view_stats__views', 0)
     ).select_related('employer').order_by('status_order', '-posted_at')
-    
+
+def stats_context(stats):
+    return {
+        'stats': stats,
+        'total_jobs': stats.total_jobs,
+        'active_jobs': stats.active_jobs,
+        'total_applicants': stats.total_applicants,
+        'unread_applicants': stats.unread_applicants,
+        'avg_applicants': stats.avg_applicants,
+        'jobs_expiring_soon': stats.expiring_soon,
+    }
+
+@login_required
+@user_passes_test(is_employer)
+def employer_home(request):
+    """
+    Display the employer metrics/summary page (not job management)
+    """
+    employer_profile = request.user.userprofile.employer_profile
+
+    # Headline metrics come from one cached aggregate, see core.stats
+    stats = EmployerStats.for_employer(employer_profile.id)
+
     # Recent applicants (last 5)
     recent_applicants = JobApplication.objects.filter(
         job__employer=employer_profile
@@ -69,14 +83,9 @@ def employer_home(request):
 
     context = {
         'employer_profile': employer_profile,
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs,
-        'total_applicants': total_applicants,
-        'unread_applicants': unread_applicants,
-        'avg_applicants': avg_applicants,
-        'jobs_expiring_soon': jobs_expiring_soon,
-        'all_jobs': all_jobs,
+        'all_jobs': employer_jobs(employer_profile),
         'recent_applicants': recent_applicants,
+        **stats_context(stats),
     }
     return render(request, 'core/employer_home_tailwind.html', context)
 
@@ -87,37 +96,7 @@ def employer_dashboard(request):
     Display the employer dashboard with detailed analytics
     """
     employer_profile = request.user.userprofile.employer_profile
-
-    # All jobs for this employer with application counts
-    jobs = JobListing.objects.filter(employer=employer_profile)
-
-    # Sort jobs by status (approved first, then pending review, then rejected)
-    all_jobs = jobs.annotate(
-        status_order=Case(
-            When(status='approved', then=Value(1)),
-            When(status='pending_review', then=Value(2)),
-            When(status='rejected', then=Value(3)),
-            default=Value(4),
-            output_field=IntegerField(),
-        ),
-        unread_applications_count=Count(
-            'applications',
-            filter=Q(applications__is_read=False)
-        ),
-        applications_count=Count('applications')
-    ).select_related(
-        'employer'  # Include employer data to reduce queries
-    ).order_by('status_order', '-posted_at')
-
-    # Metrics
-    active_jobs = jobs.filter(status='approved').count()
-    total_applicants = JobApplication.objects.filter(job__employer=employer_profile).count()
-    avg_applicants = (
-        total_applicants / active_jobs if active_jobs > 0 else 0
-    )
-    # Jobs expiring soon (example: jobs expiring in next 7 days)
-    soon = timezone.now() + timedelta(days=7)
-    jobs_expiring_soon = jobs.filter(expiry_date__lte=soon, expiry_date__gte=timezone.now()).count() if hasattr(jobs.first(), 'expiry_date') else 0
+    stats = EmployerStats.for_employer(employer_profile.id)
 
     # Recent applicants (last 5)
     recent_applicants = JobApplication.objects.filter(
@@ -126,13 +105,10 @@ def employer_dashboard(request):
 
     context = {
         'employer_profile': employer_profile,
-        'jobs': jobs,
-        'all_jobs': all_jobs,
-        'active_jobs': active_jobs,
-        'total_applicants': total_applicants,
-        'avg_applicants': avg_applicants,
-        'jobs_expiring_soon': jobs_expiring_soon,
+        'jobs': JobListing.objects.filter(employer=employer_profile),
+        'all_jobs': employer_jobs(employer_profile),
         'recent_applicants': recent_applicants,
+        **stats_context(stats),
     }
     return render(request, 'core/employer_profile_tailwind.html', context)
 
@@ -244,11 +220,35 @@ def delete_job(request, job_id):
     messages.success(request, "Job listing has been deleted.")
     return redirect('profile')
 
+# Days of history the applications chart shows by default, and at most
+APPLICATIONS_CHART_DAYS = 30
+APPLICATIONS_CHART_MAX_DAYS = 365
+
+@login_required
+@user_passes_test(is_employer)
+def job_applications_daily(request, job_id):
+    """
+    Return a job's applications per day as JSON, read from the daily rollup
+    """
+    job = get_object_or_404(JobListing, id=job_id)
+    if job.employer_id != request.user.userprofile.employer_profile.id:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    try:
+        days = min(int(request.GET.get('days', APPLICATIONS_CHART_DAYS)), APPLICATIONS_CHART_MAX_DAYS)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid number of days'}, status=400)
+    end = timezone.localdate()
+    start = end - timedelta(days=max(days, 1) - 1)
+    return JsonResponse({'job': job.id, 'days': daily_applications(job.id, start, end)})
+
+# Applications shown per page of the applications inbox
+APPLICATIONS_PER_PAGE = 50
+
 @login_required
 @user_passes_test(is_employer)
 def job_applications(request, job_id):
     """
-    Display all applications for a specific job
+    Display the applications for a specific job, a keyset page at a time
     """
     # Get the job and verify ownership
     job = get_object_or_404(JobListing, id=job_id)
@@ -258,12 +258,7 @@ def job_applications(request, job_id):
         messages.error(request, "You don't have permission to view applications for this job.")
         return redirect('profile')
     
-    # Get applications for this job
-    applications = JobApplication.objects.filter(job=job).select_related('user', 'job')
-    
-    # Apply filters if provided
-    if 'status' in request.GET and request.GET['status']:
-        applications = applications.filter(status=request.GET['status'])
+    applications = JobApplication.objects.filter(job=job)
     
     if 'search' in request.GET and request.GET['search']:
         search_query = request.GET['search']
@@ -276,6 +271,18 @@ def job_applications(request, job_id):
             Q(guest_email__icontains=search_query)
         )
     
+    # Status totals in one conditional aggregate, before the status filter so every tab keeps its count
+    counts = applications.aggregate(
+        total_applications=Count('id'),
+        review_applications=Count('id', filter=Q(status='განხილვის_პროცესში')),
+        interview_applications=Count('id', filter=Q(status='გასაუბრება')),
+        reserve_applications=Count('id', filter=Q(status='რეზერვი')),
+    )
+    
+    status = request.GET.get('status', '')
+    if status:
+        applications = applications.filter(status=status)
+    
     # Sort applications by status with custom order
     applications = applications.annotate(
         status_order=Case(
@@ -285,26 +292,27 @@ def job_applications(request, job_id):
             default=Value(4),
             output_field=IntegerField(),
         )
-    ).order_by('status_order', '-applied_at')
+    ).select_related('user__userprofile').prefetch_related('rejection_reasons')
     
-    # Mark all applications as read
-    unread_applications = applications.filter(is_read=False)
-    if unread_applications.exists():
-        unread_applications.update(is_read=True)
+    paginator = KeysetPaginator(applications, APPLICATIONS_PER_PAGE, ('status_order', '-applied_at', '-id'))
+    try:
+        applications_page = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
+        applications_page = paginator.page()
     
-    # Get counts for each status
-    total_applications = applications.count()
-    review_applications = applications.filter(status='განხილვის_პროცესში').count()
-    interview_applications = applications.filter(status='გასაუბრება').count()
-    reserve_applications = applications.filter(status='რეზერვი').count()
+    # Mark only the applications on this page as read; they still show as new this time
+    unread_ids = [application.id for application in applications_page if not application.is_read]
+    if unread_ids:
+        update_applications(JobApplication.objects.filter(id__in=unread_ids), is_read=True)
+        # A plain UPDATE sends no signal
+        invalidate_employer_stats(employer_profile.id)
     
     context = {
         'job': job,
-        'applications': applications,
-        'total_applications': total_applications,
-        'review_applications': review_applications,
-        'interview_applications': interview_applications,
-        'reserve_applications': reserve_applications,
+        'applications': applications_page,
+        'status': status,
+        'search': request.GET.get('search', ''),
+        **counts,
     }
     
     return render(request, 'core/employer_applications_tailwind.html', context)
@@ -346,18 +354,9 @@ def update_application_status(request, application_id):
         
         # If rejection reasons are provided, save them
         if new_status == 'რეზერვი' and 'rejection_reasons' in request.POST:
-            # Clear existing reasons
+            # Replace the existing reasons; ids come from the in-process registry
             application.rejection_reasons.clear()
-            
-            # Add new reasons
-            reason_ids = request.POST.getlist('rejection_reasons')
-            for reason_id in reason_ids:
-                try:
-                    # Create or get the reason by its choice key
-                    reason, created = RejectionReason.objects.get_or_create(name=reason_id)
-                    application.rejection_reasons.add(reason)
-                except Exception:
-                    pass
+            application.rejection_reasons.add(*rejection_reason_ids(request.POST.getlist('rejection_reasons')))
             
             # Save feedback if provided
             if 'feedback' in request.POST:
@@ -375,6 +374,61 @@ def update_application_status(request, application_id):
     # Redirect back to the applications page
     return redirect('job_applications', job_id=application.job.id)
 
+@login_required
+@user_passes_test(is_employer)
+@require_POST
+def bulk_update_application_status(request, job_id):
+    """
+    Move many applications of a job to a new status at once. The applications
+    are updated in one UPDATE and their rejection reasons written in one insert
+    """
+    job = get_object_or_404(JobListing, id=job_id)
+    employer_profile = request.user.userprofile.employer_profile
+    
+    if job.employer_id != employer_profile.id:
+        return JsonResponse({'error': 'Permission denied'}, status=403)
+    
+    new_status = request.POST.get('status')
+    if new_status not in dict(JobApplication.STATUS_CHOICES):
+        return JsonResponse({'error': 'Invalid status value provided.'}, status=400)
+    try:
+        requested_ids = [int(application_id) for application_id in request.POST.getlist('application_ids')]
+    except ValueError:
+        return JsonResponse({'error': 'Invalid application id'}, status=400)
+    
+    values = {'status': new_status}
+    if 'feedback' in request.POST:
+        values['feedback'] = request.POST.get('feedback')
+    
+    # Resolved before the transaction, so a rollback can't take away reasons the registry already knows
+    replace_reasons = new_status == 'რეზერვი' and 'rejection_reasons' in request.POST
+    if replace_reasons:
+        reason_ids = rejection_reason_ids(request.POST.getlist('rejection_reasons'))
+    
+    with transaction.atomic():
+        application_ids = list(
+            JobApplication.objects.filter(job=job, id__in=requested_ids).values_list('id', flat=True)
+        )
+        updated = update_applications(JobApplication.objects.filter(id__in=application_ids), **values)
+        
+        # Like the single update, reserve replaces the rejection reasons when they are given
+        if replace_reasons and application_ids:
+            Through = JobApplication.rejection_reasons.through
+            Through.objects.filter(jobapplication_id__in=application_ids).delete()
+            Through.objects.bulk_create(
+                [
+                    Through(jobapplication_id=application_id, rejectionreason_id=reason_id)
+                    for application_id in application_ids for reason_id in reason_ids
+                ],
+                ignore_conflicts=True,
+            )
+    
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'success': True, 'updated': updated})
+    
+    messages.success(request, f"{updated} applications updated successfully.")
+    return redirect('job_applications', job_id=job.id)
+
 @login_required
 @user_passes_test(is_employer)
 def get_job_details(request, job_id):
@@ -406,6 +460,7 @@ def get_job_details(request, job_id):
     
     return JsonResponse(job_data) 
 
+@condition(etag_func=public_page_etag, last_modified_func=public_page_last_modified)
 def company_profile(request, employer_id):
     """
     Display the public company profile page for an employer
@@ -414,14 +469,15 @@ def company_profile(request, employer_id):
     employer = get_object_or_404(EmployerProfile, id=employer_id)
     
     # Get active job listings for this employer
-    jobs = JobListing.objects.filter(employer=employer, status='approved').order_by('-posted_at')
+    jobs = list(JobListing.objects.filter(employer=employer, status='approved').select_related('employer').order_by('-posted_at'))
     
     # Count of open jobs
-    open_jobs_count = jobs.count()
+    open_jobs_count = len(jobs)
     
     context = {
         'company': employer,
         'jobs': jobs,
+        'job_cards': render_job_cards(jobs, 'core/components/employer_profile/public_job_card_tailwind.html'),
         'open_jobs_count': open_jobs_count,
     }
     
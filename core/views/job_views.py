@@ -1,79 +1,96 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Q
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from ..models import JobListing, JobApplication, SavedJob
+from ..models import JobListing, JobApplication, SavedJob, SimilarJob, SavedSearch
 from ..forms import JobListingForm
+from ..search import search_jobs
+from ..search.autocomplete import suggest
+from ..alerts import save_search, normalise_filters
+from ..pagination import KeysetPaginator, InvalidCursor
+from ..caching import get_job_facets, get_cached_job_ids, render_job_cards, job_state_for_request
+from ..conditional import public_page_etag, public_page_last_modified
+from ..counters import record_job_view
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.views.decorators.http import condition
+from django.template.loader import render_to_string
+import functools
 import logging
-from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+JOBS_PER_PAGE = 9
+# Batch size for the filtered list and its load-more endpoint
+JOBS_BATCH_SIZE = 24
+
 def remove_from_query_string(query_dict, param):
     """Helper function to remove a parameter from query string"""
     query_dict = query_dict.copy()
     query_dict.pop(param, None)
     return '?' + query_dict.urlencode() if query_dict else '?'
 
-def job_list(request):
+def without_invalid_filters(params):
+    """Drop a salary_min that isn't a whole number; filter_jobs raises ValueError on it"""
+    salary_min = params.get('salary_min', '')
+    try:
+        int(salary_min or 0)
+    except ValueError:
+        params = params.copy()
+        params.pop('salary_min')
+    return params
+
+def filter_jobs(params):
     """
-    Display the job listing page with filtering options
+    Build the public job queryset for the job list filters in ``params``.
+    Returns the ordered queryset, its ordering, whether any filter is active,
+    and the active filter labels with the URLs that remove them.
     """
-    # Only show approved jobs to the public
+    # Only show live (approved, not expired) jobs to the public
     # Use select_related to fetch employer in the same query
-    # Order by premium level (premium_plus first, then premium, then standard)
-    jobs = JobListing.objects.filter(status='approved').select_related('employer').order_by(
-        # Custom ordering for premium levels
-        # This will put premium_plus first, then premium, then standard
-        # Since it's in reverse alphabetical order: standard < premium < premium_plus
-        '-premium_level', '-posted_at'
-    )
-    
-    # Filter out expired jobs
-    # Only show jobs that either don't have an expiration date yet or where the expiration date is in the future
-    jobs = jobs.filter(Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now()))
+    jobs = JobListing.objects.filter(JobListing.live_filter()).select_related('employer')
+    
+    # Premium jobs first (premium_plus, premium, standard), served by the feed index;
+    # a search additionally orders by relevance within each level
+    ordering = ('-premium_rank', '-posted_at')
     
     # Initialize filtering context variables
     filtered = False
     active_filters = {}
     filter_remove_urls = {}
-    show_filters = 'show_filters' in request.GET
+    show_filters = 'show_filters' in params
     
     # Filter by premium level on main page (when filters are NOT being shown)
     # Premium filtering logic - only show premium and premium_plus jobs on main page
     if not show_filters:
-        jobs = jobs.filter(premium_level__in=['premium', 'premium_plus'])
+        jobs = jobs.filter(premium_rank__gte=JobListing.PREMIUM_RANKS['premium'])
     
     # Apply filters based on request parameters
-    if 'search' in request.GET and request.GET['search']:
-        search_term = request.GET['search']
-        jobs = jobs.filter(
-            Q(title__icontains=search_term) | 
-            Q(company__icontains=search_term) |
-            Q(description__icontains=search_term)
-        )
+    search_term = None
+    if 'search' in params and params['search']:
+        search_term = params['search']
+        ordering = ('-premium_rank', '-search_rank', '-posted_at')
         filtered = True
         active_filters['საძიებო სიტყვა'] = search_term
-        filter_remove_urls['საძიებო სიტყვა'] = remove_from_query_string(request.GET, 'search')
+        filter_remove_urls['საძიებო სიტყვა'] = remove_from_query_string(params, 'search')
     
-    if 'location' in request.GET and request.GET['location']:
-        location = request.GET['location']
+    if 'location' in params and params['location']:
+        location = params['location']
         jobs = jobs.filter(location=location)
         filtered = True
         active_filters['ლოკაცია'] = location
-        filter_remove_urls['ლოკაცია'] = remove_from_query_string(request.GET, 'location')
+        filter_remove_urls['ლოკაცია'] = remove_from_query_string(params, 'location')
     
-    if 'category' in request.GET and request.GET['category']:
-        category = request.GET['category']
+    if 'category' in params and params['category']:
+        category = params['category']
         jobs = jobs.filter(category=category)
         filtered = True
         active_filters['კატეგორია'] = category
-        filter_remove_urls['კატეგორია'] = remove_from_query_string(request.GET, 'category')
+        filter_remove_urls['კატეგორია'] = remove_from_query_string(params, 'category')
     
-    if 'premium_level' in request.GET and request.GET['premium_level']:
-        premium_level = request.GET['premium_level']
+    if 'premium_level' in params and params['premium_level']:
+        premium_level = params['premium_level']
         jobs = jobs.filter(premium_level=premium_level)
         filtered = True
         premium_level_display = {
@@ -82,10 +99,10 @@ def job_list(request):
             'premium_plus': 'Premium +'
         }.get(premium_level, premium_level)
         active_filters['Premium Level'] = premium_level_display
-        filter_remove_urls['Premium Level'] = remove_from_query_string(request.GET, 'premium_level')
+        filter_remove_urls['Premium Level'] = remove_from_query_string(params, 'premium_level')
     
-    if 'experience' in request.GET and request.GET['experience']:
-        experience = request.GET['experience']
+    if 'experience' in params and params['experience']:
+        experience = params['experience']
         jobs = jobs.filter(experience=experience)
         filtered = True
         active_filters['გამოცდილება'] = {
@@ -93,54 +110,96 @@ def job_list(request):
             'mid': 'საშუალო',
             'senior': 'პროფესიონალი'
         }.get(experience, experience)
-        filter_remove_urls['გამოცდილება'] = remove_from_query_string(request.GET, 'experience')
+        filter_remove_urls['გამოცდილება'] = remove_from_query_string(params, 'experience')
     
-    if 'salary_min' in request.GET and request.GET['salary_min'] and int(request.GET['salary_min']) > 0:
-        salary_min = request.GET['salary_min']
-        jobs = jobs.filter(salary_min__gte=salary_min)
+    if 'salary_min' in params and params['salary_min'] and int(params['salary_min']) > 0:
+        salary_min = params['salary_min']
+        # Compare monthly equivalents so hourly, daily and weekly salaries filter correctly
+        jobs = jobs.filter(salary_min_monthly__gte=salary_min)
         filtered = True
         active_filters['მინიმალური ანაზღაურება'] = f"₾ {salary_min}"
-        filter_remove_urls['მინიმალური ანაზღაურება'] = remove_from_query_string(request.GET, 'salary_min')
+        filter_remove_urls['მინიმალური ანაზღაურება'] = remove_from_query_string(params, 'salary_min')
     
-    if 'job_preferences' in request.GET and request.GET['job_preferences']:
-        preferences = request.GET['job_preferences'].split(',')
+    if 'job_preferences' in params and params['job_preferences']:
+        preferences = params['job_preferences'].split(',')
         jobs = jobs.filter(job_preferences__in=preferences)
         filtered = True
         active_filters['სამუშაოს ტიპი'] = ', '.join(preferences)
-        filter_remove_urls['სამუშაოს ტიპი'] = remove_from_query_string(request.GET, 'job_preferences')
+        filter_remove_urls['სამუშაოს ტიპი'] = remove_from_query_string(params, 'job_preferences')
     
     # Include expired jobs only if explicitly requested
-    if 'show_expired' in request.GET and request.GET['show_expired'] == '1':
+    if 'show_expired' in params and params['show_expired'] == '1':
         jobs = JobListing.objects.filter(status='approved').select_related('employer')
+        ordering = ('-premium_rank', '-posted_at')
+        search_term = None
         filtered = True
         active_filters['Show Expired'] = 'Yes'
-        filter_remove_urls['Show Expired'] = remove_from_query_string(request.GET, 'show_expired')
+        filter_remove_urls['Show Expired'] = remove_from_query_string(params, 'show_expired')
+    
+    # Highest monthly salary first; only jobs that list a salary can be ranked
+    if params.get('sort') == 'salary':
+        jobs = jobs.filter(salary_min_monthly__isnull=False)
+        ordering = ('-salary_min_monthly', '-posted_at')
+        filtered = True
+        active_filters['სორტირება'] = 'ხელფასით'
+        filter_remove_urls['სორტირება'] = remove_from_query_string(params, 'sort')
+    
+    # Full-text search over the GIN-indexed search vector instead of icontains scans;
+    # applied last, so a backend that caps its matches picks them among the jobs
+    # the other filters admit
+    if search_term:
+        jobs = search_jobs(jobs, search_term)
     
     # After all filters are applied, ensure premium ordering is preserved
     # This guarantees premium jobs always appear at the top even after filtering
-    jobs = jobs.order_by('-premium_level', '-posted_at')
+    jobs = jobs.order_by(*ordering)
     
-    # Get unique categories and locations for filter dropdowns - use distinct() with values_list for optimization
-    all_categories = JobListing.objects.filter(status='approved').values_list('category', flat=True).distinct().order_by('category')
-    all_locations = JobListing.objects.filter(status='approved').values_list('location', flat=True).distinct().order_by('location')
+    return jobs, ordering, filtered, active_filters, filter_remove_urls
+
+@condition(etag_func=public_page_etag, last_modified_func=public_page_last_modified)
+def job_list(request):
+    """
+    Display the job listing page with filtering options
+    """
+    show_filters = 'show_filters' in request.GET
+    # A malformed salary in a hand-edited URL is ignored rather than failing the page
+    params = without_invalid_filters(request.GET)
+    jobs, ordering, filtered, active_filters, filter_remove_urls = filter_jobs(params)
+    
+    # Category and location dropdowns with job counts, served from the facet cache
+    facets = get_job_facets()
     
     # Get job preferences for checkboxes
     job_preferences = []
     if 'job_preferences' in request.GET:
         job_preferences = request.GET['job_preferences'].split(',')
     
-    # Only use pagination on the main page (when filters are NOT being shown)
+    # Repeated filter combinations reuse a cached, ordered id list so only the
+    # rows of the requested page are fetched
+    ordered_ids = get_cached_job_ids(params, jobs, ordering + ('id',))
+    
+    # Main page is paginated; the filtered list is loaded in bounded batches
     if not show_filters:
-        # Pagination for main page only
-        paginator = Paginator(jobs, 9)  # Show 9 jobs per page
-        page_number = request.GET.get('page', 1)
-        try:
-            jobs_page = paginator.page(page_number)
-        except (PageNotAnInteger, EmptyPage):
-            jobs_page = paginator.page(1)
+        if 'page' in request.GET:
+            # Old page-number links keep working through the offset paginator
+            paginator = Paginator(jobs, JOBS_PER_PAGE)
+            page_number = request.GET.get('page', 1)
+            try:
+                jobs_page = paginator.page(page_number)
+            except (PageNotAnInteger, EmptyPage):
+                jobs_page = paginator.page(1)
+        else:
+            # Keyset pagination: every page is an index seek, no COUNT(*) or OFFSET
+            paginator = KeysetPaginator(jobs, JOBS_PER_PAGE, ordering + ('id',), ordered_ids=ordered_ids)
+            try:
+                jobs_page = paginator.page(request.GET.get('cursor'))
+            except InvalidCursor:
+                jobs_page = paginator.page()
+        jobs_count = len(jobs_page)
     else:
-        # No pagination when filters are shown - display all jobs
-        jobs_page = jobs
+        # Filtered list shows the first batch; the rest is fetched by job_list_more
+        jobs_page = KeysetPaginator(jobs, JOBS_BATCH_SIZE, ordering + ('id',), ordered_ids=ordered_ids).page()
+        jobs_count = len(ordered_ids) if ordered_ids is not None else jobs.count()
     
     # Check if user is an employer
     is_employer_user = False
@@ -153,9 +212,14 @@ def job_list(request):
     
     context = {
         'jobs': jobs_page,
+        # Card HTML comes from the fragment cache in one round trip
+        'job_cards': render_job_cards(jobs_page),
+        # Saved/applied badges for the signed-in user, drawn over the shared cards
+        'job_state': job_state_for_request(request),
+        'jobs_count': jobs_count,
         'is_employer': is_employer_user,
-        'categories': all_categories,
-        'locations': all_locations,
+        'categories': facets['categories'],
+        'locations': facets['locations'],
         'job_preferences': job_preferences,
         'filtered': filtered,
         'active_filters': active_filters,
@@ -168,6 +232,58 @@ def job_list(request):
     
     return render(request, template, context)
 
+@condition(etag_func=public_page_etag, last_modified_func=public_page_last_modified)
+def job_list_more(request):
+    """
+    Return the next batch of job cards for the filtered job list as JSON.
+    Batches are fixed-size keyset pages, so memory per request stays constant.
+    """
+    try:
+        jobs, ordering, filtered, active_filters, filter_remove_urls = filter_jobs(request.GET)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid filter value'}, status=400)
+    ordered_ids = get_cached_job_ids(request.GET, jobs, ordering + ('id',))
+    paginator = KeysetPaginator(jobs, JOBS_BATCH_SIZE, ordering + ('id',), ordered_ids=ordered_ids)
+    try:
+        jobs_page = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
+        return JsonResponse({'error': 'Invalid cursor'}, status=400)
+    
+    html = render_to_string('core/components/job_list/job_cards_batch_tailwind.html', {
+        'jobs': jobs_page,
+        'job_cards': render_job_cards(jobs_page),
+        'job_state': job_state_for_request(request),
+    }, request=request)
+    return JsonResponse({
+        'html': html,
+        'next_cursor': jobs_page.next_cursor,
+        'has_next': jobs_page.has_next(),
+    })
+
+def job_autocomplete(request):
+    """
+    Suggest job titles, company names and categories for the search box as JSON.
+    Served from an in-memory prefix index, so it is cheap enough to call on every keypress.
+    """
+    query = request.GET.get('q', '').strip()
+    suggestions = suggest(query) if query else []
+    return JsonResponse({'suggestions': suggestions})
+
+def count_revalidated_views(view):
+    """
+    Record a job view for 304 answers too. ``condition`` returns them before
+    the view body, which records the views of full responses, ever runs.
+    """
+    @functools.wraps(view)
+    def wrapper(request, job_id, *args, **kwargs):
+        response = view(request, job_id, *args, **kwargs)
+        if response.status_code == 304:
+            record_job_view(job_id)
+        return response
+    return wrapper
+
+@count_revalidated_views
+@condition(etag_func=public_page_etag, last_modified_func=public_page_last_modified)
 def job_detail(request, job_id):
     """
     Display details for a specific job listing
@@ -175,21 +291,29 @@ def job_detail(request, job_id):
     # Use select_related to fetch employer in the same query
     job = get_object_or_404(JobListing.objects.select_related('employer'), id=job_id, status='approved')
     
-    # Get similar jobs based on category and experience, only show approved
-    # Also order by premium level
-    similar_jobs = JobListing.objects.filter(
-        status='approved',
-        category=job.category
-    ).exclude(id=job_id).select_related('employer').order_by('-premium_level', '-posted_at')[:5]
+    # Similar jobs are precomputed by build_similar_jobs (see core.recommendations)
+    if job.similar_computed_at is not None:
+        similar_jobs = [
+            entry.similar for entry in SimilarJob.objects.filter(
+                JobListing.live_filter('similar__'), job=job, similar__deleted_at__isnull=True
+            ).select_related('similar')[:5]
+        ]
+    else:
+        # Not computed yet: fall back to the newest premium jobs in the same category
+        similar_jobs = JobListing.objects.filter(
+            status='approved',
+            category=job.category
+        ).exclude(id=job_id).select_related('employer').order_by('-premium_rank', '-posted_at')[:5]
     
-    # Check if job is saved by user
-    is_saved = False
-    if request.user.is_authenticated:
-        is_saved = SavedJob.objects.filter(user=request.user, job=job).exists()
+    # Check if job is saved by user, from the cached per-user job state
+    is_saved = job.id in job_state_for_request(request)['saved']
     
     # Check if job is expired
     is_expired = job.is_expired()
     
+    # Buffered in memory and written in batches, see core.counters
+    record_job_view(job.id)
+    
     context = {
         'job': job,
         'similar_jobs': similar_jobs,
@@ -319,4 +443,32 @@ def unsave_job(request, job_id):
             messages.info(request, 'Job was not saved')
             
         return redirect('job_detail', job_id=job_id)
-    return redirect('job_list') 
\ No newline at end of file
+    return redirect('job_list') 
+@login_required
+def save_search_view(request):
+    """
+    Save the current job list filters as a saved search with email alerts
+    """
+    if request.method == 'POST':
+        try:
+            saved_search, created = save_search(request.user, request.POST)
+        except ValueError as e:
+            messages.error(request, str(e))
+        else:
+            if created:
+                messages.success(request, 'Search saved. New matching jobs will be emailed to you')
+            else:
+                messages.info(request, 'Search already saved')
+        return redirect(f"{reverse('job_list')}?{urlencode(dict(normalise_filters(request.POST), show_filters=1))}")
+    return redirect('job_list')
+
+@login_required
+def delete_saved_search(request, search_id):
+    """
+    Delete one of the user's saved searches
+    """
+    if request.method == 'POST':
+        deleted = SavedSearch.objects.filter(id=search_id, user=request.user).delete()[0]
+        if deleted:
+            messages.success(request, 'Saved search deleted')
+    return redirect('profile')
@@ -25,10 +25,10 @@ def home_redirect(request):
 # Import required modules to support the above functions
 from django.shortcuts import redirect, render
 
-# Import the pricing models
-from core.models import PricingPackage
+# Pricing packages are served from the in-process registry
+from core.registry import active_pricing_packages
 
 def pricing(request):
     """Display the pricing packages page"""
-    pricing_packages = PricingPackage.objects.filter(is_active=True).prefetch_related('features').order_by('display_order')
+    pricing_packages = active_pricing_packages()
     return render(request, 'core/pricing_tailwind.html', {'pricing_packages': pricing_packages})
\ No newline at end of file
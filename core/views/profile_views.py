@@ -4,7 +4,7 @@ from django.contrib import messages
 from django.views.decorators.http import require_POST
 from django.http import JsonResponse
 from django.db.models import Prefetch, Q
-from ..models import UserProfile, EmployerProfile, JobApplication, SavedJob
+from ..models import UserProfile, EmployerProfile, JobApplication, SavedJob, SavedSearch
 from ..forms import UserProfileForm, EmployerProfileForm
 import logging
 import os
@@ -94,6 +94,8 @@ def profile(request):
         'job__employer'
     ).order_by('-saved_at')
     
+    saved_searches = SavedSearch.objects.filter(user=request.user, is_active=True)
+    
     # Determine if employer profile form should be shown
     is_employer = (user_profile.role == 'employer')
     employer_form = None
@@ -108,6 +110,7 @@ def profile(request):
         'profile_form': form,
         'applications': applications,
         'saved_jobs': saved_jobs,
+        'saved_searches': saved_searches,
         'employer_form': employer_form,
         'active_tab': tab,
         'name_filter': name_filter,
@@ -0,0 +1,95 @@
+"""
+Sitemaps for the live job listings.
+
+``/sitemap.xml`` is a sitemap index pointing at one shard per block of
+SITEMAP_SHARD_SIZE job ids. Sharding by id keeps every job in the same shard
+for good, so a change to a listing only touches that one shard. A shard is
+streamed from a server-side cursor the first time and then served from the
+cache until a job in its id range is edited, approved, expired or removed.
+"""
+from xml.sax.saxutils import escape
+
+from django.core.cache import cache
+from django.db.models import Count, F, Max
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+
+from ..models import JobListing
+
+SITEMAP_SHARD_SIZE = 5000
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+# URLs written per streamed chunk
+SITEMAP_CHUNK_SIZE = 500
+
+SITEMAP_CONTENT_TYPE = 'application/xml; charset=utf-8'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def _live_jobs():
+    return JobListing.objects.filter(JobListing.live_filter())
+
+
+def _shard_jobs(shard):
+    return _live_jobs().filter(id__gte=shard * SITEMAP_SHARD_SIZE, id__lt=(shard + 1) * SITEMAP_SHARD_SIZE)
+
+
+def _stream_and_cache(key, chunks):
+    # Cache a shard once a client has read it to the end; an aborted download caches nothing
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    cache.set(key, ''.join(parts), SITEMAP_CACHE_TIMEOUT)
+
+
+@require_GET
+def sitemap_index(request):
+    """List the sitemap shards that contain live jobs"""
+    shards = (
+        _live_jobs().annotate(shard=F('id') / SITEMAP_SHARD_SIZE)
+        .values('shard').annotate(lastmod=Max('updated_at')).order_by('shard')
+    )
+    lines = [XML_HEADER, f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n']
+    for shard in shards:
+        location = escape(request.build_absolute_uri(reverse('sitemap_jobs', args=[shard['shard']])))
+        lines.append(
+            f'<sitemap><loc>{location}</loc><lastmod>{shard["lastmod"].isoformat()}</lastmod></sitemap>\n'
+        )
+    lines.append('</sitemapindex>\n')
+    return HttpResponse(''.join(lines), content_type=SITEMAP_CONTENT_TYPE)
+
+
+@require_GET
+def sitemap_jobs(request, shard):
+    """Return the job detail URLs of one shard"""
+    jobs = _shard_jobs(shard)
+    # Any change in the shard moves its live count or its newest updated_at
+    state = jobs.aggregate(count=Count('id'), lastmod=Max('updated_at'))
+    if not state['count']:
+        raise Http404('Empty sitemap shard')
+    key = f"sitemaps:jobs:{shard}:{state['count']}:{state['lastmod'].timestamp()}:{request.get_host()}"
+    content = cache.get(key)
+    if content is not None:
+        return HttpResponse(content, content_type=SITEMAP_CONTENT_TYPE)
+    return StreamingHttpResponse(
+        _stream_and_cache(key, _shard_chunks(request, jobs)), content_type=SITEMAP_CONTENT_TYPE
+    )
+
+
+def _shard_chunks(request, jobs):
+    yield f'{XML_HEADER}<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+    base_url = escape(request.build_absolute_uri('/')[:-1])
+    lines = []
+    rows = jobs.order_by('id').values_list('id', 'updated_at').iterator(chunk_size=SITEMAP_CHUNK_SIZE)
+    for job_id, updated_at in rows:
+        lines.append(
+            f'<url><loc>{base_url}{reverse("job_detail", args=[job_id])}</loc>'
+            f'<lastmod>{updated_at.isoformat()}</lastmod></url>\n'
+        )
+        if len(lines) == SITEMAP_CHUNK_SIZE:
+            yield ''.join(lines)
+            lines = []
+    lines.append('</urlset>\n')
+    yield ''.join(lines)
@@ -13,4 +13,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobsy.settings')
 
-application = get_asgi_application() 
\ No newline at end of file
+application = get_asgi_application()
+
+# Optional in-process expiry sweeps, only in server processes (see core.expiry)
+from core.expiry import start_expiry_scheduler
+start_expiry_scheduler() 
\ No newline at end of file
@@ -83,6 +83,41 @@ DATABASE_URL = os.environ.get('DATABASE_URL')
 if DATABASE_URL:
     DATABASES["default"] = dj_database_url.parse(DATABASE_URL)
 
+# Cache
+# Set REDIS_URL to share the cache between workers, so cache invalidation
+# reaches every process. Without it each process keeps its own local cache,
+# and public pages send no ETag/Last-Modified (see core.conditional).
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds between job expiry sweeps in each server process (see core.expiry).
+# Public pages hide expired jobs either way; the sweep keeps is_live and the
+# caches in step. Leave unset when `manage.py expire_jobs` runs from cron instead.
+JOB_EXPIRY_SWEEP_INTERVAL = int(os.environ.get('JOB_EXPIRY_SWEEP_INTERVAL', '0')) or None
+
+# Job search backend: 'database' (PostgreSQL full-text search) or
+# 'memory' (in-process BM25 index, see core.search)
+JOB_SEARCH_BACKEND = os.environ.get('JOB_SEARCH_BACKEND', 'database')
+
+# Seconds job detail views are buffered in each process before they are
+# written to the database (see core.counters)
+JOB_VIEW_FLUSH_INTERVAL = int(os.environ.get('JOB_VIEW_FLUSH_INTERVAL', '30'))
+
+# Public address of the site, for links in emails sent outside a request
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:8000').rstrip('/')
+
 # Authentication
 AUTHENTICATION_BACKENDS = [
     'social_core.backends.google.GoogleOAuth2',
@@ -5,11 +5,18 @@ from django.conf.urls.static import static
 from django.conf.urls.i18n import i18n_patterns
 from django.views.i18n import set_language
 from core.admin import historical_data_view
+from core.feeds import LatestJobsFeed, LatestJobsAtomFeed
+from core.views.sitemap_views import sitemap_index, sitemap_jobs
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    # Before admin.site.urls, whose catch-all view would answer this path with a 404
     path('admin/historical-data/', historical_data_view, name='admin_historical_data'),
+    path('admin/', admin.site.urls),
     path('i18n/setlanguage/', set_language, name='set_language'),  # Use Django's built-in view with correct path
+    path('sitemap.xml', sitemap_index, name='sitemap_index'),
+    path('sitemaps/jobs-<int:shard>.xml', sitemap_jobs, name='sitemap_jobs'),
+    path('feeds/jobs/rss/', LatestJobsFeed(), name='jobs_feed_rss'),
+    path('feeds/jobs/atom/', LatestJobsAtomFeed(), name='jobs_feed_atom'),
     path('', include('core.urls')),
     path('auth/', include('social_django.urls', namespace='social')),
 ]
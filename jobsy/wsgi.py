@@ -16,4 +16,8 @@ if os.environ.get('RENDER'):
 else:
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobsy.settings')
 
-application = get_wsgi_application() 
\ No newline at end of file
+application = get_wsgi_application()
+
+# Optional in-process expiry sweeps, only in server processes (see core.expiry)
+from core.expiry import start_expiry_scheduler
+start_expiry_scheduler() 
\ No newline at end of file